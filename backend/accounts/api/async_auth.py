@@ -0,0 +1,63 @@
+"""JWT authentication for plain (non-DRF) async views."""
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.api.authentication import check_token_user, token_user_id
+from accounts.selectors.user_selector import aget_cached_user
+
+AsyncView = Callable[..., Awaitable[HttpResponse]]
+
+
+async def aauthenticate_jwt(request: HttpRequest) -> Any:
+    """Return the user of the request's JWT, or None.
+
+    Token validation is pure CPU work; the user comes from the cache
+    and only touches the database (async ORM) on a miss.
+
+    Args:
+        request: Request with an ``Authorization: Bearer`` header.
+
+    Returns:
+        The active User, or None if the token is missing or invalid.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = auth.get_raw_token(header)
+        if raw_token is None:
+            return None
+        token = auth.get_validated_token(raw_token)
+        user = await aget_cached_user(token_user_id(token))
+        check_token_user(user, token)
+    except AuthenticationFailed:
+        return None
+    return user
+
+
+def jwt_required(view: AsyncView) -> AsyncView:
+    """Decorate an async view to require a valid JWT.
+
+    Sets ``request.user`` on success; answers 401 otherwise.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        user = await aauthenticate_jwt(request)
+        if user is None:
+            return JsonResponse(
+                {"detail": "Autentifikatsiya talab qilinadi."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,21 @@
+"""Async (ASGI) read endpoints for accounts app."""
+
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from accounts.api.async_auth import jwt_required
+from accounts.api.serializers.output import UserSerializer
+
+
+@require_GET
+@jwt_required
+async def me(request: HttpRequest) -> HttpResponse:
+    """Return the authenticated user's profile (async ``GET /api/auth/me/``).
+
+    Args:
+        request: Authenticated request.
+
+    Returns:
+        The user data.
+    """
+    return JsonResponse(UserSerializer(request.user).data)
@@ -0,0 +1,65 @@
+"""DRF authentication classes for accounts app."""
+
+from typing import Any
+
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from accounts.selectors.user_selector import get_cached_user
+
+
+def check_token_user(user: Any, validated_token: Token) -> None:
+    """Apply simplejwt's active/revocation checks to a resolved user.
+
+    ``user`` comes from :func:`~accounts.selectors.user_selector.get_cached_user`,
+    which sets ``password_md5`` in place of the password hash.
+
+    Raises:
+        AuthenticationFailed: If the user is missing, inactive or has
+            changed the password the token was issued for.
+    """
+    if user is None:
+        raise AuthenticationFailed(
+            "Foydalanuvchi topilmadi.",
+            code="user_not_found",
+        )
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(
+            "Foydalanuvchi faol emas.",
+            code="user_inactive",
+        )
+    if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+        api_settings.REVOKE_TOKEN_CLAIM
+    ) != user.password_md5:
+        raise AuthenticationFailed(
+            "Foydalanuvchi paroli o'zgartirilgan.",
+            code="password_changed",
+        )
+
+
+def token_user_id(validated_token: Token) -> Any:
+    """Return the user id claim of a validated token.
+
+    Raises:
+        InvalidToken: If the token carries no user id.
+    """
+    try:
+        return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError as exc:
+        raise InvalidToken("Tokenda foydalanuvchi identifikatori yo'q.") from exc
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that resolves the user through the cache.
+
+    Saves the ``accounts_user`` lookup on every authenticated request;
+    see :mod:`accounts.selectors.user_selector` for invalidation.
+    """
+
+    def get_user(self, validated_token: Token) -> Any:
+        user = get_cached_user(token_user_id(validated_token))
+        check_token_user(user, validated_token)
+        return user
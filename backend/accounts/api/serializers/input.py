@@ -2,6 +2,10 @@
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+
+from accounts.services.token_revocation import claim_token
 
 User = get_user_model()
 
@@ -69,3 +73,17 @@ class GoogleLoginSerializer(serializers.Serializer):
     """
 
     id_token = serializers.CharField()
+
+
+class RevokingTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer that makes each refresh token single-use.
+
+    The token's ``jti`` is claimed in the revocation store before the
+    rotation; a token that was already claimed is refused.
+    """
+
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        if not claim_token(refresh["jti"], refresh["exp"]):
+            raise InvalidToken("Token bekor qilingan.")
+        return super().validate(attrs)
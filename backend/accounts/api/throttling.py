@@ -0,0 +1,78 @@
+"""Throttles for the unauthenticated auth endpoints.
+
+Login, registration and token refresh are ``AllowAny`` and a login
+runs a full password hash, so bursts are rejected before the view
+body. Views set ``throttle_scope``; each throttle class looks up
+``"<scope>.<kind>"`` in ``DEFAULT_THROTTLE_RATES`` and limits nothing
+when that rate is not configured. Counters live in
+:mod:`config.ratelimit` and are shared by all workers.
+"""
+
+import abc
+import hashlib
+from typing import Any
+
+from rest_framework.request import Request
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+
+from config.ratelimit import hit, record_rejection
+
+
+class SlidingWindowThrottle(ScopedRateThrottle, abc.ABC):
+    """Scoped sliding-window throttle keyed by :meth:`get_ident_value`."""
+
+    kind = ""
+
+    @abc.abstractmethod
+    def get_ident_value(self, request: Request) -> str | None:
+        """Return the value requests are grouped by, or None to skip."""
+
+    def allow_request(self, request: Request, view: APIView) -> bool:
+        scope = getattr(view, self.scope_attr, None)
+        if not scope:
+            return True
+        self.scope = f"{scope}.{self.kind}"
+        if self.scope not in self.THROTTLE_RATES:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return True
+
+        self._wait = hit(
+            f"throttle:{self.scope}:{ident}",
+            self.num_requests,
+            self.duration,
+        )
+        if self._wait is None:
+            return True
+        record_rejection(self.scope)
+        return False
+
+    def wait(self) -> float | None:
+        return self._wait
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Limit requests per client IP (honours ``NUM_PROXIES``)."""
+
+    kind = "ip"
+
+    def get_ident_value(self, request: Request) -> str | None:
+        return self.get_ident(request)
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    """Limit requests per submitted email address, across all IPs."""
+
+    kind = "email"
+
+    def get_ident_value(self, request: Request) -> str | None:
+        data: Any = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        if not isinstance(email, str) or not email:
+            return None
+        # Hashed so addresses are not stored in the counter keys.
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
@@ -1,13 +1,13 @@
 """URL patterns for accounts API."""
 
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from accounts.api.views import (
     GoogleLoginView,
     LoginView,
     MeView,
     RegisterView,
+    TokenRefreshView,
 )
 
 app_name = "accounts"
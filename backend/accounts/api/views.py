@@ -6,6 +6,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenRefreshView as BaseTokenRefreshView
 
 from accounts.api.serializers.input import (
     GoogleLoginSerializer,
@@ -13,6 +14,7 @@ from accounts.api.serializers.input import (
     RegisterSerializer,
 )
 from accounts.api.serializers.output import TokenSerializer, UserSerializer
+from accounts.api.throttling import EmailThrottle, IPThrottle
 from accounts.services.auth_service import (
     google_login,
     login_user,
@@ -24,6 +26,8 @@ class RegisterView(APIView):
     """Register a new user with email and password."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [IPThrottle, EmailThrottle]
+    throttle_scope = "register"
 
     @extend_schema(
         summary="Register",
@@ -63,6 +67,9 @@ class LoginView(APIView):
     """Authenticate a user with email and password."""
 
     permission_classes = [AllowAny]
+    # Rejected before the password hash is computed.
+    throttle_classes = [IPThrottle, EmailThrottle]
+    throttle_scope = "login"
 
     @extend_schema(
         summary="Login",
@@ -105,6 +112,8 @@ class GoogleLoginView(APIView):
     """Authenticate a user with a Google ID token."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [IPThrottle]
+    throttle_scope = "google_login"
 
     @extend_schema(
         summary="Google Login",
@@ -165,3 +174,10 @@ class MeView(APIView):
             UserSerializer(request.user).data,
             status=status.HTTP_200_OK,
         )
+
+
+class TokenRefreshView(BaseTokenRefreshView):
+    """Exchange a refresh token for a new access token (throttled)."""
+
+    throttle_classes = [IPThrottle]
+    throttle_scope = "token_refresh"
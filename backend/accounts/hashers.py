@@ -0,0 +1,45 @@
+"""Password hashers with cost parameters taken from settings.
+
+``settings.PASSWORD_HASHER`` picks the hasher new passwords use; the
+others stay in ``PASSWORD_HASHERS`` so existing hashes still verify.
+Django re-hashes a password with the preferred hasher and parameters
+on the next successful ``authenticate()`` (``must_update``), so
+switching algorithm or re-tuning upgrades users as they log in.
+
+Each hasher has one cost knob, calibrated for the hardware with
+``manage.py calibrate_password_hasher``; the other parameters are
+fixed at the OWASP-recommended values.
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class TunedPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2-SHA256; cost knob ``PASSWORD_PBKDF2_ITERATIONS``."""
+
+    def __init__(self, iterations: int | None = None) -> None:
+        self.iterations = iterations or settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt with N=2^14, r=8; cost knob ``PASSWORD_SCRYPT_PARALLELISM``."""
+
+    work_factor = 2**14
+    block_size = 8
+
+    def __init__(self, parallelism: int | None = None) -> None:
+        self.parallelism = parallelism or settings.PASSWORD_SCRYPT_PARALLELISM
+
+
+class TunedArgon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with 19 MiB, one lane; cost knob ``PASSWORD_ARGON2_TIME_COST``.
+
+    Needs ``argon2-cffi`` (``pip install -e ".[argon2]"``).
+    """
+
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+    def __init__(self, time_cost: int | None = None) -> None:
+        self.time_cost = time_cost or settings.PASSWORD_ARGON2_TIME_COST
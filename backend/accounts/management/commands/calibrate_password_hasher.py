@@ -0,0 +1,56 @@
+"""Calibrate password hashing cost for this machine."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from accounts.services.hasher_benchmark import HASHERS, calibrate, time_hasher
+
+
+class Command(BaseCommand):
+    """Report logins/s per core now and with calibrated parameters.
+
+    Run on the production hardware and copy the printed setting into
+    ``backend/.env``; users are re-hashed as they log in.
+    """
+
+    help = "Benchmark password hashers and suggest cost settings."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100.0,
+            help="Latency budget of one password hash (default 100).",
+        )
+        parser.add_argument(
+            "--algorithm",
+            choices=sorted(HASHERS),
+            default=settings.PASSWORD_HASHER,
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args: object, **options: object) -> None:
+        algorithm: str = options["algorithm"]  # type: ignore[assignment]
+        repeat: int = options["repeat"]  # type: ignore[assignment]
+        target_ms: float = options["target_ms"]  # type: ignore[assignment]
+
+        current = time_hasher(settings.PASSWORD_HASHER, repeat=repeat)
+        self.stdout.write(
+            f"Hozir:   {current.algorithm} {current.setting}={current.value}: "
+            f"{current.ms} ms, {current.logins_per_second} login/s/yadro"
+        )
+        result = calibrate(algorithm, target_ms, repeat)
+        self.stdout.write(
+            f"Tavsiya: {result['algorithm']} {result['setting']}={result['value']}: "
+            f"{result['ms']} ms, {result['logins_per_second']} login/s/yadro"
+        )
+        if not result["within_budget"]:
+            self.stderr.write(
+                self.style.WARNING(
+                    "Tavsiya etilgan minimum ham byudjetdan sekinroq; "
+                    "minimum ishlatildi."
+                )
+            )
+        self.stdout.write("")
+        self.stdout.write(f"PASSWORD_HASHER={result['algorithm']}")
+        self.stdout.write(f"{result['setting']}={result['value']}")
@@ -0,0 +1,19 @@
+"""Show how many requests the auth throttles have rejected."""
+
+from django.core.management.base import BaseCommand
+
+from config.ratelimit import rejection_counts
+
+
+class Command(BaseCommand):
+    """Print throttled request counts per scope."""
+
+    help = "Show rejected request counts of the auth throttles."
+
+    def handle(self, *args: object, **options: object) -> None:
+        counts = rejection_counts()
+        if not counts:
+            self.stdout.write("Cheklangan so'rovlar yo'q.")
+            return
+        for scope, count in sorted(counts.items()):
+            self.stdout.write(f"{scope}: {count}")
@@ -0,0 +1,94 @@
+"""Selectors (read-only queries) for accounts app.
+
+Authenticated requests resolve their user through a short-lived cache
+entry instead of a ``SELECT`` on every request. Entries are dropped by
+the ``accounts.signals`` receivers whenever a user is saved or deleted;
+bulk ``QuerySet.update()`` calls bypass those signals and are only
+picked up when the entry expires (``AUTH_USER_CACHE_TTL``). When the
+cache is unavailable users are read from the database.
+
+Entries never hold the password hash: users are rebuilt with
+``password`` deferred and carry ``password_md5``, the digest simplejwt
+compares with a token's revocation claim.
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from config.cache import (
+    USER,
+    acache_get,
+    acache_set,
+    cache_delete,
+    cache_get,
+    cache_set,
+)
+
+User = get_user_model()
+
+_CACHED_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname != "password"
+)
+
+
+def user_cache_key(user_id: Any) -> str:
+    """Return the cache key of a user's authentication entry."""
+    return USER.key("auth", user_id)
+
+
+def _to_entry(user: Any) -> dict[str, Any]:
+    user.password_md5 = get_md5_hash_password(user.password)
+    return {
+        "fields": [getattr(user, name) for name in _CACHED_FIELDS],
+        "password_md5": user.password_md5,
+    }
+
+
+def _from_entry(entry: dict[str, Any]) -> Any:
+    user = User.from_db(DEFAULT_DB_ALIAS, _CACHED_FIELDS, entry["fields"])
+    user.password_md5 = entry["password_md5"]
+    return user
+
+
+def get_cached_user(user_id: Any) -> Any:
+    """Get a user by primary key, from the cache when possible.
+
+    Args:
+        user_id: The user's primary key (the token's user id claim).
+
+    Returns:
+        The User (with ``password_md5`` set), or None if it does not
+        exist. Inactive users are returned too; the caller decides
+        whether they may log in.
+    """
+    key = user_cache_key(user_id)
+    entry = cache_get(key)
+    if entry is not None:
+        return _from_entry(entry)
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        cache_set(key, _to_entry(user), settings.AUTH_USER_CACHE_TTL)
+    return user
+
+
+async def aget_cached_user(user_id: Any) -> Any:
+    """Async version of :func:`get_cached_user`."""
+    key = user_cache_key(user_id)
+    entry = await acache_get(key)
+    if entry is not None:
+        return _from_entry(entry)
+    user = await User.objects.filter(pk=user_id).afirst()
+    if user is not None:
+        await acache_set(key, _to_entry(user), settings.AUTH_USER_CACHE_TTL)
+    return user
+
+
+def invalidate_cached_user(user_id: Any) -> None:
+    """Drop a user's cache entry so the next request reloads it."""
+    cache_delete(user_cache_key(user_id))
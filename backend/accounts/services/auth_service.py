@@ -5,10 +5,10 @@ from typing import Any
 
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token as google_id_token
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts.services.google_certs import verify_google_id_token
+
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
@@ -84,9 +84,8 @@ def google_login(token: str) -> dict[str, Any] | None:
         Dict with 'tokens' and 'user' or None on failure.
     """
     try:
-        idinfo = google_id_token.verify_oauth2_token(
+        idinfo = verify_google_id_token(
             token,
-            google_requests.Request(),
             settings.SOCIALACCOUNT_PROVIDERS["google"]["APP"]["client_id"],
         )
     except Exception:
@@ -0,0 +1,110 @@
+"""Google ID token verification against a cached certificate set.
+
+``google.oauth2.id_token.verify_oauth2_token`` downloads Google's
+signing certificates on every call. Here the certificate set is kept
+in the Django cache for as long as Google's ``Cache-Control: max-age``
+allows and fetched through one pooled ``requests.Session``, so
+verifying a token is local CPU work except after a key rotation.
+"""
+
+import functools
+import logging
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+
+from config.cache import cache_get, cache_set
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+CERTS_CACHE_KEY = "google:oauth2:certs"
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+@functools.cache
+def get_google_session() -> "requests.Session":
+    """Return the process-wide session used to fetch certificates."""
+    import requests
+
+    return requests.Session()
+
+
+def _cache_ttl(headers: Any) -> int:
+    """Seconds the response may be cached, from ``Cache-Control``/``Age``."""
+    match = _MAX_AGE_RE.search(headers.get("Cache-Control", ""))
+    if match is None:
+        return settings.GOOGLE_CERTS_DEFAULT_TTL
+    age = int(headers.get("Age", 0) or 0)
+    return max(int(match.group(1)) - age, 0)
+
+
+def _fetch_certs() -> dict[str, Any]:
+    """Download the certificate set and store it in the cache."""
+    response = get_google_session().get(
+        settings.GOOGLE_CERTS_URL,
+        timeout=settings.GOOGLE_CERTS_TIMEOUT,
+    )
+    response.raise_for_status()
+    entry = {"certs": response.json(), "fetched_at": time.time()}
+    ttl = _cache_ttl(response.headers)
+    if ttl:
+        cache_set(CERTS_CACHE_KEY, entry, ttl)
+    logger.info("Google sertifikatlari yangilandi (TTL %ds)", ttl)
+    return entry
+
+
+def get_google_certs(kid: str | None = None) -> dict[str, str]:
+    """Return Google's ``{key id: PEM certificate}`` signing set.
+
+    Args:
+        kid: Key id the caller needs. If the cached set lacks it (Google
+            rotated its keys) the set is refetched, at most once per
+            ``GOOGLE_CERTS_MIN_REFRESH`` seconds.
+
+    Returns:
+        The certificate mapping.
+    """
+    entry = cache_get(CERTS_CACHE_KEY)
+    if entry is None:
+        entry = _fetch_certs()
+    elif (
+        kid is not None
+        and kid not in entry["certs"]
+        and time.time() - entry["fetched_at"] > settings.GOOGLE_CERTS_MIN_REFRESH
+    ):
+        entry = _fetch_certs()
+    return entry["certs"]
+
+
+def verify_google_id_token(token: str, audience: str) -> dict[str, Any]:
+    """Verify a Google ID token and return its claims.
+
+    Args:
+        token: The encoded ID token.
+        audience: Expected ``aud`` (the OAuth client id).
+
+    Returns:
+        The decoded claims.
+
+    Raises:
+        ValueError: If the signature, expiry, audience or issuer is
+            invalid.
+    """
+    from google.auth import jwt
+
+    header = jwt.decode_header(token)
+    claims = jwt.decode(
+        token,
+        certs=get_google_certs(header.get("kid")),
+        audience=audience,
+    )
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Noto'g'ri token beruvchi: {claims.get('iss')}")
+    return claims
@@ -0,0 +1,110 @@
+"""Calibrate password hasher cost against a login latency budget.
+
+A login is CPU-bound on one password hash, so the time of one hash on
+one core bounds the logins per second each core can serve. The cost
+knob of each hasher (see ``accounts/hashers.py``) scales that time
+roughly linearly; calibration measures the recommended minimum and
+scales up to the budget, never below the minimum.
+"""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from django.contrib.auth.hashers import BasePasswordHasher
+
+from accounts.hashers import (
+    TunedArgon2PasswordHasher,
+    TunedPBKDF2PasswordHasher,
+    TunedScryptPasswordHasher,
+)
+
+# algorithm: (hasher class, cost knob attribute, its setting, OWASP minimum)
+HASHERS: dict[str, tuple[type[BasePasswordHasher], str, str, int]] = {
+    "pbkdf2": (
+        TunedPBKDF2PasswordHasher,
+        "iterations",
+        "PASSWORD_PBKDF2_ITERATIONS",
+        600_000,
+    ),
+    "scrypt": (
+        TunedScryptPasswordHasher,
+        "parallelism",
+        "PASSWORD_SCRYPT_PARALLELISM",
+        5,
+    ),
+    "argon2": (
+        TunedArgon2PasswordHasher,
+        "time_cost",
+        "PASSWORD_ARGON2_TIME_COST",
+        2,
+    ),
+}
+
+_SALT = "calibrationsalt0123456"
+
+
+@dataclass
+class HasherTiming:
+    """Cost of one password hash with given parameters."""
+
+    algorithm: str
+    setting: str
+    value: int
+    ms: float
+    logins_per_second: float
+
+
+def time_hasher(
+    algorithm: str,
+    value: int | None = None,
+    repeat: int = 3,
+) -> HasherTiming:
+    """Time one hash on this core.
+
+    Args:
+        algorithm: Key of :data:`HASHERS`.
+        value: Cost knob; defaults to the configured setting.
+        repeat: Hashes to time; the fastest is used.
+
+    Returns:
+        The timing, with the single-core logins per second it allows.
+    """
+    hasher_cls, attr, setting, _minimum = HASHERS[algorithm]
+    hasher = hasher_cls(value)  # type: ignore[call-arg]
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hasher.encode("calibration-password", _SALT)
+        best = min(best, time.perf_counter() - started)
+    return HasherTiming(
+        algorithm=algorithm,
+        setting=setting,
+        value=getattr(hasher, attr),
+        ms=round(best * 1000, 1),
+        logins_per_second=round(1 / best, 1),
+    )
+
+
+def calibrate(algorithm: str, target_ms: float, repeat: int = 3) -> dict[str, Any]:
+    """Pick the largest cost knob that keeps one hash within budget.
+
+    Args:
+        algorithm: Key of :data:`HASHERS`.
+        target_ms: Latency budget of one password hash.
+        repeat: Hashes timed per measurement.
+
+    Returns:
+        The :class:`HasherTiming` fields of the chosen value plus
+        ``within_budget`` (False when even the minimum is too slow).
+    """
+    minimum = HASHERS[algorithm][3]
+    base = time_hasher(algorithm, minimum, repeat)
+    value = minimum
+    if base.ms < target_ms:
+        value = int(minimum * target_ms / base.ms)
+        if algorithm == "pbkdf2":
+            value -= value % 10_000
+        value = max(value, minimum)
+    timing = time_hasher(algorithm, value, repeat) if value != minimum else base
+    return {**asdict(timing), "within_budget": timing.ms <= target_ms}
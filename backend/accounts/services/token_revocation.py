@@ -0,0 +1,87 @@
+"""Revocation store for rotated refresh tokens.
+
+With ``ROTATE_REFRESH_TOKENS`` every refresh returns a new refresh
+token; the old one is recorded here by its ``jti`` until it would
+have expired anyway, so it cannot be used again. A check is one
+``SET NX`` instead of simplejwt's database blacklist (two tables,
+several queries per refresh). ``settings.TOKEN_REVOCATION_BACKEND``
+selects the store:
+
+* ``redis`` – one key per revoked token, expiring with the token, so
+  the store compacts itself.
+* ``local`` – an in-process stand-in for single-process setups and
+  tests; expired entries are dropped as new ones are added.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from config.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+def _key(jti: str) -> str:
+    return f"jwt:revoked:{jti}"
+
+
+class _LocalStore:
+    """Thread-safe in-process ``jti -> expiry`` map."""
+
+    prune_every = 1000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._revoked: dict[str, float] = {}
+        self._claims = 0
+
+    def claim(self, jti: str, expires_at: float) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._revoked.get(jti, 0) > now:
+                return False
+            self._revoked[jti] = expires_at
+            self._claims += 1
+            if self._claims % self.prune_every == 0:
+                self._revoked = {j: e for j, e in self._revoked.items() if e > now}
+        return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+
+
+_local_store = _LocalStore()
+
+
+def claim_token(jti: str, expires_at: float) -> bool:
+    """Revoke a token unless it already is; atomic across processes.
+
+    Args:
+        jti: The token's unique id claim.
+        expires_at: The token's ``exp`` (Unix time); the record is kept
+            until then.
+
+    Returns:
+        True if this call revoked the token, False if it had already
+        been revoked (the token was used before). Redis errors fail
+        open (True) so an outage does not log every user out.
+    """
+    ttl = int(expires_at - time.time()) + 1
+    if ttl <= 0:
+        return True
+    if settings.TOKEN_REVOCATION_BACKEND != "redis":
+        return _local_store.claim(jti, expires_at)
+    try:
+        return bool(get_redis().set(_key(jti), 1, ex=ttl, nx=True))
+    except Exception:
+        logger.warning("Token bekor qilish yozilmadi: %s", jti, exc_info=True)
+        return True
+
+
+def reset_local_store() -> None:
+    """Forget all in-process revocations (tests)."""
+    _local_store.reset()
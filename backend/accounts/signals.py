@@ -0,0 +1,25 @@
+"""Keep cached authentication users in sync with the database."""
+
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.selectors.user_selector import invalidate_cached_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """Invalidate the user's entry now and again once committed.
+
+    The second delete covers a request that re-cached the old row
+    between this change and the end of its transaction.
+    """
+    user_id = instance.pk
+    invalidate_cached_user(user_id)
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
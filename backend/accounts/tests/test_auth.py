@@ -1,9 +1,19 @@
 """Tests for accounts authentication API."""
 
+import pickle
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.api.throttling import SlidingWindowThrottle
+from accounts.hashers import TunedPBKDF2PasswordHasher
+from accounts.selectors.user_selector import user_cache_key
+from accounts.services.hasher_benchmark import calibrate
+from config.ratelimit import rejection_counts
 
 User = get_user_model()
 
@@ -139,3 +149,200 @@ class TestMe:
         """Unauthenticated request returns 401."""
         resp = api_client.get(self.URL)
         assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_me_async(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """The async variant returns the same profile."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        resp = api_client.get("/api/async/auth/me/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["email"] == "test@example.com"
+        api_client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        assert api_client.get("/api/async/auth/me/").status_code == 401
+
+
+class TestCachedAuthentication:
+    """Tests for CachedJWTAuthentication."""
+
+    URL = "/api/auth/me/"
+
+    def test_user_lookup_cached(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+        django_assert_num_queries,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """Only the first request loads the user from the database."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        with django_assert_num_queries(1):
+            assert api_client.get(self.URL).status_code == status.HTTP_200_OK
+        with django_assert_num_queries(0):
+            assert api_client.get(self.URL).status_code == status.HTTP_200_OK
+
+    def test_entry_has_no_password_hash(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """The cache holds the profile, never the password hash."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        api_client.get(self.URL)
+        entry = cache.get(user_cache_key(user.pk))
+        assert entry is not None
+        assert user.password.encode() not in pickle.dumps(entry)
+        resp = api_client.get("/api/async/auth/me/")
+        assert resp.json()["email"] == "test@example.com"
+
+    def test_deactivation_invalidates(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """A deactivated user is rejected despite the cached entry."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        assert api_client.get(self.URL).status_code == status.HTTP_200_OK
+        user.is_active = False
+        user.save()
+        assert api_client.get(self.URL).status_code == status.HTTP_401_UNAUTHORIZED
+        assert (
+            api_client.get("/api/async/auth/me/").status_code
+            == status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_cache_outage_falls_back_to_database(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """An unreachable cache does not fail authenticated requests."""
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:1/0",
+            }
+        }
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        assert api_client.get(self.URL).status_code == status.HTTP_200_OK
+        assert api_client.get("/api/async/auth/me/").status_code == 200
+        user.first_name = "Yangi"
+        user.save()
+        assert api_client.get(self.URL).data["first_name"] == "Yangi"
+
+
+class TestAuthThrottling:
+    """Tests for the sliding-window auth throttles."""
+
+    @pytest.fixture(autouse=True)
+    def _rates(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            SlidingWindowThrottle,
+            "THROTTLE_RATES",
+            {
+                "login.email": "2/min",
+                "login.ip": "100/min",
+                "token_refresh.ip": "1/min",
+            },
+        )
+
+    def test_login_limited_per_email(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Attempts over the limit are rejected before the password check."""
+        payload = {"email": "Test@example.com", "password": "wrong"}
+        for _ in range(2):
+            resp = api_client.post("/api/auth/login/", payload, format="json")
+            assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+        def fail(**kwargs: object) -> None:
+            raise AssertionError("password checked")
+
+        monkeypatch.setattr("accounts.services.auth_service.authenticate", fail)
+        resp = api_client.post("/api/auth/login/", payload, format="json")
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(resp["Retry-After"]) > 0
+        assert rejection_counts() == {"login.email": 1}
+
+    def test_token_refresh_limited_per_ip(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """Token refresh is throttled per client IP."""
+        refresh = str(RefreshToken.for_user(user))
+        url = "/api/auth/token/refresh/"
+        resp = api_client.post(url, {"refresh": refresh}, format="json")
+        assert resp.status_code == status.HTTP_200_OK
+        resp = api_client.post(url, {"refresh": refresh}, format="json")
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+class TestPasswordHashing:
+    """Tests for the tuned password hashers."""
+
+    def test_login_upgrades_legacy_hash(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """A PBKDF2 hash is replaced by the preferred hasher on login."""
+        user.password = TunedPBKDF2PasswordHasher(iterations=1000).encode(
+            "testpass123",
+            "legacysalt12345678",
+        )
+        user.save(update_fields=["password"])
+
+        resp = api_client.post(
+            "/api/auth/login/",
+            {"email": "test@example.com", "password": "testpass123"},
+            format="json",
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith("scrypt$")
+        assert user.check_password("testpass123")
+
+    def test_calibration_never_below_minimum(self) -> None:
+        """An impossible budget falls back to the recommended minimum."""
+        result = calibrate("scrypt", target_ms=0.001, repeat=1)
+        assert result["value"] == 5
+        assert result["within_budget"] is False
+
+
+class TestTokenRefresh:
+    """Tests for POST /api/auth/token/refresh/ with rotation."""
+
+    URL = "/api/auth/token/refresh/"
+
+    def test_refresh_token_single_use(
+        self,
+        api_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """A rotated refresh token is revoked; its successor works."""
+        refresh = str(RefreshToken.for_user(user))
+        resp = api_client.post(self.URL, {"refresh": refresh}, format="json")
+        assert resp.status_code == status.HTTP_200_OK
+        rotated = resp.data["refresh"]
+        assert rotated != refresh
+
+        resp = api_client.post(self.URL, {"refresh": refresh}, format="json")
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+        resp = api_client.post(self.URL, {"refresh": rotated}, format="json")
+        assert resp.status_code == status.HTTP_200_OK
@@ -0,0 +1,148 @@
+"""Tests for Google login against a local certificate endpoint."""
+
+import datetime
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+from rest_framework import status
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+URL = "/api/auth/google/"
+
+
+def _key_pair() -> tuple[bytes, str]:
+    """Return (private key PEM, self-signed certificate PEM)."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class CertsServer:
+    """Local stand-in for Google's ``oauth2/v1/certs`` endpoint."""
+
+    def __init__(self) -> None:
+        self.keys: dict[str, bytes] = {}
+        self.certs: dict[str, str] = {}
+        self.hits = 0
+        self.rotate()
+
+    def rotate(self) -> str:
+        """Add a new signing key and return its key id."""
+        kid = f"kid-{len(self.keys) + 1}"
+        self.keys[kid], self.certs[kid] = _key_pair()
+        return kid
+
+    def sign(self, kid: str, **claims: Any) -> str:
+        """Return an ID token signed with key ``kid``."""
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "iat": now,
+            "exp": now + 300,
+            "email": "google@example.com",
+            "given_name": "Google",
+            **claims,
+        }
+        signer = crypt.RSASigner.from_string(self.keys[kid], kid)
+        return jwt.encode(signer, payload).decode()
+
+
+@pytest.fixture()
+def certs_server(settings) -> Iterator[CertsServer]:  # type: ignore[no-untyped-def]
+    """Serve certificates locally and point the settings at them."""
+    state = CertsServer()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            state.hits += 1
+            body = json.dumps(state.certs).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=300")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.GOOGLE_CERTS_URL = f"http://127.0.0.1:{server.server_port}/certs"
+    settings.SOCIALACCOUNT_PROVIDERS = {"google": {"APP": {"client_id": CLIENT_ID}}}
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+class TestGoogleLogin:
+    """Tests for POST /api/auth/google/."""
+
+    def test_certs_fetched_once(self, certs_server: CertsServer) -> None:
+        """Repeated logins verify against the cached certificate set."""
+        client = APIClient()
+        token = certs_server.sign("kid-1")
+        for _ in range(3):
+            resp = client.post(URL, {"id_token": token}, format="json")
+            assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["user"]["email"] == "google@example.com"
+        assert certs_server.hits == 1
+
+    def test_key_rotation_refetches(
+        self,
+        certs_server: CertsServer,
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """A token signed with an unknown key id refreshes the set once."""
+        settings.GOOGLE_CERTS_MIN_REFRESH = 0
+        client = APIClient()
+        client.post(URL, {"id_token": certs_server.sign("kid-1")}, format="json")
+        kid = certs_server.rotate()
+        resp = client.post(URL, {"id_token": certs_server.sign(kid)}, format="json")
+        assert resp.status_code == status.HTTP_200_OK
+        assert certs_server.hits == 2
+
+    @pytest.mark.parametrize(
+        "claims",
+        [{"aud": "other-client"}, {"iss": "https://evil.example.com"}],
+    )
+    def test_rejects_invalid_token(
+        self,
+        certs_server: CertsServer,
+        claims: dict[str, str],
+    ) -> None:
+        """Wrong audience or issuer returns 401."""
+        token = certs_server.sign("kid-1", **claims)
+        resp = APIClient().post(URL, {"id_token": token}, format="json")
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
@@ -11,6 +11,13 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from config.db import install_pool_metrics
+from jobs.services.progress_service import require_shared_events
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault("SERVER_MODE", "asgi")
 
 application = get_asgi_application()
+
+install_pool_metrics()
+require_shared_events()
@@ -0,0 +1,18 @@
+"""Async (ASGI) variants of hot read endpoints, mounted at ``/api/async/``.
+
+Served by the ASGI workers (``deploy/gunicorn-asgi.service``); the
+response bodies match their sync counterparts under ``/api/``.
+"""
+
+from django.urls import path
+
+from accounts.api.async_views import me
+from jobs.api.views import job_status
+from smetalar.api.async_views import smeta_detail, smeta_list
+
+urlpatterns = [
+    path("auth/me/", me, name="async-me"),
+    path("smetalar/", smeta_list, name="async-smeta-list"),
+    path("smetalar/<int:pk>/", smeta_detail, name="async-smeta-detail"),
+    path("jobs/<str:job_id>/", job_status, name="async-job-status"),
+]
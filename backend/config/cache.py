@@ -0,0 +1,193 @@
+"""Namespaced cache keys and selector memoization.
+
+All shared caching goes through the ``default`` cache (Redis in
+production, LocMem otherwise; see ``CACHES`` in settings). Keys are
+grouped per app in a :class:`Namespace` whose version is part of every
+key, so changing the shape of cached values only needs a version bump.
+
+:func:`memoize` caches selector results with probabilistic early
+expiration ("XFetch"): shortly before an entry expires, a request
+recomputes it with a probability that grows as expiry approaches, so
+a hot key is refreshed by one request instead of a stampede of them
+when it expires. Cache errors are logged and treated as misses.
+
+Code that talks to the cache directly uses the ``cache_*`` helpers,
+which fail the same way, so a cache outage degrades to database reads
+instead of failing requests.
+"""
+
+import functools
+import inspect
+import logging
+import math
+import random
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Namespace:
+    """A versioned key prefix, e.g. ``smeta:1:``."""
+
+    def __init__(self, name: str, version: int = 1) -> None:
+        self.name = name
+        self.version = version
+
+    def key(self, *parts: Any) -> str:
+        """Return the cache key for ``parts`` inside this namespace."""
+        return ":".join([self.name, str(self.version), *map(str, parts)])
+
+
+SMETA = Namespace("smeta")
+USER = Namespace("user", version=2)
+REPORT = Namespace("report")
+
+
+def cache_get(key: str, default: Any = None) -> Any:
+    """``cache.get`` that logs errors and returns ``default``."""
+    try:
+        return cache.get(key, default)
+    except Exception:
+        logger.warning("Keshdan o'qib bo'lmadi: %s", key, exc_info=True)
+        return default
+
+
+async def acache_get(key: str, default: Any = None) -> Any:
+    """Async version of :func:`cache_get`."""
+    try:
+        return await cache.aget(key, default)
+    except Exception:
+        logger.warning("Keshdan o'qib bo'lmadi: %s", key, exc_info=True)
+        return default
+
+
+def cache_set(key: str, value: Any, timeout: int | None) -> None:
+    """``cache.set`` that logs errors instead of raising them."""
+    try:
+        cache.set(key, value, timeout)
+    except Exception:
+        logger.warning("Keshga yozib bo'lmadi: %s", key, exc_info=True)
+
+
+async def acache_set(key: str, value: Any, timeout: int | None) -> None:
+    """Async version of :func:`cache_set`."""
+    try:
+        await cache.aset(key, value, timeout)
+    except Exception:
+        logger.warning("Keshga yozib bo'lmadi: %s", key, exc_info=True)
+
+
+def cache_add(key: str, value: Any, timeout: int | None) -> bool | None:
+    """``cache.add``; None (instead of raising) if the cache failed."""
+    try:
+        return cache.add(key, value, timeout)
+    except Exception:
+        logger.warning("Keshga yozib bo'lmadi: %s", key, exc_info=True)
+        return None
+
+
+def cache_delete(key: str) -> None:
+    """``cache.delete`` that logs errors instead of raising them."""
+    try:
+        cache.delete(key)
+    except Exception:
+        logger.warning("Kesh yozuvi o'chirilmadi: %s", key, exc_info=True)
+
+
+def _should_recompute(entry: Any, beta: float) -> bool:
+    """XFetch: recompute early with probability rising towards expiry."""
+    if entry is None:
+        return True
+    _value, delta, expires_at = entry
+    # -log(U) for U in (0, 1] is an exponential sample; scaled by the
+    # recompute time, it moves expiry earlier by a little, rarely a lot.
+    return time.time() - delta * beta * math.log(1 - random.random()) >= expires_at
+
+
+def _entry(value: Any, delta: float, ttl: int) -> tuple[Any, float, float]:
+    return value, delta, time.time() + ttl
+
+
+def memoize(
+    namespace: Namespace,
+    ttl: int | Callable[[], int],
+    beta: float = 1.0,
+) -> Callable[[F], F]:
+    """Cache a selector's result under ``namespace``.
+
+    The key is the function name plus its positional and keyword
+    arguments, which must have stable ``str()`` forms (ids, strings).
+    Sync and ``async`` functions are both supported. The decorated
+    function gains ``invalidate(*args, **kwargs)`` to drop one entry.
+
+    Args:
+        namespace: Key namespace, e.g. :data:`SMETA`.
+        ttl: Seconds to keep a result, or a callable returning them
+            (to read a setting at call time).
+        beta: Early-expiration eagerness; 0 disables it.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(func: F) -> F:
+        def make_key(*args: Any, **kwargs: Any) -> str:
+            parts = [*args, *(f"{k}={v}" for k, v in sorted(kwargs.items()))]
+            return namespace.key(func.__qualname__, *parts)
+
+        def timeout() -> int:
+            return ttl() if callable(ttl) else ttl
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = make_key(*args, **kwargs)
+                entry = await acache_get(key)
+                if not _should_recompute(entry, beta):
+                    return entry[0]
+                started = time.monotonic()
+                value = await func(*args, **kwargs)
+                seconds = timeout()
+                await acache_set(
+                    key,
+                    _entry(value, time.monotonic() - started, seconds),
+                    seconds,
+                )
+                return value
+
+            wrapper: Any = async_wrapper
+        else:
+
+            @functools.wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = make_key(*args, **kwargs)
+                entry = cache_get(key)
+                if not _should_recompute(entry, beta):
+                    return entry[0]
+                started = time.monotonic()
+                value = func(*args, **kwargs)
+                seconds = timeout()
+                cache_set(
+                    key,
+                    _entry(value, time.monotonic() - started, seconds),
+                    seconds,
+                )
+                return value
+
+            wrapper = sync_wrapper
+
+        def invalidate(*args: Any, **kwargs: Any) -> None:
+            cache_delete(make_key(*args, **kwargs))
+
+        wrapper.cache_key = make_key
+        wrapper.invalidate = invalidate
+        return wrapper  # type: ignore[no-any-return]
+
+    return decorator
@@ -0,0 +1,75 @@
+"""Database connection pool metrics.
+
+With ``DB_POOL`` enabled every web process owns a psycopg 3 pool. Pool
+waits (requests that found no idle connection) are the signal that
+``DB_POOL_MAX_SIZE`` is too small for the worker's concurrency, so the
+counters are logged periodically from each process.
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_last_report = time.monotonic()
+
+
+def get_pool(alias: str = DEFAULT_DB_ALIAS) -> Any:
+    """Return the psycopg connection pool of a database, or None."""
+    return getattr(connections[alias], "pool", None)
+
+
+def pool_stats(alias: str = DEFAULT_DB_ALIAS) -> dict[str, int] | None:
+    """Return the pool's current counters without resetting them.
+
+    Args:
+        alias: Database alias.
+
+    Returns:
+        psycopg_pool statistics (``pool_size``, ``pool_available``,
+        ``requests_waiting``, ``requests_wait_ms`` …) or None when the
+        database is not pooled.
+    """
+    pool = get_pool(alias)
+    return pool.get_stats() if pool is not None else None
+
+
+def report_pool_stats(**kwargs: Any) -> None:
+    """Log and reset pool counters at most every DB_POOL_STATS_INTERVAL."""
+    global _last_report
+
+    interval = settings.DB_POOL_STATS_INTERVAL
+    if not interval:
+        return
+    with _lock:
+        now = time.monotonic()
+        if now - _last_report < interval:
+            return
+        _last_report = now
+    pool = get_pool()
+    if pool is None:
+        return
+    stats = pool.pop_stats()
+    logger.log(
+        logging.WARNING if stats.get("requests_queued") else logging.INFO,
+        "DB pool: size=%d available=%d requests=%d queued=%d "
+        "wait_ms=%d errors=%d",
+        stats.get("pool_size", 0),
+        stats.get("pool_available", 0),
+        stats.get("requests_num", 0),
+        stats.get("requests_queued", 0),
+        stats.get("requests_wait_ms", 0),
+        stats.get("requests_errors", 0),
+    )
+
+
+def install_pool_metrics() -> None:
+    """Report pool statistics after requests in this process."""
+    request_finished.connect(report_pool_stats, dispatch_uid="db-pool-stats")
@@ -0,0 +1,86 @@
+"""Fork safety for pre-forking servers (Gunicorn ``preload_app``).
+
+With ``preload_app`` the application is imported once in the master
+and worker processes are forked from it, sharing the loaded code and
+read-only data copy-on-write. Sockets must not be shared the same way:
+a database or Redis connection inherited by several processes corrupts
+the protocol stream. These hooks make sure the master holds none when
+it forks and that workers build their own, and process pools started
+while serving requests use :func:`process_pool_context` instead of
+forking the (connected) worker.
+"""
+
+import gc
+import multiprocessing
+from multiprocessing.context import BaseContext
+
+from django.db import connections
+
+
+def warm_shared_state() -> None:
+    """Load read-only state once in the master, before any fork.
+
+    Freezing the collector afterwards keeps the garbage collector from
+    writing to (and so un-sharing) pages of these long-lived objects.
+    """
+    from smetalar.services.excel_service import get_template_workbook
+
+    get_template_workbook()
+    gc.freeze()
+
+
+def close_before_fork() -> None:
+    """Close every database connection (and pool) held by this process."""
+    for conn in connections.all(initialized_only=True):
+        conn.close()
+        close_pool = getattr(conn, "close_pool", None)
+        if close_pool is not None:
+            close_pool()
+
+
+def process_pool_context() -> BaseContext:
+    """Start method for process pools created inside a running server.
+
+    Closing connections before a fork is not enough there: with
+    ``DB_POOL`` closing only returns them to the psycopg pool, whose
+    sockets the child would inherit, and other request threads keep
+    using them. Pool processes are therefore forked from a clean fork
+    server (spawned where that is unavailable) and run
+    :func:`init_pool_process` as their initializer.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        # Imported once by the server, without opening any connection.
+        ctx.set_forkserver_preload(["django.db.models", "openpyxl"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def init_pool_process(warm: str | None = None) -> None:
+    """Set Django up in a fresh pool process.
+
+    Pool initializers are unpickled before they run, so this lives in a
+    module that can be imported before ``django.setup()``.
+
+    Args:
+        warm: Optional dotted path of a callable to run afterwards,
+            e.g. to load a template once per process.
+    """
+    import django
+    from django.utils.module_loading import import_string
+
+    django.setup()
+    if warm:
+        import_string(warm)()
+
+
+def reset_after_fork() -> None:
+    """Drop per-process clients a worker may have inherited."""
+    from accounts.services.google_certs import get_google_session
+    from config.redis import get_redis
+    from jobs.services.dispatch_service import reset_local_pool
+
+    get_redis.cache_clear()
+    get_google_session.cache_clear()
+    # Pool threads do not survive fork; start a fresh pool on demand.
+    reset_local_pool()
@@ -0,0 +1,144 @@
+"""Sliding-window rate limit counters shared by all web processes.
+
+``settings.THROTTLE_BACKEND`` selects the store:
+
+* ``redis`` – one sorted set of request timestamps per key, trimmed
+  and counted by a Lua script so the check is atomic across workers.
+* ``local`` – an in-process stand-in with the same semantics, for
+  single-process setups and tests.
+
+Rejections are counted per scope (:func:`rejection_counts`) so the
+effect of the limits can be watched.
+"""
+
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from config.redis import get_redis
+
+if TYPE_CHECKING:
+    from redis.commands.core import Script
+
+logger = logging.getLogger(__name__)
+
+REJECTIONS_KEY = "throttle:rejections"
+
+# KEYS[1] = window key; ARGV = now, window, limit, member.
+# Returns {1, 0} when allowed, {0, "<seconds to wait>"} otherwise.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tostring(tonumber(oldest[2]) + window - now)}
+"""
+
+
+@functools.cache
+def _sliding_window() -> "Script":
+    """Return the sliding-window script, registered once per process."""
+    return get_redis().register_script(_SLIDING_WINDOW_LUA)
+
+
+class _LocalStore:
+    """Thread-safe in-process sliding windows."""
+
+    max_keys = 10000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows: OrderedDict[str, deque[float]] = OrderedDict()
+        self.rejections: Counter[str] = Counter()
+
+    def hit(self, key: str, limit: int, window: float) -> float | None:
+        now = time.time()
+        with self._lock:
+            hits = self._windows.setdefault(key, deque())
+            self._windows.move_to_end(key)
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows.clear()
+            self.rejections.clear()
+
+
+_local_store = _LocalStore()
+
+
+def hit(key: str, limit: int, window: float) -> float | None:
+    """Record a request against a sliding window if it fits.
+
+    Redis errors fail open: the request is allowed and a warning is
+    logged, so an outage of the counter store does not lock users out.
+
+    Args:
+        key: Window key, e.g. ``throttle:login.ip:203.0.113.7``.
+        limit: Requests allowed per window.
+        window: Window length in seconds.
+
+    Returns:
+        None if the request is allowed, otherwise the seconds until
+        the oldest request leaves the window.
+    """
+    if settings.THROTTLE_BACKEND != "redis":
+        return _local_store.hit(key, limit, window)
+    try:
+        client = get_redis()
+        allowed, wait = _sliding_window()(
+            keys=[key],
+            args=[time.time(), window, limit, uuid.uuid4().hex],
+            client=client,
+        )
+    except Exception:
+        logger.warning("Throttle hisoblagichi ishlamadi: %s", key, exc_info=True)
+        return None
+    return None if allowed else max(float(wait), 0.0)
+
+
+def record_rejection(scope: str) -> None:
+    """Count a throttled request for ``scope``; never raises."""
+    logger.info("So'rov cheklandi: %s", scope)
+    if settings.THROTTLE_BACKEND != "redis":
+        with _local_store._lock:
+            _local_store.rejections[scope] += 1
+        return
+    try:
+        get_redis().hincrby(REJECTIONS_KEY, scope, 1)
+    except Exception:
+        logger.warning("Throttle statistikasi yozilmadi: %s", scope, exc_info=True)
+
+
+def rejection_counts() -> dict[str, int]:
+    """Return the number of throttled requests per scope."""
+    if settings.THROTTLE_BACKEND != "redis":
+        with _local_store._lock:
+            return dict(_local_store.rejections)
+    return {
+        scope.decode(): int(count)
+        for scope, count in get_redis().hgetall(REJECTIONS_KEY).items()
+    }
+
+
+def reset_local_store() -> None:
+    """Forget all in-process windows and counters (tests)."""
+    _local_store.reset()
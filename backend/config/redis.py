@@ -0,0 +1,29 @@
+"""Shared Redis clients built from ``settings.REDIS_URL``."""
+
+import functools
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    import redis
+    import redis.asyncio
+
+
+@functools.cache
+def get_redis() -> "redis.Redis":
+    """Return the process-wide synchronous Redis client."""
+    import redis
+
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def get_async_redis() -> "redis.asyncio.Redis":
+    """Return a new asyncio Redis client.
+
+    asyncio clients are bound to the event loop they are used on, so
+    callers own the client and must ``aclose()`` it.
+    """
+    import redis.asyncio
+
+    return redis.asyncio.Redis.from_url(settings.REDIS_URL)
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     # Local
     "accounts",
     "smetalar",
+    "jobs",
 ]
 
 MIDDLEWARE = [
@@ -80,6 +81,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# "wsgi" or "asgi": how this process serves requests. config/asgi.py
+# defaults it to "asgi"; the database settings below depend on it.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+
 # ---------------------------------------------------------------------------
 # Database
 # ---------------------------------------------------------------------------
@@ -104,6 +109,24 @@ if _database_url.startswith("postgres"):
                 "PORT": _m.group("port"),
             }
         }
+        # Reuse connections instead of a new TLS/auth handshake per
+        # request: psycopg 3's pool (DB_POOL, needs the "pool" extra) or
+        # persistent connections checked before reuse. Persistent
+        # connections are not reused across async requests and pile up
+        # under ASGI, so there DB_CONN_MAX_AGE is ignored.
+        if os.getenv("DB_POOL", "False").lower() in ("true", "1", "yes"):
+            DATABASES["default"]["OPTIONS"] = {
+                "pool": {
+                    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+                    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+                },
+            }
+        else:
+            DATABASES["default"]["CONN_MAX_AGE"] = (
+                0 if SERVER_MODE == "asgi" else int(os.getenv("DB_CONN_MAX_AGE", "60"))
+            )
+            DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
     else:
         DATABASES = {
             "default": {
@@ -119,6 +142,9 @@ else:
         }
     }
 
+# Seconds between pool statistics log lines per process; 0 disables.
+DB_POOL_STATS_INTERVAL = int(os.getenv("DB_POOL_STATS_INTERVAL", "60"))
+
 # ---------------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------------
@@ -128,6 +154,25 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation." "MinimumLengthValidator"},
 ]
 
+# Hasher for new and upgraded passwords: "scrypt", "argon2" (needs
+# pip install -e ".[argon2]") or "pbkdf2". Existing hashes of the others
+# still verify and are upgraded on the next login (accounts/hashers.py).
+# Calibrate the cost knobs with `manage.py calibrate_password_hasher`.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "scrypt")
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000"))
+PASSWORD_SCRYPT_PARALLELISM = int(os.getenv("PASSWORD_SCRYPT_PARALLELISM", "5"))
+PASSWORD_ARGON2_TIME_COST = int(os.getenv("PASSWORD_ARGON2_TIME_COST", "2"))
+_password_hashers = {
+    "scrypt": "accounts.hashers.TunedScryptPasswordHasher",
+    "argon2": "accounts.hashers.TunedArgon2PasswordHasher",
+    "pbkdf2": "accounts.hashers.TunedPBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _password_hashers.pop(PASSWORD_HASHER),
+    *_password_hashers.values(),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
@@ -153,13 +198,22 @@ SOCIALACCOUNT_PROVIDERS = {
         "AUTH_PARAMS": {"access_type": "online"},
     }
 }
+# google_login verifies ID tokens against this certificate set, cached
+# for the response's max-age (or GOOGLE_CERTS_DEFAULT_TTL without one).
+GOOGLE_CERTS_URL = os.getenv(
+    "GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"
+)
+GOOGLE_CERTS_TIMEOUT = float(os.getenv("GOOGLE_CERTS_TIMEOUT", "5"))
+GOOGLE_CERTS_DEFAULT_TTL = int(os.getenv("GOOGLE_CERTS_DEFAULT_TTL", "3600"))
+# Unknown key ids trigger a refetch at most this often (seconds).
+GOOGLE_CERTS_MIN_REFRESH = int(os.getenv("GOOGLE_CERTS_MIN_REFRESH", "60"))
 
 # ---------------------------------------------------------------------------
 # DRF
 # ---------------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": ("rest_framework.pagination.PageNumberPagination"),
@@ -170,6 +224,22 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Per-user limit for endpoints that start export/import work.
+    # "<scope>.ip" / "<scope>.email": sliding windows on the auth
+    # endpoints (accounts/api/throttling.py).
+    "DEFAULT_THROTTLE_RATES": {
+        "exports": os.getenv("EXPORT_THROTTLE_RATE", "30/min"),
+        "login.ip": os.getenv("LOGIN_IP_THROTTLE_RATE", "30/min"),
+        "login.email": os.getenv("LOGIN_EMAIL_THROTTLE_RATE", "10/min"),
+        "register.ip": os.getenv("REGISTER_IP_THROTTLE_RATE", "10/hour"),
+        "register.email": os.getenv("REGISTER_EMAIL_THROTTLE_RATE", "5/hour"),
+        "google_login.ip": os.getenv("GOOGLE_LOGIN_IP_THROTTLE_RATE", "30/min"),
+        "token_refresh.ip": os.getenv("TOKEN_REFRESH_IP_THROTTLE_RATE", "60/min"),
+    },
+    # Proxies in front of Django; the client IP is taken from
+    # X-Forwarded-For accordingly. Production sits behind nginx (1), so
+    # clients cannot pick their throttle key with a forged header.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0" if DEBUG else "1")),
 }
 
 # ---------------------------------------------------------------------------
@@ -181,7 +251,15 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": False,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Used refresh tokens are revoked in TOKEN_REVOCATION_BACKEND instead
+    # of the database blacklist (BLACKLIST_AFTER_ROTATION).
+    "TOKEN_REFRESH_SERIALIZER": (
+        "accounts.api.serializers.input.RevokingTokenRefreshSerializer"
+    ),
 }
+# CachedJWTAuthentication keeps resolved users this long (seconds);
+# saves and deletes invalidate the entry immediately.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "300"))
 
 REST_AUTH = {
     "USE_JWT": True,
@@ -226,6 +304,112 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 
+# Heavy workbook builds/imports run on their own queue and worker so
+# they cannot starve light tasks on the default queue.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "smetalar.tasks.excel_tasks.*": {"queue": "exports"},
+}
+# Ack after the task finishes so a crashed worker's job is redelivered.
+# The Redis visibility timeout must exceed the longest task time limit,
+# otherwise running tasks are redelivered a second time.
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": int(os.getenv("CELERY_VISIBILITY_TIMEOUT", "3600")),
+}
+CELERY_TASK_SOFT_TIME_LIMIT = int(os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "540"))
+CELERY_TASK_TIME_LIMIT = int(os.getenv("CELERY_TASK_TIME_LIMIT", "600"))
+# Recycle pool processes to bound openpyxl memory growth (KB for memory).
+CELERY_WORKER_MAX_TASKS_PER_CHILD = int(
+    os.getenv("CELERY_WORKER_MAX_TASKS_PER_CHILD", "100")
+)
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = int(
+    os.getenv("CELERY_WORKER_MAX_MEMORY_PER_CHILD", "400000")
+)
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+# "celery" (broker), "local" (in-process pool) or "inline". Without a
+# broker (eager Celery) jobs default to the local pool so they do not
+# block the request thread.
+TASK_BACKEND = os.getenv(
+    "TASK_BACKEND",
+    "local" if CELERY_TASK_ALWAYS_EAGER else "celery",
+)
+TASK_LOCAL_POOL = os.getenv("TASK_LOCAL_POOL", "thread")  # or "process"
+TASK_LOCAL_WORKERS = int(os.getenv("TASK_LOCAL_WORKERS", "2"))
+
+# Shared Redis for pub/sub and other non-Celery uses.
+REDIS_URL = os.getenv("REDIS_URL", CELERY_BROKER_URL)
+# Job progress transport: "redis" (pub/sub) or "local" (in-process).
+JOB_EVENTS_BACKEND = os.getenv(
+    "JOB_EVENTS_BACKEND",
+    "redis" if TASK_BACKEND == "celery" else "local",
+)
+JOB_EVENTS_TTL = int(os.getenv("JOB_EVENTS_TTL", "3600"))
+JOB_EVENTS_KEEPALIVE = float(os.getenv("JOB_EVENTS_KEEPALIVE", "15"))
+JOB_EVENTS_MAX_SECONDS = int(os.getenv("JOB_EVENTS_MAX_SECONDS", "900"))
+# Lifetime of the ?token= that lets EventSource open a job's stream.
+JOB_EVENTS_TOKEN_SECONDS = int(os.getenv("JOB_EVENTS_TOKEN_SECONDS", "300"))
+# Revoked refresh tokens (accounts/services/token_revocation.py).
+TOKEN_REVOCATION_BACKEND = os.getenv(
+    "TOKEN_REVOCATION_BACKEND",
+    "redis" if TASK_BACKEND == "celery" else "local",
+)
+# Auth throttle counters (config/ratelimit.py): "redis" or "local".
+THROTTLE_BACKEND = os.getenv(
+    "THROTTLE_BACKEND",
+    "redis" if TASK_BACKEND == "celery" else "local",
+)
+
+# Transactional outbox (post-commit follow-up work).
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+# How long a relay owns the events it claimed; a crashed relay's events
+# are picked up again after this.
+OUTBOX_CLAIM_SECONDS = int(os.getenv("OUTBOX_CLAIM_SECONDS", "300"))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+# Safety net for events whose post-commit relay never ran (celery beat).
+CELERY_BEAT_SCHEDULE = {
+    "relay-outbox": {
+        "task": "jobs.tasks.relay_outbox_task",
+        "schedule": float(os.getenv("OUTBOX_RELAY_INTERVAL", "60")),
+    },
+    "purge-outbox": {
+        "task": "jobs.tasks.purge_outbox_task",
+        "schedule": 24 * 60 * 60,
+    },
+}
+
+# ---------------------------------------------------------------------------
+# Cache (config/cache.py)
+# ---------------------------------------------------------------------------
+# "redis" shares the cache between workers and nodes; "locmem" is
+# per-process and only suits single-process setups and tests.
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND",
+    "redis" if TASK_BACKEND == "celery" else "locmem",
+)
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_URL", REDIS_URL),
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "bolajakolim"),
+            "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+        }
+    }
+
 # ---------------------------------------------------------------------------
 # i18n / tz
 # ---------------------------------------------------------------------------
@@ -242,10 +426,105 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Generated files (Excel exports): "local" (MEDIA_ROOT) or "s3" for any
+# S3-compatible object store (set EXPORT_S3_ENDPOINT_URL for MinIO).
+# "s3" requires the optional ``s3`` extra (django-storages + boto3).
+EXPORT_STORAGE_BACKEND = os.getenv("EXPORT_STORAGE_BACKEND", "local")
+if EXPORT_STORAGE_BACKEND == "s3":
+    _export_storage = {
+        "BACKEND": "storages.backends.s3.S3Storage",
+        "OPTIONS": {
+            "bucket_name": os.getenv("EXPORT_S3_BUCKET", "bolajakolim-exports"),
+            "endpoint_url": os.getenv("EXPORT_S3_ENDPOINT_URL") or None,
+            "region_name": os.getenv("EXPORT_S3_REGION") or None,
+            "access_key": os.getenv("EXPORT_S3_ACCESS_KEY") or None,
+            "secret_key": os.getenv("EXPORT_S3_SECRET_KEY") or None,
+            "addressing_style": os.getenv("EXPORT_S3_ADDRESSING_STYLE") or None,
+            "signature_version": "s3v4",
+            "default_acl": "private",
+            "file_overwrite": False,
+            # Presigned download URLs; the object store serves the bytes.
+            "querystring_auth": True,
+            "querystring_expire": int(os.getenv("EXPORT_URL_EXPIRE", "300")),
+        },
+    }
+else:
+    _export_storage = {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    "exports": _export_storage,
+}
+
+# Local exports are downloaded through Django's access check and then
+# sent by nginx from this internal location (see deploy/nginx.conf).
+# Off by default so development without nginx serves the file directly.
+EXPORT_X_ACCEL_REDIRECT = os.getenv("EXPORT_X_ACCEL_REDIRECT", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+EXPORT_X_ACCEL_PREFIX = os.getenv("EXPORT_X_ACCEL_PREFIX", "/protected/media/")
+
 GENERATED_FILES_DIR = BASE_DIR / "generated_files"
 
+# ---------------------------------------------------------------------------
+# Excel export / import
+# ---------------------------------------------------------------------------
+# Process pool size for bulk exports; 0 means one process per CPU core.
+SMETA_EXPORT_WORKERS = int(os.getenv("SMETA_EXPORT_WORKERS", "0"))
+SMETA_BULK_EXPORT_MAX_IDS = int(os.getenv("SMETA_BULK_EXPORT_MAX_IDS", "100"))
+# How long a single-smeta export request holds its per-version lock.
+SMETA_EXPORT_LOCK_TTL = int(os.getenv("SMETA_EXPORT_LOCK_TTL", "300"))
+# Pre-styled workbook layout; regenerate with `manage.py build_excel_template`.
+SMETA_EXCEL_TEMPLATE = os.getenv(
+    "SMETA_EXCEL_TEMPLATE",
+    str(BASE_DIR / "smetalar" / "excel_templates" / "smeta_template.xlsx"),
+)
+SMETA_EXCEL_BENCHMARK_BASELINE = os.getenv(
+    "SMETA_EXCEL_BENCHMARK_BASELINE",
+    str(BASE_DIR / "benchmarks" / "excel_baseline.json"),
+)
+# Dashboard summary cache; changes to a smeta invalidate it at once.
+SMETA_SUMMARY_CACHE_TTL = int(os.getenv("SMETA_SUMMARY_CACHE_TTL", "600"))
+# Delta sync (GET /api/smetalar/changes/). Deletions are kept as
+# tombstones for the retention window; older cursors reload the list.
+SMETA_CHANGES_PAGE_SIZE = int(os.getenv("SMETA_CHANGES_PAGE_SIZE", "200"))
+SMETA_CHANGES_SETTLE_SECONDS = int(os.getenv("SMETA_CHANGES_SETTLE_SECONDS", "5"))
+SMETA_TOMBSTONE_RETENTION_DAYS = int(
+    os.getenv("SMETA_TOMBSTONE_RETENTION_DAYS", "30")
+)
+# Uploads above SMETA_IMPORT_ASYNC_BYTES are parsed by a Celery task.
+SMETA_IMPORT_MAX_BYTES = int(os.getenv("SMETA_IMPORT_MAX_BYTES", str(20 * 1024**2)))
+SMETA_IMPORT_ASYNC_BYTES = int(os.getenv("SMETA_IMPORT_ASYNC_BYTES", str(1024**2)))
+# Generated file clean-up (Celery beat). Unreferenced files are removed
+# after the grace period; referenced ones after the retention window
+# (0 keeps them) and are rebuilt on the next export request.
+SMETA_EXCEL_RETENTION_DAYS = int(os.getenv("SMETA_EXCEL_RETENTION_DAYS", "90"))
+SMETA_EXCEL_GC_GRACE_SECONDS = int(os.getenv("SMETA_EXCEL_GC_GRACE_SECONDS", "3600"))
+SMETA_EXCEL_GC_BATCH_SIZE = int(os.getenv("SMETA_EXCEL_GC_BATCH_SIZE", "500"))
+CELERY_BEAT_SCHEDULE["gc-excel-files"] = {
+    "task": "smetalar.tasks.maintenance_tasks.gc_excel_files_task",
+    "schedule": 6 * 60 * 60,
+}
+CELERY_BEAT_SCHEDULE["purge-smeta-tombstones"] = {
+    "task": "smetalar.tasks.maintenance_tasks.purge_smeta_tombstones_task",
+    "schedule": 24 * 60 * 60,
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# ---------------------------------------------------------------------------
+# Startup budget (config/startup.py)
+# ---------------------------------------------------------------------------
+# django.setup() + URLconf load of a fresh process, checked by the tests
+# when STARTUP_BUDGET_CHECK=1.
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "2.0"))
+STARTUP_BUDGET_RSS_MB = float(os.getenv("STARTUP_BUDGET_RSS_MB", "80"))
+
 # ---------------------------------------------------------------------------
 # Production security (only when DEBUG=False)
 # ---------------------------------------------------------------------------
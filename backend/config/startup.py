@@ -0,0 +1,114 @@
+"""Startup cost budget for web workers.
+
+Every Gunicorn worker, Celery process and management command pays for
+``django.setup()`` and, for web workers, loading the URLconf. Heavy
+optional dependencies (openpyxl, google-auth, redis) are imported
+lazily by the code that uses them; :func:`measure_startup` checks that
+they stay out of startup and that time and memory stay within budget.
+
+Run ``python -X importtime -m config.startup`` for a per-module import
+breakdown on stderr and the measurement as JSON on stdout.
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Any
+
+# Must not be imported by django.setup() + URLconf load.
+LAZY_MODULES = (
+    "openpyxl",
+    "google.auth.transport.requests",
+    "google.oauth2.id_token",
+    "redis",
+)
+
+
+def _max_rss_mb() -> float:
+    try:
+        # Peak RSS of this image; ru_maxrss would carry over the peak of
+        # a large parent (e.g. pytest) across fork + exec.
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _startup() -> dict[str, Any]:
+    """Set up Django and load the URLconf in this (fresh) process."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    started = time.perf_counter()
+
+    import django
+
+    django.setup()
+
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    return {
+        "seconds": round(time.perf_counter() - started, 3),
+        "max_rss_mb": round(_max_rss_mb(), 1),
+        "modules": len(sys.modules),
+        "lazy_modules_loaded": [m for m in LAZY_MODULES if m in sys.modules],
+    }
+
+
+def measure_startup() -> dict[str, Any]:
+    """Measure startup in a fresh interpreter.
+
+    Returns:
+        Dict with ``seconds``, ``max_rss_mb``, ``modules`` and
+        ``lazy_modules_loaded``.
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "config.startup"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def check_startup_budget(
+    result: dict[str, Any],
+    max_seconds: float,
+    max_rss_mb: float,
+) -> list[str]:
+    """Compare a :func:`measure_startup` result against the budget.
+
+    Args:
+        result: Measurement to check.
+        max_seconds: Allowed ``django.setup()`` + URLconf time.
+        max_rss_mb: Allowed peak resident memory of the process.
+
+    Returns:
+        Human-readable violations; empty when within budget.
+    """
+    violations = []
+    if result["lazy_modules_loaded"]:
+        violations.append(
+            "Ishga tushishda yuklanmasligi kerak bo'lgan modullar: "
+            + ", ".join(result["lazy_modules_loaded"])
+        )
+    if result["seconds"] > max_seconds:
+        violations.append(
+            f"Ishga tushish {result['seconds']}s, byudjet {max_seconds}s"
+        )
+    if result["max_rss_mb"] > max_rss_mb:
+        violations.append(
+            f"Xotira {result['max_rss_mb']} MB, byudjet {max_rss_mb} MB"
+        )
+    return violations
+
+
+if __name__ == "__main__":
+    print(json.dumps(_startup()))
@@ -0,0 +1,13 @@
+"""Storage backends for files generated by the application."""
+
+from django.core.files.storage import Storage, storages
+
+
+def export_storage() -> Storage:
+    """Return the storage for generated files (``STORAGES["exports"]``).
+
+    Local filesystem by default; any S3-compatible service (AWS, MinIO)
+    when ``EXPORT_STORAGE_BACKEND=s3``, so every app node reads the
+    same files and downloads use presigned URLs.
+    """
+    return storages["exports"]
@@ -0,0 +1,91 @@
+"""Tests for the namespaced cache helpers."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from config.cache import SMETA, Namespace, memoize
+
+
+class TestCacheHelpers:
+    """Tests for cache namespaces and @memoize."""
+
+    def test_namespace_keys_are_versioned(self) -> None:
+        """Keys carry the namespace name and version."""
+        assert SMETA.key("detail", 7) == "smeta:1:detail:7"
+        assert Namespace("report", version=3).key("x") == "report:3:x"
+
+    def test_memoize_caches_and_invalidates(self) -> None:
+        """Results are reused per arguments until invalidated."""
+        calls = []
+
+        @memoize(SMETA, ttl=60)
+        def selector(smeta_id: int, status: str | None = None) -> int:
+            calls.append(smeta_id)
+            return smeta_id * 2
+
+        assert selector(1) == selector(1) == 2
+        assert selector(1, status="draft") == 2
+        assert calls == [1, 1]
+        selector.invalidate(1)
+        selector(1)
+        assert calls == [1, 1, 1]
+
+    def test_memoize_recomputes_early_near_expiry(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """An entry about to expire is refreshed before it does."""
+        calls = []
+
+        @memoize(SMETA, ttl=60, beta=1.0)
+        def selector() -> int:
+            calls.append(1)
+            time.sleep(0.05)
+            return len(calls)
+
+        selector()
+        # 59.9 s later; a draw of 0.05 s * -ln(1e-6) ~ 0.7 s reaches expiry.
+        now = time.time()
+        clock = SimpleNamespace(time=lambda: now + 59.9, monotonic=time.monotonic)
+        monkeypatch.setattr("config.cache.time", clock)
+        monkeypatch.setattr(
+            "config.cache.random",
+            SimpleNamespace(random=lambda: 0.999999),
+        )
+        assert selector() == 2
+
+    def test_memoize_async(self) -> None:
+        """Coroutine selectors are memoized with the async cache API."""
+        calls = []
+
+        @memoize(SMETA, ttl=60)
+        async def selector(smeta_id: int) -> int:
+            calls.append(smeta_id)
+            return smeta_id
+
+        async def run() -> None:
+            assert await selector(5) == await selector(5) == 5
+
+        asyncio.run(run())
+        assert calls == [5]
+
+    def test_memoize_survives_cache_errors(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A failing cache falls back to calling the selector."""
+
+        def broken(*args: object, **kwargs: object) -> None:
+            raise ConnectionError("cache down")
+
+        monkeypatch.setattr("config.cache.cache.get", broken)
+        monkeypatch.setattr("config.cache.cache.set", broken)
+
+        @memoize(SMETA, ttl=60)
+        def selector() -> str:
+            return "fresh"
+
+        assert selector() == "fresh"
@@ -0,0 +1,122 @@
+"""Tests for database pool metrics and fork-safe process pools."""
+
+import logging
+import runpy
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from django.conf import settings
+
+from config import db
+from config.fork import init_pool_process, process_pool_context
+
+
+class _FakePool:
+    """Stands in for a psycopg_pool.ConnectionPool's statistics API."""
+
+    def __init__(self, stats: dict[str, int]) -> None:
+        self.stats = stats
+        self.popped = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return dict(self.stats)
+
+    def pop_stats(self) -> dict[str, int]:
+        self.popped += 1
+        return dict(self.stats)
+
+
+@pytest.fixture()
+def fake_pool(
+    monkeypatch: pytest.MonkeyPatch,
+    settings,  # type: ignore[no-untyped-def]
+) -> _FakePool:
+    """Report statistics from a fake pool, as if DB_POOL were on."""
+    pool = _FakePool({"pool_size": 4, "pool_available": 1, "requests_num": 9})
+    monkeypatch.setattr(db, "get_pool", lambda alias="default": pool)
+    monkeypatch.setattr(db, "_last_report", 0.0)
+    settings.DB_POOL_STATS_INTERVAL = 60
+    return pool
+
+
+class TestDbPoolStats:
+    """Tests for pool statistics reporting (config.db)."""
+
+    def test_unpooled_database_has_no_stats(self) -> None:
+        """SQLite (and CONN_MAX_AGE setups) report no pool."""
+        assert db.get_pool() is None
+        assert db.pool_stats() is None
+
+    def test_report_logs_and_resets_once_per_interval(
+        self,
+        fake_pool: _FakePool,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Counters are logged, reset, and not reported again too soon."""
+        with caplog.at_level(logging.INFO, logger="config.db"):
+            db.report_pool_stats()
+            db.report_pool_stats()
+        assert fake_pool.popped == 1
+        assert [r.levelno for r in caplog.records] == [logging.INFO]
+        assert "size=4 available=1 requests=9" in caplog.records[0].getMessage()
+
+    def test_report_warns_when_requests_queued(
+        self,
+        fake_pool: _FakePool,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Queued requests mean DB_POOL_MAX_SIZE is too small."""
+        fake_pool.stats["requests_queued"] = 3
+        with caplog.at_level(logging.INFO, logger="config.db"):
+            db.report_pool_stats()
+        assert caplog.records[0].levelno == logging.WARNING
+
+    def test_report_disabled(
+        self,
+        fake_pool: _FakePool,
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """An interval of 0 turns reporting off."""
+        settings.DB_POOL_STATS_INTERVAL = 0
+        db.report_pool_stats()
+        assert fake_pool.popped == 0
+
+
+class TestProcessPools:
+    """Tests for config.fork process pool setup."""
+
+    def test_process_pools_do_not_fork_the_server(self) -> None:
+        """Pool processes start from a clean interpreter and set Django up."""
+        ctx = process_pool_context()
+        assert ctx.get_start_method() in ("forkserver", "spawn")
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=ctx,
+            initializer=init_pool_process,
+            initargs=("django.db.close_old_connections",),
+        ) as pool:
+            assert pool.submit(db.get_pool).result() is None
+
+
+class TestDatabaseSettings:
+    """Tests for connection reuse per server mode (config.settings)."""
+
+    URL = "postgres://u:p@localhost:5432/db"
+
+    def _load(self, monkeypatch: pytest.MonkeyPatch, **env: str) -> dict:
+        monkeypatch.setenv("DATABASE_URL", self.URL)
+        monkeypatch.setenv("DB_CONN_MAX_AGE", "60")
+        monkeypatch.delenv("DB_POOL", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return runpy.run_path(settings.BASE_DIR / "config" / "settings.py")
+
+    def test_wsgi_keeps_connections(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """WSGI workers honour DB_CONN_MAX_AGE."""
+        config = self._load(monkeypatch, SERVER_MODE="wsgi")
+        assert config["DATABASES"]["default"]["CONN_MAX_AGE"] == 60
+
+    def test_asgi_closes_connections(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """ASGI processes never keep persistent connections."""
+        config = self._load(monkeypatch, SERVER_MODE="asgi")
+        assert config["DATABASES"]["default"]["CONN_MAX_AGE"] == 0
@@ -0,0 +1,57 @@
+"""Tests for the Redis-backed sliding-window counters."""
+
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from config import ratelimit
+
+
+@pytest.fixture()
+def fake_redis(
+    monkeypatch: pytest.MonkeyPatch,
+    settings,  # type: ignore[no-untyped-def]
+) -> fakeredis.FakeRedis:
+    """Route the ``redis`` throttle backend to an in-memory server with Lua."""
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(ratelimit, "get_redis", lambda: client)
+    settings.THROTTLE_BACKEND = "redis"
+    return client
+
+
+class TestSlidingWindow:
+    """Tests for config.ratelimit with the ``redis`` backend."""
+
+    def test_hit_runs_sliding_window_script(
+        self,
+        fake_redis: fakeredis.FakeRedis,
+    ) -> None:
+        """Requests over the limit get the time until the oldest one expires."""
+        assert ratelimit.hit("throttle:t:a", 2, 60) is None
+        assert ratelimit.hit("throttle:t:a", 2, 60) is None
+        wait = ratelimit.hit("throttle:t:a", 2, 60)
+        assert wait is not None and 0 < wait <= 60
+        assert ratelimit.hit("throttle:t:b", 2, 60) is None
+        assert fake_redis.zcard("throttle:t:a") == 2
+        assert 0 < fake_redis.pttl("throttle:t:a") <= 60_000
+
+    def test_window_slides(
+        self,
+        fake_redis: fakeredis.FakeRedis,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Hits older than the window no longer count."""
+        now = 1_000.0
+        monkeypatch.setattr(ratelimit, "time", SimpleNamespace(time=lambda: now))
+        assert ratelimit.hit("throttle:t:a", 1, 10) is None
+        now += 4
+        assert ratelimit.hit("throttle:t:a", 1, 10) == pytest.approx(6)
+        now += 7
+        assert ratelimit.hit("throttle:t:a", 1, 10) is None
+
+    def test_rejections_counted(self, fake_redis: fakeredis.FakeRedis) -> None:
+        """Rejections are tallied per scope in Redis."""
+        ratelimit.record_rejection("login.ip")
+        ratelimit.record_rejection("login.ip")
+        assert ratelimit.rejection_counts() == {"login.ip": 2}
@@ -0,0 +1,46 @@
+"""Tests for the worker startup budget.
+
+Time and memory depend on the machine, so the budget check only runs
+with ``STARTUP_BUDGET_CHECK=1`` (e.g. on the deploy host); the lazy
+import check always runs.
+"""
+
+import os
+
+import pytest
+from django.conf import settings
+
+from config.startup import check_startup_budget, measure_startup
+
+
+def test_startup_imports_stay_lazy() -> None:
+    """django.setup() + URLconf do not import the heavy optional modules."""
+    assert measure_startup()["lazy_modules_loaded"] == []
+
+
+@pytest.mark.skipif(
+    os.getenv("STARTUP_BUDGET_CHECK") != "1",
+    reason="set STARTUP_BUDGET_CHECK=1 to check startup time and memory",
+)
+def test_startup_within_budget() -> None:
+    """django.setup() + URLconf stay lazy, fast and small."""
+    result = measure_startup()
+    violations = check_startup_budget(
+        result,
+        max_seconds=settings.STARTUP_BUDGET_SECONDS,
+        max_rss_mb=settings.STARTUP_BUDGET_RSS_MB,
+    )
+    assert not violations, result
+
+
+def test_check_reports_eager_imports() -> None:
+    """A heavy module loaded at startup is reported."""
+    result = {
+        "seconds": 0.1,
+        "max_rss_mb": 10.0,
+        "modules": 1,
+        "lazy_modules_loaded": ["openpyxl"],
+    }
+    violations = check_startup_budget(result, max_seconds=1, max_rss_mb=100)
+    assert len(violations) == 1
+    assert "openpyxl" in violations[0]
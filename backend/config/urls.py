@@ -13,6 +13,10 @@ urlpatterns = [
     path("api/auth/", include("accounts.api.urls")),
     # Smetalar
     path("api/", include("smetalar.api.urls")),
+    # Background jobs
+    path("api/", include("jobs.api.urls")),
+    # Async (ASGI) read endpoints
+    path("api/async/", include("config.async_urls")),
     # Schema
     path(
         "api/schema/",
@@ -0,0 +1,21 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from django.core.cache import cache
+
+from accounts.services import token_revocation
+from config import ratelimit
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    """Isolate cache-backed state (throttles, locks) between tests."""
+    cache.clear()
+    ratelimit.reset_local_store()
+    token_revocation.reset_local_store()
+
+
+@pytest.fixture(autouse=True)
+def _inline_jobs(settings) -> None:  # type: ignore[no-untyped-def]
+    """Run background jobs synchronously inside the test transaction."""
+    settings.TASK_BACKEND = "inline"
@@ -0,0 +1,31 @@
+"""Admin configuration for jobs app."""
+
+from django.contrib import admin
+
+from jobs.models import Job, OutboxEvent
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Read-only admin for background jobs."""
+
+    list_display = ("name", "status", "backend", "user", "created_at")
+    list_filter = ("status", "backend", "name")
+    search_fields = ("id", "name", "user__email")
+    readonly_fields = [f.name for f in Job._meta.fields]
+
+    def has_add_permission(self, request) -> bool:  # type: ignore[no-untyped-def]
+        return False
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Read-only admin for outbox events."""
+
+    list_display = ("key", "topic", "attempts", "created_at", "processed_at")
+    list_filter = ("topic",)
+    search_fields = ("key",)
+    readonly_fields = [f.name for f in OutboxEvent._meta.fields]
+
+    def has_add_permission(self, request) -> bool:  # type: ignore[no-untyped-def]
+        return False
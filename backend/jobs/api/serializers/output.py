@@ -0,0 +1,39 @@
+"""Output (read) serializers for jobs API."""
+
+from rest_framework import serializers
+
+from jobs.models import Job
+
+
+class JobOutputSerializer(serializers.ModelSerializer):
+    """Read serializer for a background job.
+
+    Fields:
+        id, name, status, result, error, created_at, started_at,
+        finished_at.
+    """
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "name",
+            "status",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class JobEventsTokenSerializer(serializers.Serializer):
+    """Short-lived token for opening a job's event stream.
+
+    Fields:
+        token, events_url (the stream URL with the token appended).
+    """
+
+    token = serializers.CharField()
+    events_url = serializers.CharField()
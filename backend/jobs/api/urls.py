@@ -0,0 +1,16 @@
+"""URL patterns for jobs API."""
+
+from django.urls import include, path
+from rest_framework.routers import SimpleRouter
+
+from jobs.api.views import JobViewSet, job_events
+
+app_name = "jobs"
+
+router = SimpleRouter()
+router.register("jobs", JobViewSet, basename="job")
+
+urlpatterns = [
+    path("jobs/<str:job_id>/events", job_events, name="job-events"),
+    path("", include(router.urls)),
+]
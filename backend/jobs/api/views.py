@@ -0,0 +1,214 @@
+"""API views for jobs app."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from django.conf import settings
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views.decorators.http import require_GET
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+
+from accounts.api.async_auth import aauthenticate_jwt, jwt_required
+from jobs.api.serializers.output import JobEventsTokenSerializer, JobOutputSerializer
+from jobs.models import Job
+from jobs.selectors.job_selector import aget_user_job, get_user_job
+from jobs.services.events_token_service import make_events_token, read_events_token
+from jobs.services.progress_service import TERMINAL_STATUSES, open_subscription
+
+
+@extend_schema_view(
+    retrieve=extend_schema(
+        summary="Job status",
+        description="Status and result of a background export/import job.",
+        responses={200: JobOutputSerializer},
+    ),
+    events_token=extend_schema(
+        summary="Job event stream token",
+        description=(
+            "Short-lived token for opening GET /api/jobs/{id}/events "
+            "with EventSource, which cannot send an Authorization header."
+        ),
+        request=None,
+        responses={200: JobEventsTokenSerializer},
+    ),
+)
+class JobViewSet(ViewSet):
+    """Read-only access to the user's background jobs."""
+
+    permission_classes = [IsAuthenticated]
+
+    def retrieve(self, request: Request, pk: str = None) -> Response:
+        """Get the status of a single job.
+
+        Args:
+            request: Authenticated DRF Request.
+            pk: Job id (UUID).
+
+        Returns:
+            Job status and result.
+        """
+        job = get_user_job(job_id=pk, user_id=request.user.pk)
+        if job is None:
+            return Response(
+                {"detail": "Vazifa topilmadi."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(JobOutputSerializer(job).data)
+
+    @action(detail=True, methods=["post"], url_path="events-token")
+    def events_token(self, request: Request, pk: str = None) -> Response:
+        """Issue a token for the job's event stream.
+
+        Args:
+            request: Authenticated DRF Request.
+            pk: Job id (UUID).
+
+        Returns:
+            The token and the stream URL carrying it.
+        """
+        job = get_user_job(job_id=pk, user_id=request.user.pk)
+        if job is None:
+            return Response(
+                {"detail": "Vazifa topilmadi."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        token = make_events_token(job)
+        url = reverse("jobs:job-events", kwargs={"job_id": str(job.pk)})
+        return Response(
+            JobEventsTokenSerializer(
+                {
+                    "token": token,
+                    "events_url": f"{url}?{urlencode({'token': token})}",
+                }
+            ).data
+        )
+
+
+def _sse(event: dict[str, Any]) -> str:
+    name = "done" if event.get("status") in TERMINAL_STATUSES else "progress"
+    return f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _final_event(job: Job) -> dict[str, Any] | None:
+    """Build the closing event from the stored job state, if finished."""
+    if job.status not in TERMINAL_STATUSES:
+        return None
+    return {
+        "job": str(job.pk),
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+    }
+
+
+async def _event_stream(job: Job) -> AsyncIterator[str]:
+    """Yield SSE frames until the job finishes or the stream times out.
+
+    The stored job row is re-checked on every keepalive, so a missed
+    pub/sub message can delay but never hang the stream.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.JOB_EVENTS_MAX_SECONDS
+    subscription = await open_subscription(str(job.pk))
+    try:
+        final = _final_event(job)
+        if final:
+            yield _sse(final)
+            return
+        yield "retry: 3000\n\n"
+        while loop.time() < deadline:
+            event = await subscription.get(settings.JOB_EVENTS_KEEPALIVE)
+            if event is None:
+                await job.arefresh_from_db(fields=["status", "result", "error"])
+                final = _final_event(job)
+                if final:
+                    yield _sse(final)
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(event)
+            if event.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        await subscription.close()
+
+
+@require_GET
+@jwt_required
+async def job_status(request: HttpRequest, job_id: str) -> HttpResponse:
+    """Async variant of ``GET /api/jobs/{id}/`` for the ASGI server.
+
+    Args:
+        request: Request authenticated with a JWT ``Authorization`` header.
+        job_id: Job id (UUID).
+
+    Returns:
+        The job status, or 404.
+    """
+    job = await aget_user_job(job_id=job_id, user_id=request.user.pk)
+    if job is None:
+        return JsonResponse(
+            {"detail": "Vazifa topilmadi."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return JsonResponse(JobOutputSerializer(job).data)
+
+
+@require_GET
+async def job_events(request: HttpRequest, job_id: str) -> HttpResponse:
+    """Stream a job's progress as Server-Sent Events.
+
+    Served as an async view so one held-open connection does not tie
+    up a sync worker. Emits ``progress`` events while the job runs and
+    a final ``done`` event with its result or error.
+
+    Args:
+        request: Request authenticated with a JWT ``Authorization``
+            header or, for ``EventSource``, a ``?token=`` from
+            ``POST /api/jobs/{id}/events-token/``.
+        job_id: Job id (UUID).
+
+    Returns:
+        A ``text/event-stream`` response, or a JSON error.
+    """
+    token = request.GET.get("token")
+    if token:
+        user_id = read_events_token(token, job_id)
+    else:
+        user = await aauthenticate_jwt(request)
+        user_id = user.pk if user is not None else None
+    if user_id is None:
+        return JsonResponse(
+            {"detail": "Autentifikatsiya talab qilinadi."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    job = await aget_user_job(job_id=job_id, user_id=user_id)
+    if job is None:
+        return JsonResponse(
+            {"detail": "Vazifa topilmadi."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    response = StreamingHttpResponse(
+        _event_stream(job),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,27 @@
+"""Recover jobs of the in-process ``local`` backend after a restart."""
+
+from django.core.management.base import BaseCommand
+
+from jobs.services.dispatch_service import resume_local_jobs, run_job
+from jobs.tasks import relay_outbox_task
+
+
+class Command(BaseCommand):
+    """Fail interrupted local jobs and run the queued ones inline.
+
+    Run it once on start-up of a single-node deployment (no broker),
+    before the application server starts accepting requests. Pending
+    outbox events are relayed too, since there is no beat scheduler.
+    """
+
+    help = "Resume queued jobs of the local task backend."
+
+    def handle(self, *args: object, **options: object) -> None:
+        interrupted, queued = resume_local_jobs(submit=run_job)
+        relayed = relay_outbox_task()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"To'xtatilgan: {interrupted}, qayta ishga tushirilgan: {queued}, "
+                f"outbox: {relayed}"
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_outboxevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxevent',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, help_text='A relay is handling the event until then.', null=True),
+        ),
+    ]
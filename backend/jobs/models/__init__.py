@@ -0,0 +1,4 @@
+from .job import Job, JobStatus
+from .outbox import OutboxEvent
+
+__all__ = ["Job", "JobStatus", "OutboxEvent"]
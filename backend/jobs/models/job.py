@@ -0,0 +1,56 @@
+"""Persisted background job model."""
+
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class JobStatus(models.TextChoices):
+    """Background job lifecycle status."""
+
+    QUEUED = "queued", "Navbatda"
+    RUNNING = "running", "Bajarilmoqda"
+    SUCCEEDED = "succeeded", "Bajarildi"
+    FAILED = "failed", "Xatolik"
+
+
+class Job(models.Model):
+    """One dispatched background task and its outcome.
+
+    The primary key doubles as the Celery task id when jobs run on a
+    broker, so clients can track work the same way on every backend.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="jobs",
+        null=True,
+        blank=True,
+    )
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    backend = models.CharField(max_length=20)
+    status = models.CharField(
+        max_length=20,
+        choices=JobStatus.choices,
+        default=JobStatus.QUEUED,
+        db_index=True,
+    )
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Fon vazifasi"
+        verbose_name_plural = "Fon vazifalari"
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.get_status_display()})"
@@ -0,0 +1,46 @@
+"""Transactional outbox for work that must follow a commit."""
+
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """A domain event written in the same transaction as its cause.
+
+    The relay hands unprocessed events to their registered handler
+    after commit, so follow-up work never sees uncommitted data and is
+    not lost when the request process dies right after committing.
+    """
+
+    topic = models.CharField(max_length=100, db_index=True)
+    payload = models.JSONField(default=dict, blank=True)
+    key = models.CharField(
+        max_length=200,
+        unique=True,
+        help_text="Deduplication key; one event per key.",
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="A relay is handling the event until then.",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="outbox_pending_idx",
+                condition=models.Q(processed_at__isnull=True),
+            ),
+        ]
+        verbose_name = "Outbox hodisasi"
+        verbose_name_plural = "Outbox hodisalari"
+
+    def __str__(self) -> str:
+        return self.key
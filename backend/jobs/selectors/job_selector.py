@@ -0,0 +1,36 @@
+"""Selectors (read-only queries) for jobs app."""
+
+import uuid
+
+from django.db.models import QuerySet
+
+from jobs.models import Job
+
+
+def _user_job_queryset(job_id: str, user_id: int) -> QuerySet[Job] | None:
+    try:
+        job_uuid = uuid.UUID(str(job_id))
+    except ValueError:
+        return None
+    return Job.objects.filter(pk=job_uuid, user_id=user_id)
+
+
+def get_user_job(job_id: str, user_id: int) -> Job | None:
+    """Get a job owned by the given user.
+
+    Args:
+        job_id: Job primary key as a string.
+        user_id: The owner's primary key.
+
+    Returns:
+        The Job or None if it does not exist, is not owned by the user
+        or ``job_id`` is not a valid UUID.
+    """
+    qs = _user_job_queryset(job_id, user_id)
+    return qs.first() if qs is not None else None
+
+
+async def aget_user_job(job_id: str, user_id: int) -> Job | None:
+    """Async version of :func:`get_user_job`."""
+    qs = _user_job_queryset(job_id, user_id)
+    return await qs.afirst() if qs is not None else None
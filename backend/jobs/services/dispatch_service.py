@@ -0,0 +1,204 @@
+"""Backend-agnostic dispatch of background tasks.
+
+Every dispatched task gets a persisted :class:`~jobs.models.Job` row.
+``settings.TASK_BACKEND`` selects where it runs:
+
+* ``celery`` – enqueued on the broker; the job id is the Celery task id
+  and the row is updated from Celery signals.
+* ``local`` – a bounded in-process thread or process pool, for
+  single-node deployments without a broker.
+* ``inline`` – run immediately in the caller (tests, scripts).
+"""
+
+import functools
+import logging
+import traceback
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from celery import Task
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from config.celery import app
+from config.fork import init_pool_process, process_pool_context
+from jobs.models import Job, JobStatus
+from jobs.services.progress_service import current_job_id, publish_event
+
+logger = logging.getLogger(__name__)
+
+
+def load_tasks() -> None:
+    """Import every app's ``tasks`` module, as a Celery worker does."""
+    app.loader.import_default_modules()
+
+
+@functools.cache
+def _executor() -> Executor:
+    """Return the shared pool used by the ``local`` backend."""
+    workers = settings.TASK_LOCAL_WORKERS
+    if settings.TASK_LOCAL_POOL == "process":
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=process_pool_context(),
+            initializer=init_pool_process,
+            initargs=("jobs.services.dispatch_service.load_tasks",),
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+
+def reset_local_pool() -> None:
+    """Forget the local pool, e.g. in a freshly forked process."""
+    _executor.cache_clear()
+
+
+def submit_local(func: Callable[..., Any], *args: Any) -> None:
+    """Run ``func(*args)`` on the shared pool of the ``local`` backend.
+
+    Args:
+        func: Module-level callable (it must pickle for process pools).
+        *args: Positional arguments for ``func``.
+    """
+    _executor().submit(_run_local, func, *args)
+
+
+def _submit_local(job_id: str) -> None:
+    submit_local(run_job, job_id)
+
+
+def _run_local(func: Callable[..., Any], *args: Any) -> None:
+    """Pool entry point: call ``func`` and release this thread's connections."""
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Fon vazifasi kutilmagan xatolik bilan tugadi")
+    finally:
+        connections.close_all()
+
+
+def run_job(job_id: Any) -> None:
+    """Execute a queued job in the current process and record the outcome.
+
+    A job is only run once: if another runner already claimed it, this
+    call does nothing.
+
+    Args:
+        job_id: Primary key of the Job.
+    """
+    claimed = Job.objects.filter(pk=job_id, status=JobStatus.QUEUED).update(
+        status=JobStatus.RUNNING,
+        started_at=timezone.now(),
+    )
+    if not claimed:
+        return
+
+    job = Job.objects.get(pk=job_id)
+    task = app.tasks[job.name]
+    token = current_job_id.set(str(job_id))
+    try:
+        result = task(*job.args, **job.kwargs)
+    except Exception as exc:
+        logger.error("Fon vazifasi xatolik bilan tugadi: %s", job_id, exc_info=True)
+        error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        Job.objects.filter(pk=job_id).update(
+            status=JobStatus.FAILED,
+            error=error,
+            finished_at=timezone.now(),
+        )
+        publish_event(job_id, {"status": JobStatus.FAILED.value, "error": error})
+        return
+    finally:
+        current_job_id.reset(token)
+
+    Job.objects.filter(pk=job_id).update(
+        status=JobStatus.SUCCEEDED,
+        result=result,
+        finished_at=timezone.now(),
+    )
+    publish_event(job_id, {"status": JobStatus.SUCCEEDED.value, "result": result})
+
+
+def dispatch(
+    task: Task,
+    *args: Any,
+    user: Any = None,
+    job_id: uuid.UUID | None = None,
+    **kwargs: Any,
+) -> Job:
+    """Run ``task`` in the background on the configured backend.
+
+    Inside a transaction the job is started only after commit, so the
+    task never sees uncommitted data.
+
+    Args:
+        task: Celery task to run; its arguments must be JSON-serializable.
+        *args: Positional task arguments.
+        user: Owner of the job, if any.
+        job_id: Id to use for the job, when the caller must know it
+            before the job starts.
+        **kwargs: Keyword task arguments.
+
+    Returns:
+        The persisted Job.
+    """
+    backend = settings.TASK_BACKEND
+    job = Job.objects.create(
+        id=job_id or uuid.uuid4(),
+        user=user,
+        name=task.name,
+        args=list(args),
+        kwargs=kwargs,
+        backend=backend,
+    )
+
+    if backend == "inline":
+        run_job(job.pk)
+        job.refresh_from_db()
+    elif backend == "local":
+        transaction.on_commit(functools.partial(_submit_local, str(job.pk)))
+    else:
+        transaction.on_commit(
+            functools.partial(
+                task.apply_async,
+                args=args,
+                kwargs=kwargs,
+                task_id=str(job.pk),
+            )
+        )
+    return job
+
+
+def resume_local_jobs(
+    submit: Callable[[str], None] = _submit_local,
+) -> tuple[int, int]:
+    """Recover ``local`` jobs after a restart.
+
+    Jobs that were running when the process died are marked failed;
+    jobs still queued are submitted again.
+
+    Args:
+        submit: Called with each queued job id; defaults to the pool.
+
+    Returns:
+        Tuple of (interrupted, resubmitted) job counts.
+    """
+    interrupted = Job.objects.filter(
+        backend="local",
+        status=JobStatus.RUNNING,
+    ).update(
+        status=JobStatus.FAILED,
+        error="Jarayon to'xtatildi.",
+        finished_at=timezone.now(),
+    )
+    queued = list(
+        Job.objects.filter(backend="local", status=JobStatus.QUEUED).values_list(
+            "pk",
+            flat=True,
+        )
+    )
+    for job_id in queued:
+        submit(str(job_id))
+    return interrupted, len(queued)
@@ -0,0 +1,47 @@
+"""Short-lived tokens for opening a job's event stream.
+
+Browsers' ``EventSource`` cannot send an ``Authorization`` header, so
+clients first fetch a token for one job with their JWT and pass it as
+``?token=`` to the SSE endpoint. Tokens are signed with ``SECRET_KEY``,
+name both the owner and the job, and expire after
+``settings.JOB_EVENTS_TOKEN_SECONDS``, so a URL that ends up in a log
+only exposes that job's progress, and only briefly.
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.core import signing
+
+from jobs.models import Job
+
+_SALT = "jobs.events"
+
+
+def make_events_token(job: Job) -> str:
+    """Return a stream token for ``job``, valid for its owner only."""
+    return signing.dumps({"user": job.user_id, "job": str(job.pk)}, salt=_SALT)
+
+
+def read_events_token(token: str, job_id: str) -> Any:
+    """Return the user id a stream token was issued to.
+
+    Args:
+        token: Value of the ``token`` query parameter.
+        job_id: Job id from the URL.
+
+    Returns:
+        The owner's primary key, or None if the token is invalid,
+        expired or issued for another job.
+    """
+    try:
+        data = signing.loads(
+            token,
+            salt=_SALT,
+            max_age=settings.JOB_EVENTS_TOKEN_SECONDS,
+        )
+    except signing.BadSignature:
+        return None
+    if data.get("job") != str(job_id):
+        return None
+    return data.get("user")
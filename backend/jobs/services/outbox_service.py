@@ -0,0 +1,162 @@
+"""Transactional outbox: record events in a transaction, act after commit.
+
+Services call :func:`publish_outbox_event` inside their own
+``transaction.atomic`` block. The event row commits or rolls back with
+the change that caused it; once committed, :func:`relay_outbox` hands
+pending events to the handler registered for their topic. The relay is
+kicked off after every commit and also runs periodically (Celery beat)
+to pick up anything a crashed process left behind.
+"""
+
+import logging
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import OutboxEvent
+from jobs.services.dispatch_service import submit_local
+
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[dict[str, Any]], None]
+
+_handlers: dict[str, OutboxHandler] = {}
+
+
+def outbox_handler(topic: str) -> Callable[[OutboxHandler], OutboxHandler]:
+    """Register the decorated function as the handler for ``topic``.
+
+    Each handler runs in its own transaction, after the relay has
+    claimed the event and released its row locks. Handlers may be
+    retried, so they must be idempotent; work they ``dispatch()``
+    starts once the handler's transaction commits.
+
+    Args:
+        topic: Event topic, e.g. ``"smeta.completed"``.
+
+    Returns:
+        Decorator that registers and returns the handler unchanged.
+    """
+
+    def register(func: OutboxHandler) -> OutboxHandler:
+        _handlers[topic] = func
+        return func
+
+    return register
+
+
+def publish_outbox_event(topic: str, key: str, payload: dict[str, Any]) -> None:
+    """Record an event in the current transaction.
+
+    An event whose ``key`` already exists is ignored, so repeated
+    publishes of the same fact are handled once.
+
+    Args:
+        topic: Event topic.
+        key: Deduplication key, unique per fact (e.g. includes a version).
+        payload: JSON-serializable handler input.
+    """
+    _, created = OutboxEvent.objects.get_or_create(
+        key=key,
+        defaults={"topic": topic, "payload": payload},
+    )
+    if created:
+        # robust: a broker outage must not fail the committed request;
+        # the periodic relay catches up later.
+        transaction.on_commit(_schedule_relay, robust=True)
+
+
+def _schedule_relay() -> None:
+    """Run the relay off the request on the configured task backend."""
+    backend = settings.TASK_BACKEND
+    if backend == "celery":
+        from jobs.tasks import relay_outbox_task
+
+        relay_outbox_task.delay()
+    elif backend == "local":
+        submit_local(relay_outbox)
+    else:
+        relay_outbox()
+
+
+def relay_outbox(batch_size: int | None = None) -> int:
+    """Hand one batch of pending events to their handlers.
+
+    Events are claimed for ``settings.OUTBOX_CLAIM_SECONDS`` in a short
+    transaction (``SKIP LOCKED``, so concurrent relays split the work),
+    then handled one by one without holding row locks. A failing event
+    is retried on later runs up to ``settings.OUTBOX_MAX_ATTEMPTS``
+    times.
+
+    Args:
+        batch_size: Maximum events to handle; defaults to
+            ``settings.OUTBOX_BATCH_SIZE``.
+
+    Returns:
+        Number of events handled successfully.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+                processed_at__isnull=True,
+                attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by("id")[:batch_size]
+        )
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+            claimed_until=now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS),
+        )
+
+    handled = 0
+    for event in events:
+        try:
+            handler = _handlers[event.topic]
+            with transaction.atomic():
+                handler(event.payload)
+        except Exception as exc:
+            logger.warning(
+                "Outbox hodisasini qayta ishlab bo'lmadi: %s",
+                event.key,
+                exc_info=True,
+            )
+            OutboxEvent.objects.filter(pk=event.pk).update(
+                attempts=F("attempts") + 1,
+                error="".join(
+                    traceback.format_exception_only(type(exc), exc)
+                ).strip(),
+                claimed_until=None,
+            )
+        else:
+            OutboxEvent.objects.filter(pk=event.pk).update(
+                processed_at=timezone.now(),
+                error="",
+                claimed_until=None,
+            )
+            handled += 1
+    return handled
+
+
+def purge_processed_events(days: int | None = None) -> int:
+    """Delete events processed more than ``days`` ago.
+
+    Args:
+        days: Retention in days; defaults to
+            ``settings.OUTBOX_RETENTION_DAYS``.
+
+    Returns:
+        Number of deleted events.
+    """
+    days = settings.OUTBOX_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,234 @@
+"""Progress events for background jobs.
+
+Tasks call :func:`report_progress`; the jobs SSE endpoint reads them
+through :func:`open_subscription`. ``settings.JOB_EVENTS_BACKEND``
+selects the transport:
+
+* ``redis`` – Redis pub/sub, for Celery workers and web processes on
+  different hosts or processes. The last event is also kept under a
+  short-lived key so late subscribers start from the current state.
+* ``local`` – an in-process stand-in for single-process setups
+  (``local``/``inline`` task backends, tests). Events never leave the
+  process, so the separate ASGI service that streams them refuses to
+  start with it in production (:func:`require_shared_events`).
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from celery import current_task
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from config.redis import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed"})
+
+# Set by run_job() for tasks executed outside a Celery worker.
+current_job_id: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_job_id",
+    default=None,
+)
+
+
+def _channel(job_id: str) -> str:
+    return f"job-events:{job_id}"
+
+
+class Subscription(Protocol):
+    """A stream of events for one job."""
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        """Return the next event, or None after ``timeout`` seconds."""
+
+    async def close(self) -> None:
+        """Release the subscription."""
+
+
+class _LocalHub:
+    """Thread-safe in-process pub/sub feeding asyncio queues."""
+
+    max_jobs = 1000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[Any, asyncio.Queue]]] = {}
+        self._last: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def publish(self, job_id: str, event: dict[str, Any]) -> None:
+        with self._lock:
+            self._last[job_id] = event
+            self._last.move_to_end(job_id)
+            while len(self._last) > self.max_jobs:
+                self._last.popitem(last=False)
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # Subscriber's loop already closed.
+
+    def subscribe(self, job_id: str) -> "_LocalSubscription":
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(entry)
+            last = self._last.get(job_id)
+        if last is not None:
+            queue.put_nowait(last)
+        return _LocalSubscription(self, job_id, entry)
+
+    def unsubscribe(self, job_id: str, entry: tuple[Any, asyncio.Queue]) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, set())
+            subscribers.discard(entry)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+
+class _LocalSubscription:
+    def __init__(
+        self,
+        hub: _LocalHub,
+        job_id: str,
+        entry: tuple[Any, asyncio.Queue],
+    ) -> None:
+        self._hub = hub
+        self._job_id = job_id
+        self._entry = entry
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        try:
+            return await asyncio.wait_for(self._entry[1].get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        self._hub.unsubscribe(self._job_id, self._entry)
+
+
+class _RedisSubscription:
+    def __init__(self, job_id: str) -> None:
+        self._job_id = job_id
+        self._client = get_async_redis()
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pending: dict[str, Any] | None = None
+
+    async def start(self) -> "_RedisSubscription":
+        # Subscribe before reading the last event so nothing is missed.
+        await self._pubsub.subscribe(_channel(self._job_id))
+        last = await self._client.get(f"{_channel(self._job_id)}:last")
+        if last:
+            self._pending = json.loads(last)
+        return self
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        if self._pending is not None:
+            event, self._pending = self._pending, None
+            return event
+        message = await self._pubsub.get_message(timeout=timeout)
+        return json.loads(message["data"]) if message else None
+
+    async def close(self) -> None:
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+
+_local_hub = _LocalHub()
+
+
+def require_shared_events() -> None:
+    """Check that events published by other processes reach this one.
+
+    Called by the ASGI entry point: the SSE endpoint runs there, while
+    jobs are dispatched and run by the WSGI workers and Celery, so the
+    per-process ``local`` hub would never deliver anything.
+
+    Raises:
+        ImproperlyConfigured: If ``JOB_EVENTS_BACKEND`` is not ``redis``
+            and DEBUG is off.
+    """
+    if settings.JOB_EVENTS_BACKEND == "redis":
+        return
+    message = (
+        "ASGI xizmati uchun JOB_EVENTS_BACKEND=redis kerak: "
+        f"{settings.JOB_EVENTS_BACKEND!r} hodisalari boshqa jarayonlarga yetmaydi."
+    )
+    if not settings.DEBUG:
+        raise ImproperlyConfigured(message)
+    logger.warning(message)
+
+
+def publish_event(job_id: str, event: dict[str, Any]) -> None:
+    """Publish an event for a job; failures are logged, never raised.
+
+    Args:
+        job_id: Job primary key.
+        event: JSON-serializable event with at least ``status``.
+    """
+    job_id = str(job_id)
+    event = {"job": job_id, **event}
+    if settings.JOB_EVENTS_BACKEND != "redis":
+        _local_hub.publish(job_id, event)
+        return
+    try:
+        payload = json.dumps(event, default=str)
+        client = get_redis()
+        client.set(f"{_channel(job_id)}:last", payload, ex=settings.JOB_EVENTS_TTL)
+        client.publish(_channel(job_id), payload)
+    except Exception:
+        logger.warning("Jarayon hodisasini yuborib bo'lmadi: %s", job_id, exc_info=True)
+
+
+def _resolve_job_id() -> str | None:
+    job_id = current_job_id.get()
+    if job_id:
+        return job_id
+    request = getattr(current_task, "request", None)
+    if request is not None and not request.called_directly:
+        return request.id
+    return None
+
+
+def report_progress(
+    message: str,
+    step: int | None = None,
+    total: int | None = None,
+) -> None:
+    """Publish progress for the job the current task runs as.
+
+    Does nothing when the task was not started through ``dispatch()``.
+
+    Args:
+        message: Human-readable progress message.
+        step: Current step, if the work is countable.
+        total: Total number of steps.
+    """
+    job_id = _resolve_job_id()
+    if job_id is None:
+        return
+    publish_event(
+        job_id,
+        {"status": "running", "message": message, "step": step, "total": total},
+    )
+
+
+async def open_subscription(job_id: str) -> Subscription:
+    """Subscribe to a job's events, starting with the latest one.
+
+    Args:
+        job_id: Job primary key.
+
+    Returns:
+        An open subscription; the caller must ``close()`` it.
+    """
+    if settings.JOB_EVENTS_BACKEND != "redis":
+        return _local_hub.subscribe(str(job_id))
+    return await _RedisSubscription(str(job_id)).start()
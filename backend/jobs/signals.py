@@ -0,0 +1,57 @@
+"""Keep Job rows in sync with tasks executed by Celery workers."""
+
+import uuid
+from typing import Any
+
+from celery.signals import task_failure, task_prerun, task_success
+from django.utils import timezone
+
+from jobs.models import Job, JobStatus
+from jobs.services.progress_service import publish_event
+
+
+def _job_id(task_id: str | None) -> uuid.UUID | None:
+    """Return ``task_id`` as a Job key, or None for non-job task ids."""
+    try:
+        return uuid.UUID(str(task_id))
+    except ValueError:
+        return None
+
+
+@task_prerun.connect
+def mark_job_running(task_id: str | None = None, **kwargs: Any) -> None:
+    """Record that a worker picked up the job."""
+    if job_id := _job_id(task_id):
+        Job.objects.filter(pk=job_id, status=JobStatus.QUEUED).update(
+            status=JobStatus.RUNNING,
+            started_at=timezone.now(),
+        )
+
+
+@task_success.connect
+def mark_job_succeeded(sender: Any = None, result: Any = None, **kwargs: Any) -> None:
+    """Store the task result on the job."""
+    if job_id := _job_id(getattr(sender.request, "id", None)):
+        Job.objects.filter(pk=job_id).update(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            finished_at=timezone.now(),
+        )
+        publish_event(job_id, {"status": JobStatus.SUCCEEDED.value, "result": result})
+
+
+@task_failure.connect
+def mark_job_failed(
+    task_id: str | None = None,
+    exception: BaseException | None = None,
+    **kwargs: Any,
+) -> None:
+    """Store the final error on the job (retries do not fire this)."""
+    if job_id := _job_id(task_id):
+        error = repr(exception)
+        Job.objects.filter(pk=job_id).update(
+            status=JobStatus.FAILED,
+            error=error,
+            finished_at=timezone.now(),
+        )
+        publish_event(job_id, {"status": JobStatus.FAILED.value, "error": error})
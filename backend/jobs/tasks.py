@@ -0,0 +1,39 @@
+"""Celery tasks for jobs app."""
+
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from jobs.services.outbox_service import purge_processed_events, relay_outbox
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def relay_outbox_task() -> int:
+    """Relay pending outbox events until the backlog is drained.
+
+    Returns:
+        Number of events handled.
+    """
+    total = 0
+    while True:
+        handled = relay_outbox()
+        total += handled
+        # A short batch means the backlog is empty or only failures remain.
+        if handled < settings.OUTBOX_BATCH_SIZE:
+            break
+    if total:
+        logger.info("Outbox: %d ta hodisa qayta ishlandi", total)
+    return total
+
+
+@shared_task
+def purge_outbox_task() -> int:
+    """Delete outbox events past their retention period.
+
+    Returns:
+        Number of deleted events.
+    """
+    return purge_processed_events()
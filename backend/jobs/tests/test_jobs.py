@@ -0,0 +1,251 @@
+"""Tests for background job dispatch and the jobs API."""
+
+import json
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from jobs.models import Job, JobStatus
+from jobs.services.dispatch_service import dispatch, resume_local_jobs, run_job
+from jobs.services.progress_service import (
+    open_subscription,
+    publish_event,
+    require_shared_events,
+)
+from smetalar.tasks.excel_tasks import generate_excel_task, import_smeta_task
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def user() -> User:  # type: ignore[valid-type]
+    """Create a test user."""
+    return User.objects.create_user(
+        email="jobs@example.com",
+        password="testpass123",
+    )
+
+
+@pytest.fixture()
+def auth_client(user: User) -> APIClient:  # type: ignore[valid-type]
+    """Return an authenticated test client."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+class TestDispatch:
+    """Tests for dispatch() and run_job()."""
+
+    def test_inline_success(self, user: User) -> None:  # type: ignore[valid-type]
+        """The task result is stored on the job."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == ""
+        assert job.started_at and job.finished_at
+
+    def test_inline_failure(
+        self,
+        user: User,  # type: ignore[valid-type]
+        settings,  # type: ignore[no-untyped-def]
+        tmp_path,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """An exception marks the job failed instead of propagating."""
+        settings.MEDIA_ROOT = str(tmp_path)
+        job = dispatch(import_smeta_task, user.pk, "imports/missing.xlsx")
+        assert job.status == JobStatus.FAILED
+        assert "FileNotFoundError" in job.error
+
+    def test_job_runs_once(self) -> None:
+        """A job that was already claimed is not run again."""
+        job = Job.objects.create(
+            name=generate_excel_task.name,
+            args=[1],
+            backend="local",
+            status=JobStatus.RUNNING,
+        )
+        run_job(job.pk)
+        job.refresh_from_db()
+        assert job.status == JobStatus.RUNNING
+
+    def test_resume_local_jobs(self) -> None:
+        """Interrupted jobs fail; queued jobs are submitted again."""
+        running = Job.objects.create(
+            name=generate_excel_task.name,
+            args=[1],
+            backend="local",
+            status=JobStatus.RUNNING,
+        )
+        queued = Job.objects.create(
+            name=generate_excel_task.name,
+            args=[1],
+            backend="local",
+        )
+        assert resume_local_jobs(submit=run_job) == (1, 1)
+        running.refresh_from_db()
+        queued.refresh_from_db()
+        assert running.status == JobStatus.FAILED
+        assert queued.status == JobStatus.SUCCEEDED
+
+
+@pytest.mark.django_db(transaction=True)
+def test_local_backend_runs_off_request_thread(
+    settings,  # type: ignore[no-untyped-def]
+) -> None:
+    """The local backend returns at once and finishes in the pool."""
+    settings.TASK_BACKEND = "local"
+    job = dispatch(generate_excel_task, 999_999)
+    assert job.status == JobStatus.QUEUED
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job.refresh_from_db()
+        if job.status == JobStatus.SUCCEEDED:
+            break
+        time.sleep(0.05)
+    assert job.status == JobStatus.SUCCEEDED
+
+
+class TestJobApi:
+    """Tests for GET /api/jobs/{id}/."""
+
+    def test_owner_sees_job(
+        self,
+        auth_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """The owner gets status and result."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        resp = auth_client.get(f"/api/jobs/{job.pk}/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["status"] == "succeeded"
+
+    def test_other_user_gets_404(
+        self,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """Jobs of other users are not visible."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        other = User.objects.create_user(email="x@example.com", password="p")
+        client = APIClient()
+        client.force_authenticate(user=other)
+        assert client.get(f"/api/jobs/{job.pk}/").status_code == 404
+
+    def test_invalid_id_returns_404(self, auth_client: APIClient) -> None:
+        """A malformed job id returns 404, not 500."""
+        assert auth_client.get("/api/jobs/not-a-uuid/").status_code == 404
+
+    def test_async_status(
+        self,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """The async variant returns the same status."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+        )
+        resp = client.get(f"/api/async/jobs/{job.pk}/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["status"] == "succeeded"
+        assert client.get("/api/async/jobs/not-a-uuid/").status_code == 404
+
+
+class TestJobEvents:
+    """Tests for GET /api/jobs/{id}/events."""
+
+    def test_finished_job_streams_done(
+        self,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """A finished job yields a single ``done`` event and closes."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        client = Client(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+        )
+        resp = client.get(f"/api/jobs/{job.pk}/events")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["Content-Type"] == "text/event-stream"
+
+        body = b"".join(async_to_sync(_collect)(resp)).decode()
+        event, data = body.strip().split("\n")
+        assert event == "event: done"
+        assert json.loads(data.removeprefix("data: "))["status"] == "succeeded"
+
+    def test_requires_token(
+        self,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """Anonymous requests are rejected."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        resp = Client().get(f"/api/jobs/{job.pk}/events")
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_query_token_opens_stream(
+        self,
+        auth_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """EventSource clients connect with a job-scoped ?token=."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        resp = auth_client.post(f"/api/jobs/{job.pk}/events-token/")
+        assert resp.status_code == status.HTTP_200_OK
+
+        resp = Client().get(resp.data["events_url"])
+        assert resp.status_code == status.HTTP_200_OK
+        body = b"".join(async_to_sync(_collect)(resp)).decode()
+        assert body.startswith("event: done")
+
+    def test_query_token_is_job_scoped(
+        self,
+        auth_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """A token only opens the job it was issued for."""
+        job = dispatch(generate_excel_task, 999_999, user=user)
+        other = dispatch(generate_excel_task, 999_999, user=user)
+        token = auth_client.post(f"/api/jobs/{job.pk}/events-token/").data["token"]
+        for url in (
+            f"/api/jobs/{other.pk}/events?token={token}",
+            f"/api/jobs/{job.pk}/events?token=forged",
+        ):
+            assert Client().get(url).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_local_hub_delivers_events(self) -> None:
+        """Subscribers get the latest event, then new ones in order."""
+
+        async def scenario() -> list:
+            publish_event("job-1", {"status": "running", "step": 1})
+            subscription = await open_subscription("job-1")
+            publish_event("job-1", {"status": "succeeded"})
+            try:
+                return [await subscription.get(1), await subscription.get(1)]
+            finally:
+                await subscription.close()
+
+        first, second = async_to_sync(scenario)()
+        assert first["step"] == 1
+        assert second["status"] == "succeeded"
+
+    def test_asgi_requires_shared_events(
+        self,
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """The per-process hub is refused for the ASGI service in production."""
+        settings.DEBUG = False
+        settings.JOB_EVENTS_BACKEND = "local"
+        with pytest.raises(ImproperlyConfigured):
+            require_shared_events()
+        settings.JOB_EVENTS_BACKEND = "redis"
+        require_shared_events()
+
+
+async def _collect(response) -> list[bytes]:  # type: ignore[no-untyped-def]
+    return [chunk async for chunk in response.streaming_content]
@@ -0,0 +1,141 @@
+"""Tests for the transactional outbox and its smeta handlers."""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.models import OutboxEvent
+from jobs.services.outbox_service import (
+    outbox_handler,
+    publish_outbox_event,
+    relay_outbox,
+)
+from smetalar.api.serializers.input import SmetaCreateSerializer
+from smetalar.models import XarajatlarSmetasi
+from smetalar.services.smeta_service import create_smeta, update_smeta
+from smetalar.tests.test_api import _smeta_payload
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def user() -> User:  # type: ignore[valid-type]
+    """Create a test user."""
+    return User.objects.create_user(
+        email="outbox@example.com",
+        password="testpass123",
+    )
+
+
+def _validated(status_val: str) -> dict:
+    serializer = SmetaCreateSerializer(data=_smeta_payload(status_val))
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+class TestSmetaCompleted:
+    """Completing a smeta pre-generates its Excel after commit."""
+
+    def test_completion_builds_excel_after_commit(
+        self,
+        user: User,  # type: ignore[valid-type]
+        django_capture_on_commit_callbacks,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """The event is relayed on commit and the export is built."""
+        smeta = create_smeta(user, _validated("draft"))
+        assert not OutboxEvent.objects.exists()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            update_smeta(smeta, {"status": "completed"})
+
+        event = OutboxEvent.objects.get()
+        assert event.key == f"smeta.completed:{smeta.pk}:{smeta.version}"
+        assert event.processed_at is not None
+        smeta.refresh_from_db()
+        assert smeta.excel_file
+        assert smeta.excel_version == smeta.version
+
+    def test_rollback_discards_event(
+        self,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """No event survives a rolled-back transaction."""
+        with pytest.raises(RuntimeError), transaction.atomic():
+            create_smeta(user, _validated("completed"))
+            assert OutboxEvent.objects.count() == 1
+            raise RuntimeError
+        assert not OutboxEvent.objects.exists()
+        assert not XarajatlarSmetasi.objects.exists()
+
+    def test_stale_version_is_skipped(
+        self,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """An event for an outdated version does not build an export."""
+        smeta = create_smeta(user, _validated("completed"))
+        update_smeta(smeta, {"project_name": "Yangi"})
+        assert relay_outbox() == 1
+        smeta.refresh_from_db()
+        assert not smeta.excel_file
+
+
+class TestRelay:
+    """Tests for publish_outbox_event() and relay_outbox()."""
+
+    def test_duplicate_key_is_ignored(self) -> None:
+        """Publishing the same fact twice stores one event."""
+        publish_outbox_event("test.topic", "same", {})
+        publish_outbox_event("test.topic", "same", {})
+        assert OutboxEvent.objects.count() == 1
+
+    def test_failing_handler_is_retried_then_given_up(
+        self,
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """Failures are recorded and retried up to the attempt limit."""
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+
+        @outbox_handler("test.failing")
+        def failing(payload: dict) -> None:
+            raise ValueError("boom")
+
+        publish_outbox_event("test.failing", "fail-1", {})
+        assert relay_outbox() == 0
+        assert relay_outbox() == 0
+        assert relay_outbox() == 0
+
+        event = OutboxEvent.objects.get()
+        assert event.attempts == 2
+        assert event.processed_at is None
+        assert "ValueError: boom" in event.error
+
+    def test_handler_runs_after_claim_commits(self) -> None:
+        """Handlers run unlocked; a concurrent relay skips claimed events."""
+        seen = []
+
+        @outbox_handler("test.claimed")
+        def claimed(payload: dict) -> None:
+            seen.append(OutboxEvent.objects.get(key="claim-1").claimed_until)
+            assert relay_outbox() == 0
+
+        publish_outbox_event("test.claimed", "claim-1", {})
+        assert relay_outbox() == 1
+        assert seen[0] is not None
+        event = OutboxEvent.objects.get()
+        assert event.processed_at is not None
+        assert event.claimed_until is None
+
+    def test_expired_claim_is_relayed_again(self) -> None:
+        """Events claimed by a relay that died are picked up later."""
+        handled = []
+        outbox_handler("test.expired")(handled.append)
+        publish_outbox_event("test.expired", "expired-1", {"n": 1})
+        OutboxEvent.objects.update(claimed_until=timezone.now() + timedelta(minutes=5))
+        assert relay_outbox() == 0
+        OutboxEvent.objects.update(claimed_until=timezone.now() - timedelta(seconds=1))
+        assert relay_outbox() == 1
+        assert handled == [{"n": 1}]
@@ -1,6 +1,8 @@
 """Admin configuration for smetalar app."""
 
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse
 
 from smetalar.models import (
     DavrXarajat,
@@ -13,6 +15,7 @@ from smetalar.models import (
     SotishRejasiYil,
     XarajatlarSmetasi,
 )
+from smetalar.services.download_service import XLSX_CONTENT_TYPE
 
 
 class EmployeeInline(admin.TabularInline):
@@ -71,6 +74,7 @@ class XarajatlarSmetasiAdmin(admin.ModelAdmin):
     list_filter = ("status", "created_at")
     search_fields = ("project_name", "organization_name")
     readonly_fields = ("created_at", "updated_at")
+    actions = ["export_portfolio"]
     inlines = [
         EmployeeInline,
         InventoryItemInline,
@@ -79,3 +83,19 @@ class XarajatlarSmetasiAdmin(admin.ModelAdmin):
         ProductInline,
         DavrXarajatInline,
     ]
+
+    @admin.action(description="Tanlanganlarni portfel Excel sifatida yuklash")
+    def export_portfolio(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet[XarajatlarSmetasi],
+    ) -> HttpResponse:
+        """Download the selected smetalar as one portfolio workbook."""
+        from smetalar.services.excel_service import render_portfolio_excel
+
+        response = HttpResponse(
+            render_portfolio_excel(list(queryset.order_by("-updated_at"))),
+            content_type=XLSX_CONTENT_TYPE,
+        )
+        response["Content-Disposition"] = 'attachment; filename="Portfel.xlsx"'
+        return response
@@ -0,0 +1,128 @@
+"""Async (ASGI) read endpoints for smetalar app.
+
+Same responses as the ``SmetaViewSet`` list/retrieve actions, but
+queries go through the async ORM so a slow client or database wait
+does not hold a whole worker process. Served under ``/api/async/``.
+"""
+
+import math
+
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from accounts.api.async_auth import jwt_required
+from smetalar.api.pagination import SmetaPagination
+from smetalar.api.serializers.output import SmetaDetailSerializer, SmetaListSerializer
+from smetalar.selectors.smeta_selector import (
+    GRAND_TOTAL_PREFETCH,
+    aget_smeta_detail,
+    get_user_smetalar,
+)
+from smetalar.services.smeta_service import calculate_grand_total
+
+
+def _page_params(request: HttpRequest) -> tuple[int, int] | None:
+    """Return (page, page_size) as SmetaPagination reads them.
+
+    An invalid page gives None (404); an invalid page size falls back
+    to the default, like ``PageNumberPagination.get_page_size``.
+    """
+    try:
+        page = int(request.GET.get("page") or 1)
+    except ValueError:
+        return None
+    if page < 1:
+        return None
+    try:
+        page_size = int(request.GET[SmetaPagination.page_size_query_param])
+    except (KeyError, ValueError):
+        page_size = SmetaPagination.page_size
+    if page_size < 1:
+        page_size = SmetaPagination.page_size
+    return page, min(page_size, SmetaPagination.max_page_size)
+
+
+def _page_link(request: HttpRequest, page: int) -> str:
+    url = request.build_absolute_uri()
+    if page == 1:
+        return remove_query_param(url, "page")
+    return replace_query_param(url, "page", page)
+
+
+@require_GET
+@jwt_required
+async def smeta_list(request: HttpRequest) -> HttpResponse:
+    """List the user's smetalar with pagination.
+
+    Args:
+        request: Authenticated request; accepts ``status``, ``search``,
+            ``page`` and ``page_size`` query params.
+
+    Returns:
+        Paginated list in the same shape as ``GET /api/smetalar/``.
+    """
+    params = _page_params(request)
+    if params is None:
+        return JsonResponse(
+            {"detail": "Sahifa topilmadi."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    page, page_size = params
+
+    qs = get_user_smetalar(
+        user_id=request.user.pk,
+        status=request.GET.get("status"),
+    )
+    search = request.GET.get("search")
+    if search:
+        qs = qs.filter(project_name__icontains=search)
+
+    count = await qs.acount()
+    pages = max(1, math.ceil(count / page_size))
+    if page > pages:
+        return JsonResponse(
+            {"detail": "Sahifa topilmadi."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    start = (page - 1) * page_size
+    results = []
+    async for smeta in qs[start : start + page_size].prefetch_related(
+        *GRAND_TOTAL_PREFETCH
+    ):
+        data = SmetaListSerializer(smeta).data
+        data["grand_total"] = calculate_grand_total(smeta)
+        results.append(data)
+
+    return JsonResponse(
+        {
+            "count": count,
+            "next": _page_link(request, page + 1) if page < pages else None,
+            "previous": _page_link(request, page - 1) if page > 1 else None,
+            "results": results,
+        }
+    )
+
+
+@require_GET
+@jwt_required
+async def smeta_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    """Get full detail of a single smeta.
+
+    Args:
+        request: Authenticated request.
+        pk: Smeta primary key.
+
+    Returns:
+        Same body as ``GET /api/smetalar/{id}/``, or 404.
+    """
+    smeta = await aget_smeta_detail(smeta_id=pk, user_id=request.user.pk)
+    if smeta is None:
+        return JsonResponse(
+            {"detail": "Smeta topilmadi."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    serializer = SmetaDetailSerializer(smeta, context={"request": request})
+    return JsonResponse(serializer.data)
@@ -1,5 +1,7 @@
 """Input (write) serializers for smetalar API."""
 
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
 from rest_framework import serializers
 
 from smetalar.models import (
@@ -13,6 +15,7 @@ from smetalar.models import (
     SotishRejasiYil,
     XarajatlarSmetasi,
 )
+from smetalar.services.changes_service import SyncCursor
 
 
 # ------------------------------------------------------------------ Nested
@@ -232,3 +235,60 @@ class SmetaCreateSerializer(serializers.Serializer):
         choices=["draft", "completed"],
         default="draft",
     )
+
+
+class BulkExportSerializer(serializers.Serializer):
+    """Input for exporting several smetalar as one ZIP archive.
+
+    Fields:
+        ids: Primary keys of the smetalar to export.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=settings.SMETA_BULK_EXPORT_MAX_IDS,
+    )
+
+
+class SmetaChangesQuerySerializer(serializers.Serializer):
+    """Query parameters of the delta sync endpoint.
+
+    Fields:
+        since: Cursor returned by the previous call; omit to fetch the
+            whole list.
+    """
+
+    since = serializers.CharField(required=False)
+
+    def validate_since(self, value: str) -> SyncCursor:
+        """Decode the opaque cursor."""
+        try:
+            return SyncCursor.decode(value)
+        except ValueError as exc:
+            raise serializers.ValidationError("Noto'g'ri kursor.") from exc
+
+
+class SmetaImportSerializer(serializers.Serializer):
+    """Input for importing a smeta from an Excel workbook.
+
+    Fields:
+        file: ``.xlsx`` workbook in the exported 9-sheet layout.
+    """
+
+    file = serializers.FileField()
+
+    def validate_file(self, value: UploadedFile) -> UploadedFile:
+        """Accept only ``.xlsx`` files within the size limit.
+
+        Args:
+            value: The uploaded file.
+
+        Returns:
+            The same file.
+        """
+        if not value.name.lower().endswith(".xlsx"):
+            raise serializers.ValidationError("Faqat .xlsx fayl qabul qilinadi.")
+        if value.size > settings.SMETA_IMPORT_MAX_BYTES:
+            raise serializers.ValidationError("Fayl hajmi juda katta.")
+        return value
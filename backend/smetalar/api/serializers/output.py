@@ -140,6 +140,26 @@ class OtherExpensesDataOutputSerializer(serializers.Serializer):
     production_expenses = OtherExpenseOutputSerializer(many=True)
 
 
+# -------- Dashboard summary --------
+class SmetaRecentSerializer(serializers.Serializer):
+    """Recently edited smeta entry of the summary."""
+
+    id = serializers.IntegerField()
+    project_name = serializers.CharField()
+    status = serializers.CharField()
+    updated_at = serializers.DateTimeField()
+
+
+class SmetaSummarySerializer(serializers.Serializer):
+    """Per-user dashboard summary (amounts in so'm)."""
+
+    counts = serializers.DictField(child=serializers.IntegerField())
+    planned_total = serializers.FloatField()
+    by_category = serializers.DictField(child=serializers.FloatField())
+    funding = serializers.DictField(child=serializers.FloatField())
+    recent = SmetaRecentSerializer(many=True)
+
+
 # -------- Full Smeta output --------
 class SmetaListSerializer(serializers.ModelSerializer):
     """Lightweight smeta serializer for list/dashboard views."""
@@ -160,6 +180,15 @@ class SmetaListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class SmetaChangesSerializer(serializers.Serializer):
+    """Smetalar changed and deleted after a sync cursor."""
+
+    changed = SmetaListSerializer(many=True)
+    deleted = serializers.ListField(child=serializers.IntegerField())
+    cursor = serializers.CharField()
+    has_more = serializers.BooleanField()
+
+
 class SmetaDetailSerializer(serializers.ModelSerializer):
     """Full smeta serializer with all nested data."""
 
@@ -269,7 +298,7 @@ class SmetaDetailSerializer(serializers.ModelSerializer):
         self,
         obj: XarajatlarSmetasi,
     ) -> str | None:
-        """Return the URL of the generated Excel file.
+        """Return the authenticated download URL of the Excel file.
 
         Args:
             obj: XarajatlarSmetasi instance.
@@ -278,8 +307,11 @@ class SmetaDetailSerializer(serializers.ModelSerializer):
             URL string or None if not generated yet.
         """
         if obj.excel_file:
+            from smetalar.services.download_service import excel_download_path
+
+            url = excel_download_path(obj)
             request = self.context.get("request")
             if request:
-                return request.build_absolute_uri(obj.excel_file.url)
-            return obj.excel_file.url
+                return request.build_absolute_uri(url)
+            return url
         return None
@@ -1,27 +1,54 @@
 """API views for smetalar app."""
 
 import logging
+import uuid
 
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.db.models import Value
+from django.http import HttpResponse, StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.viewsets import ViewSet
 
+from jobs.services.dispatch_service import dispatch
 from smetalar.api.filters import SmetaFilter
 from smetalar.api.pagination import SmetaPagination
-from smetalar.api.serializers.input import SmetaCreateSerializer
+from smetalar.api.serializers.input import (
+    BulkExportSerializer,
+    SmetaChangesQuerySerializer,
+    SmetaCreateSerializer,
+    SmetaImportSerializer,
+)
 from smetalar.api.serializers.output import (
+    SmetaChangesSerializer,
     SmetaDetailSerializer,
     SmetaListSerializer,
+    SmetaSummarySerializer,
 )
 from smetalar.selectors.smeta_selector import (
     get_smeta_detail,
     get_user_smetalar,
 )
+from smetalar.services.bulk_export_service import stream_smeta_zip
+from smetalar.services.changes_service import StaleCursorError, get_user_changes
+from smetalar.services.download_service import (
+    XLSX_CONTENT_TYPE,
+    excel_download_path,
+    excel_filename,
+    file_download_response,
+)
+from smetalar.services.export_service import request_smeta_excel
 from smetalar.services.smeta_service import create_smeta, update_smeta
+from smetalar.services.summary_service import get_user_summary
+from smetalar.tasks.excel_tasks import import_smeta_task
 
 logger = logging.getLogger(__name__)
 
@@ -56,12 +83,68 @@ logger = logging.getLogger(__name__)
         description="Delete a smeta and all its related data.",
         responses={204: None},
     ),
+    bulk_export=extend_schema(
+        summary="Bulk export smetalar",
+        description=(
+            "Stream a ZIP archive with one Excel workbook per requested smeta."
+        ),
+        request=BulkExportSerializer,
+        responses={(200, "application/zip"): OpenApiTypes.BINARY},
+    ),
+    summary=extend_schema(
+        summary="Dashboard summary",
+        description=(
+            "Counts by status, planned spend by category and financing "
+            "source, and the most recently edited smetalar of the user."
+        ),
+        responses={200: SmetaSummarySerializer},
+    ),
+    changes=extend_schema(
+        summary="Sync smetalar list",
+        description=(
+            "Smetalar created, updated or deleted after the ``since`` "
+            "cursor, oldest first. Pass the returned ``cursor`` on the "
+            "next call; 410 means the cursor expired and the list must "
+            "be reloaded."
+        ),
+        parameters=[SmetaChangesQuerySerializer],
+        responses={200: SmetaChangesSerializer, 410: OpenApiTypes.OBJECT},
+    ),
+    portfolio=extend_schema(
+        summary="Portfolio workbook",
+        description=(
+            "One Excel sheet summarising all of the user's smetalar "
+            "(optionally filtered by status or ids) with portfolio totals."
+        ),
+        responses={(200, XLSX_CONTENT_TYPE): OpenApiTypes.BINARY},
+    ),
+    export=extend_schema(
+        summary="Export smeta to Excel",
+        description=(
+            "Return the Excel file for the current smeta version, or "
+            "schedule its generation. Concurrent requests for the same "
+            "version share one background build (202 + job_id)."
+        ),
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 202: OpenApiTypes.OBJECT},
+    ),
+    import_excel=extend_schema(
+        summary="Import smeta from Excel",
+        description=(
+            "Create a smeta from an .xlsx in the exported layout. Large "
+            "files are imported by a background job (202 + job_id)."
+        ),
+        request={"multipart/form-data": SmetaImportSerializer},
+        responses={201: SmetaDetailSerializer, 202: OpenApiTypes.OBJECT},
+    ),
 )
 class SmetaViewSet(ViewSet):
     """ViewSet for Xarajatlar Smetasi CRUD operations."""
 
     permission_classes = [IsAuthenticated]
     pagination_class = SmetaPagination
+    # Used by actions that opt into ScopedRateThrottle (export/import).
+    throttle_scope = "exports"
 
     def list(self, request: Request) -> Response:
         """List smetalar for the authenticated user with pagination.
@@ -257,3 +340,248 @@ class SmetaViewSet(ViewSet):
             )
         smeta.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-export",
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def bulk_export(self, request: Request) -> Response | StreamingHttpResponse:
+        """Stream several smetalar as a single ZIP of workbooks.
+
+        Args:
+            request: Authenticated DRF Request with a list of smeta ids.
+
+        Returns:
+            Streaming ZIP response, or 404 if none of the ids are owned
+            by the user.
+        """
+        serializer = BulkExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        smeta_ids = list(
+            get_user_smetalar(user_id=request.user.pk)
+            .filter(pk__in=serializer.validated_data["ids"])
+            .values_list("pk", flat=True)
+        )
+        if not smeta_ids:
+            return Response(
+                {"detail": "Smeta topilmadi."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        response = StreamingHttpResponse(
+            stream_smeta_zip(smeta_ids),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = (
+            'attachment; filename="Xarajatlar_smetalari.zip"'
+        )
+        return response
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request: Request) -> Response:
+        """Dashboard summary of the user's smetalar.
+
+        Args:
+            request: Authenticated DRF Request.
+
+        Returns:
+            Counts, planned totals and recent smetalar; cached per user
+            until one of their smetalar changes.
+        """
+        return Response(SmetaSummarySerializer(get_user_summary(request.user.pk)).data)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request: Request) -> Response:
+        """Delta sync of the user's smetalar list.
+
+        Args:
+            request: Authenticated DRF Request with an optional
+                ``since`` cursor.
+
+        Returns:
+            Changed smetalar, deleted ids and the next cursor, or 410
+            if the cursor is too old.
+        """
+        serializer = SmetaChangesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        try:
+            changes = get_user_changes(
+                request.user.pk,
+                serializer.validated_data.get("since"),
+            )
+        except StaleCursorError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_410_GONE)
+        return Response(SmetaChangesSerializer(changes).data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def portfolio(self, request: Request) -> Response | HttpResponse:
+        """Download a single workbook summarising many smetalar.
+
+        Args:
+            request: Authenticated DRF Request. Optional ``status`` and
+                comma-separated ``ids`` query params narrow the set.
+
+        Returns:
+            The portfolio ``.xlsx`` as an attachment.
+        """
+        qs = get_user_smetalar(
+            user_id=request.user.pk,
+            status=request.query_params.get("status"),
+        )
+        ids = request.query_params.get("ids")
+        if ids:
+            try:
+                qs = qs.filter(pk__in=[int(i) for i in ids.split(",") if i])
+            except ValueError:
+                return Response(
+                    {"detail": "ids noto'g'ri formatda."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        # openpyxl is only loaded by the requests that build workbooks.
+        from smetalar.services.excel_service import render_portfolio_excel
+
+        response = HttpResponse(
+            render_portfolio_excel(list(qs)),
+            content_type=XLSX_CONTENT_TYPE,
+        )
+        response["Content-Disposition"] = 'attachment; filename="Portfel.xlsx"'
+        return response
+
+    @action(
+        detail=True,
+        methods=["post"],
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def export(self, request: Request, pk: str = None) -> Response:
+        """Get or schedule the Excel export of a smeta.
+
+        Args:
+            request: Authenticated DRF Request.
+            pk: Smeta primary key.
+
+        Returns:
+            200 with ``excel_file_url`` when the file for the current
+            version exists, otherwise 202 with the build's ``job_id``.
+        """
+        smeta = get_user_smetalar(user_id=request.user.pk).filter(pk=pk).first()
+        if smeta is None:
+            return Response(
+                {"detail": "Smeta topilmadi."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        result = request_smeta_excel(smeta)
+        if result["status"] == "ready":
+            return Response(
+                {
+                    "status": "ready",
+                    "version": smeta.version,
+                    "excel_file_url": request.build_absolute_uri(
+                        excel_download_path(smeta)
+                    ),
+                }
+            )
+        return Response(
+            {
+                "status": "pending",
+                "version": smeta.version,
+                "job_id": result["job_id"],
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=["get"])
+    def download(self, request: Request, pk: str = None) -> Response | HttpResponse:
+        """Download the generated Excel file of a smeta.
+
+        Ownership is checked here; the transfer itself is handed to
+        nginx or the object store.
+
+        Args:
+            request: Authenticated DRF Request.
+            pk: Smeta primary key.
+
+        Returns:
+            The file hand-off response, or 404 if the smeta is not the
+            user's or has no generated file.
+        """
+        smeta = get_user_smetalar(user_id=request.user.pk).filter(pk=pk).first()
+        if smeta is None or not smeta.excel_file:
+            return Response(
+                {"detail": "Excel fayl topilmadi."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return file_download_response(smeta.excel_file, excel_filename(smeta))
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def import_excel(self, request: Request) -> Response:
+        """Create a smeta from an uploaded Excel workbook.
+
+        Args:
+            request: Authenticated multipart request with ``file``.
+
+        Returns:
+            Created smeta detail (201), or the background job id (202)
+            for files larger than ``SMETA_IMPORT_ASYNC_BYTES``.
+        """
+        serializer = SmetaImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+
+        if upload.size > settings.SMETA_IMPORT_ASYNC_BYTES:
+            path = default_storage.save(f"imports/{uuid.uuid4().hex}.xlsx", upload)
+            job = dispatch(
+                import_smeta_task,
+                request.user.pk,
+                path,
+                user=request.user,
+            )
+            return Response(
+                {"job_id": str(job.pk)},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        from smetalar.services.excel_import_service import (
+            SmetaImportError,
+            parse_smeta_workbook,
+        )
+
+        try:
+            data = parse_smeta_workbook(upload)
+        except SmetaImportError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        smeta_serializer = SmetaCreateSerializer(data=data)
+        smeta_serializer.is_valid(raise_exception=True)
+        smeta = create_smeta(
+            user=request.user,
+            data=smeta_serializer.validated_data,
+        )
+
+        detail = get_smeta_detail(
+            smeta_id=smeta.pk,
+            user_id=request.user.pk,
+        )
+        return Response(
+            SmetaDetailSerializer(
+                detail,
+                context={"request": request},
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SmetalarConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'smetalar'
+
+    def ready(self) -> None:
+        from smetalar import signals  # noqa: F401
+        from smetalar.services import outbox_handlers  # noqa: F401
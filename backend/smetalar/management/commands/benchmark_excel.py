@@ -0,0 +1,102 @@
+"""Benchmark Excel generation on synthetic smetalar."""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from smetalar.services.excel_benchmark import compare_to_baseline, run_benchmarks
+
+User = get_user_model()
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+class Command(BaseCommand):
+    """Time each export stage and compare against a stored baseline.
+
+    Synthetic data is created inside a transaction that is always
+    rolled back, so the command is safe to run against any database.
+    """
+
+    help = "Benchmark excel_service on synthetic smetalar."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            type=_int_list,
+            default=[10, 1000, 10000],
+            help="Comma-separated line item counts (default 10,1000,10000).",
+        )
+        parser.add_argument(
+            "--years",
+            type=_int_list,
+            default=[2, 10],
+            help="Comma-separated sales-plan year counts (default 2,10).",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="Write the JSON results to this path.",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=settings.SMETA_EXCEL_BENCHMARK_BASELINE,
+            help="Baseline JSON to compare against, if it exists.",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store these results as the new baseline.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative slowdown before failing (default 0.25).",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email="excel-benchmark@example.invalid",
+            )
+            results = run_benchmarks(
+                user,
+                sizes=options["sizes"],  # type: ignore[arg-type]
+                years=options["years"],  # type: ignore[arg-type]
+                repeat=options["repeat"],  # type: ignore[arg-type]
+            )
+            transaction.set_rollback(True)
+
+        payload = json.dumps(results, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(payload)  # type: ignore[arg-type]
+        else:
+            self.stdout.write(payload)
+
+        baseline_path = Path(options["baseline"])  # type: ignore[arg-type]
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(payload)
+            self.stderr.write(f"Baseline saqlandi: {baseline_path}")
+            return
+
+        if not baseline_path.exists():
+            return
+        regressions = compare_to_baseline(
+            results,
+            json.loads(baseline_path.read_text()),
+            tolerance=options["tolerance"],  # type: ignore[arg-type]
+        )
+        if regressions:
+            raise CommandError(
+                "Excel eksport sekinlashdi:\n" + "\n".join(regressions)
+            )
+        self.stderr.write(self.style.SUCCESS("Regressiya topilmadi."))
@@ -0,0 +1,28 @@
+"""Write the pre-styled smeta workbook template to disk."""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from smetalar.services.excel_service import build_template_workbook
+
+
+class Command(BaseCommand):
+    """Regenerate ``SMETA_EXCEL_TEMPLATE`` from the sheet layouts."""
+
+    help = "Build the Excel template used by smeta exports."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=settings.SMETA_EXCEL_TEMPLATE,
+            help="Path of the template file to write.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        output = Path(options["output"])  # type: ignore[arg-type]
+        output.parent.mkdir(parents=True, exist_ok=True)
+        build_template_workbook().save(output)
+        self.stdout.write(self.style.SUCCESS(f"Excel shablon yozildi: {output}"))
@@ -0,0 +1,51 @@
+"""Export several smetalar into one ZIP archive of Excel workbooks."""
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from smetalar.models import XarajatlarSmetasi
+from smetalar.services.bulk_export_service import stream_smeta_zip
+
+
+class Command(BaseCommand):
+    """Write a ZIP with one workbook per smeta id to a file."""
+
+    help = "Export smetalar to a ZIP archive of Excel workbooks."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("ids", nargs="+", type=int, help="Smeta ids.")
+        parser.add_argument(
+            "-o",
+            "--output",
+            default="Xarajatlar_smetalari.zip",
+            help="Path of the ZIP file to write.",
+        )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=None,
+            help="Process pool size (0 = one per CPU core).",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        ids: list[int] = options["ids"]  # type: ignore[assignment]
+        found = set(
+            XarajatlarSmetasi.objects.filter(pk__in=ids).values_list(
+                "pk",
+                flat=True,
+            )
+        )
+        missing = sorted(set(ids) - found)
+        if missing:
+            raise CommandError(f"Smeta topilmadi: {missing}")
+
+        output = options["output"]
+        with open(output, "wb") as fh:  # type: ignore[arg-type]
+            for chunk in stream_smeta_zip(
+                sorted(found),
+                max_workers=options["workers"],  # type: ignore[arg-type]
+            ):
+                fh.write(chunk)
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(found)} ta smeta eksport qilindi: {output}")
+        )
@@ -0,0 +1,37 @@
+"""Delete generated Excel files that are unreferenced or expired."""
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from smetalar.services.excel_gc_service import collect_excel_garbage
+
+
+class Command(BaseCommand):
+    """Run the Excel file garbage collection once."""
+
+    help = "Remove stale generated Excel files from storage."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Also remove referenced files older than this (0 = never).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+
+    def handle(self, *args: object, **options: object) -> None:
+        report = collect_excel_garbage(
+            retention_days=options["retention_days"],  # type: ignore[arg-type]
+            dry_run=bool(options["dry_run"]),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ko'rildi: {report['scanned']}, o'chirildi: {report['deleted']} "
+                f"(muddati o'tgan: {report['expired']}), "
+                f"bo'shatildi: {report['bytes_reclaimed']} bayt"
+            )
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smetalar', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='xarajatlarsmetasi',
+            name='excel_version',
+            field=models.PositiveIntegerField(default=0, help_text='Smeta version the stored Excel file was built from.'),
+        ),
+        migrations.AddField(
+            model_name='xarajatlarsmetasi',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:21
+
+import config.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smetalar', '0002_smeta_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='xarajatlarsmetasi',
+            name='excel_file',
+            field=models.FileField(blank=True, storage=config.storage.export_storage, upload_to='smetalar/excel/%Y/%m/'),
+        ),
+    ]
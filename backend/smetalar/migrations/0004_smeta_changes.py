@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('smetalar', '0003_excel_file_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SmetaTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('smeta_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': "O'chirilgan smeta",
+                'verbose_name_plural': "O'chirilgan smetalar",
+            },
+        ),
+        migrations.AddIndex(
+            model_name='xarajatlarsmetasi',
+            index=models.Index(fields=['user', 'updated_at'], name='smeta_user_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='smetatombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='smeta_tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='smetatombstone',
+            index=models.Index(fields=['user', 'deleted_at'], name='smeta_tombstone_user_idx'),
+        ),
+    ]
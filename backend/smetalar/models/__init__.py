@@ -6,6 +6,7 @@ from .raw_material import RawMaterial
 from .salary import Employee, FinancingSource, StaffType
 from .smeta import SmetaStatus, XarajatlarSmetasi
 from .sotish_rejasi import SotishMahsulot, SotishRejasiYil
+from .tombstone import SmetaTombstone
 
 __all__ = [
     "DavrXarajat",
@@ -17,6 +18,7 @@ __all__ = [
     "Product",
     "RawMaterial",
     "SmetaStatus",
+    "SmetaTombstone",
     "SotishMahsulot",
     "SotishRejasiYil",
     "StaffType",
@@ -3,6 +3,8 @@
 from django.conf import settings
 from django.db import models
 
+from config.storage import export_storage
+
 
 class SmetaStatus(models.TextChoices):
     """Smeta lifecycle status."""
@@ -36,11 +38,19 @@ class XarajatlarSmetasi(models.Model):
     project_description = models.TextField(blank=True)
     project_duration_years = models.PositiveSmallIntegerField(default=2)
 
+    # Bumped on every content update; identifies an export.
+    version = models.PositiveIntegerField(default=1)
+
     # Excel file (generated)
     excel_file = models.FileField(
         upload_to="smetalar/excel/%Y/%m/",
+        storage=export_storage,
         blank=True,
     )
+    excel_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Smeta version the stored Excel file was built from.",
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -49,6 +59,14 @@ class XarajatlarSmetasi(models.Model):
         ordering = ["-updated_at"]
         verbose_name = "Xarajatlar Smetasi"
         verbose_name_plural = "Xarajatlar Smetalari"
+        indexes = [
+            # Dashboard list and delta sync both walk a user's
+            # smetalar by updated_at.
+            models.Index(
+                fields=["user", "updated_at"],
+                name="smeta_user_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.project_name} ({self.get_status_display()})"
@@ -0,0 +1,34 @@
+"""Tombstones of deleted smetalar for delta sync clients."""
+
+from django.conf import settings
+from django.db import models
+
+
+class SmetaTombstone(models.Model):
+    """Marks a deleted smeta so ``changes`` can report the deletion.
+
+    Written by ``smetalar.signals`` and purged after
+    ``SMETA_TOMBSTONE_RETENTION_DAYS``; older sync cursors must reload
+    the full list.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="smeta_tombstones",
+    )
+    smeta_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "O'chirilgan smeta"
+        verbose_name_plural = "O'chirilgan smetalar"
+        indexes = [
+            models.Index(
+                fields=["user", "deleted_at"],
+                name="smeta_tombstone_user_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"#{self.smeta_id} ({self.deleted_at:%Y-%m-%d %H:%M})"
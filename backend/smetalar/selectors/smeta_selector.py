@@ -1,8 +1,29 @@
 """Selectors (read-only queries) for smetalar app."""
 
-from django.db.models import QuerySet
+from collections.abc import Iterable
+from datetime import datetime
 
-from smetalar.models import XarajatlarSmetasi
+from django.db.models import (
+    CharField,
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+)
+
+from smetalar.models import (
+    Employee,
+    FinancingSource,
+    InventoryItem,
+    OtherExpense,
+    RawMaterial,
+    SmetaTombstone,
+    XarajatlarSmetasi,
+)
 
 
 def get_user_smetalar(
@@ -24,6 +45,30 @@ def get_user_smetalar(
     return qs.order_by("-updated_at")
 
 
+# Relations read by calculate_grand_total().
+GRAND_TOTAL_PREFETCH = (
+    "employees",
+    "inventory_items",
+    "raw_materials",
+    "other_expenses",
+)
+
+
+def _smeta_detail_queryset(
+    smeta_id: int,
+    user_id: int,
+) -> QuerySet[XarajatlarSmetasi]:
+    return XarajatlarSmetasi.objects.filter(
+        pk=smeta_id,
+        user_id=user_id,
+    ).prefetch_related(
+        *GRAND_TOTAL_PREFETCH,
+        "products",
+        "davr_xarajatlari",
+        "sotish_rejasi_yillari__products",
+    )
+
+
 def get_smeta_detail(
     smeta_id: int,
     user_id: int,
@@ -37,19 +82,177 @@ def get_smeta_detail(
     Returns:
         XarajatlarSmetasi instance or None.
     """
-    return (
-        XarajatlarSmetasi.objects.filter(
-            pk=smeta_id,
-            user_id=user_id,
+    return _smeta_detail_queryset(smeta_id, user_id).first()
+
+
+async def aget_smeta_detail(
+    smeta_id: int,
+    user_id: int,
+) -> XarajatlarSmetasi | None:
+    """Async version of :func:`get_smeta_detail`."""
+    return await _smeta_detail_queryset(smeta_id, user_id).afirst()
+
+
+def get_portfolio_totals(
+    smeta_ids: Iterable[int],
+) -> dict[int, dict[str, float]]:
+    """Aggregate the Jami breakdown for many smetalar at once.
+
+    Runs one grouped query per expense table instead of loading every
+    line item, so the cost does not grow with the number of rows.
+
+    Args:
+        smeta_ids: Primary keys of the smetalar to summarise.
+
+    Returns:
+        Mapping of smeta id to ``{"<category>_<source>": total}`` where
+        category is one of salary, inventory, raw_materials,
+        other_expenses and source is vazirlik or tashkilot (in so'm).
+    """
+    smeta_ids = list(smeta_ids)
+    money = DecimalField(max_digits=30, decimal_places=2)
+    line_total = ExpressionWrapper(F("price") * F("quantity"), output_field=money)
+    sources = [
+        (
+            "salary",
+            Employee,
+            ExpressionWrapper(
+                F("monthly_salary") * F("count") * F("duration_months"),
+                output_field=money,
+            ),
+        ),
+        ("inventory", InventoryItem, line_total),
+        ("raw_materials", RawMaterial, line_total),
+        ("other_expenses", OtherExpense, line_total),
+    ]
+
+    totals: dict[int, dict[str, float]] = {
+        pk: {
+            f"{category}_{source}": 0.0
+            for category, _, _ in sources
+            for source in FinancingSource.values
+        }
+        for pk in smeta_ids
+    }
+    for category, model, expr in sources:
+        rows = (
+            model.objects.filter(smeta_id__in=smeta_ids)
+            .values("smeta_id", "financing_source")
+            .annotate(total=Sum(expr))
+            .order_by()
         )
-        .prefetch_related(
-            "employees",
-            "inventory_items",
-            "raw_materials",
-            "other_expenses",
-            "products",
-            "davr_xarajatlari",
-            "sotish_rejasi_yillari__products",
+        for row in rows:
+            key = f"{category}_{row['financing_source']}"
+            totals[row["smeta_id"]][key] = float(row["total"] or 0)
+    return totals
+
+
+def get_user_expense_totals(user_id: int) -> list[tuple[str, str, float]]:
+    """Sum every expense table of a user's smetalar in one round trip.
+
+    The per-table grouped sums are combined with ``UNION ALL``, so the
+    database returns at most one row per category and financing source
+    however many smetalar and line items the user has.
+
+    Args:
+        user_id: The owner's primary key.
+
+    Returns:
+        ``(category, financing_source, total)`` rows; category is one of
+        salary, inventory, raw_materials, other_expenses (in so'm).
+    """
+    money = DecimalField(max_digits=30, decimal_places=2)
+    line_total = ExpressionWrapper(F("price") * F("quantity"), output_field=money)
+    sources = [
+        (
+            "salary",
+            Employee,
+            ExpressionWrapper(
+                F("monthly_salary") * F("count") * F("duration_months"),
+                output_field=money,
+            ),
+        ),
+        ("inventory", InventoryItem, line_total),
+        ("raw_materials", RawMaterial, line_total),
+        ("other_expenses", OtherExpense, line_total),
+    ]
+    parts = [
+        model.objects.filter(smeta__user_id=user_id)
+        .order_by()
+        .values("financing_source")
+        .annotate(
+            category=Value(category, output_field=CharField()),
+            total=Sum(expr),
         )
-        .first()
+        .values_list("category", "financing_source", "total")
+        for category, model, expr in sources
+    ]
+    rows = parts[0].union(*parts[1:], all=True)
+    return [(category, source, float(total or 0)) for category, source, total in rows]
+
+
+def get_user_status_counts(user_id: int) -> dict[str, int]:
+    """Count a user's smetalar per status in one grouped query."""
+    rows = (
+        XarajatlarSmetasi.objects.filter(user_id=user_id)
+        .order_by()
+        .values("status")
+        .annotate(n=Count("id"))
+    )
+    return {row["status"]: row["n"] for row in rows}
+
+
+def _after(field: str, since: datetime, after_id: int | None) -> Q:
+    """Rows past ``(since, after_id)`` in ``(field, id)`` order."""
+    q = Q(**{f"{field}__gt": since})
+    if after_id is not None:
+        q |= Q(**{field: since, "id__gt": after_id})
+    return q
+
+
+def get_user_changed_smetalar(
+    user_id: int,
+    since: datetime | None,
+    after_id: int | None,
+    limit: int,
+) -> list[XarajatlarSmetasi]:
+    """Return smetalar updated after a sync position, oldest first.
+
+    Walks the ``(user, updated_at)`` index and prefetches what
+    ``calculate_grand_total`` reads.
+
+    Args:
+        user_id: The owner's primary key.
+        since: ``updated_at`` of the position; None returns every smeta.
+        after_id: Rows updated exactly at ``since`` are returned if
+            their id is greater; None excludes them all.
+        limit: Maximum number of rows.
+
+    Returns:
+        Up to ``limit`` smetalar ordered by ``(updated_at, id)``.
+    """
+    qs = XarajatlarSmetasi.objects.filter(user_id=user_id)
+    if since is not None:
+        qs = qs.filter(_after("updated_at", since, after_id))
+    return list(
+        qs.order_by("updated_at", "id").prefetch_related(*GRAND_TOTAL_PREFETCH)[
+            :limit
+        ]
+    )
+
+
+def get_user_tombstones(
+    user_id: int,
+    since: datetime,
+    after_id: int | None,
+    limit: int,
+) -> list[SmetaTombstone]:
+    """Return a user's smeta deletions after a sync position, oldest first.
+
+    ``since`` and ``after_id`` work as in :func:`get_user_changed_smetalar`.
+    """
+    return list(
+        SmetaTombstone.objects.filter(user_id=user_id)
+        .filter(_after("deleted_at", since, after_id))
+        .order_by("deleted_at", "id")[:limit]
     )
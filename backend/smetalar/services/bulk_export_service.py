@@ -0,0 +1,132 @@
+"""Bulk export of many smetalar into a single streamed ZIP archive.
+
+Workbooks are rendered in a process pool so throughput scales with
+the number of cores, and each member is written to the archive as
+soon as it is ready.
+"""
+
+import logging
+import os
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+
+from config.fork import init_pool_process, process_pool_context
+from smetalar.models import XarajatlarSmetasi
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back in chunks.
+
+    ``zipfile`` falls back to data descriptors when its target is not
+    seekable, so the archive can be produced strictly front to back.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _resolve_workers(max_workers: int | None) -> int:
+    """Return the effective pool size for an export."""
+    if max_workers is None:
+        max_workers = settings.SMETA_EXPORT_WORKERS
+    return max_workers or os.cpu_count() or 1
+
+
+def _render_member(smeta_id: int) -> tuple[str, bytes]:
+    """Render one smeta workbook inside a pool process.
+
+    Args:
+        smeta_id: Primary key of the XarajatlarSmetasi.
+
+    Returns:
+        Tuple of archive member name and workbook bytes.
+    """
+    from smetalar.services.download_service import excel_filename
+    from smetalar.services.excel_service import render_smeta_excel
+
+    smeta = XarajatlarSmetasi.objects.get(pk=smeta_id)
+    return f"{smeta.pk}_{excel_filename(smeta)}", render_smeta_excel(smeta)
+
+
+def iter_rendered_workbooks(
+    smeta_ids: Iterable[int],
+    max_workers: int | None = None,
+) -> Iterator[tuple[str, bytes]]:
+    """Render workbooks for the given smetalar, yielding in completion order.
+
+    Args:
+        smeta_ids: Primary keys of the smetalar to render.
+        max_workers: Pool size; defaults to ``SMETA_EXPORT_WORKERS``
+            (0 means one process per core). 1 renders inline.
+
+    Yields:
+        Tuples of archive member name and workbook bytes.
+    """
+    smeta_ids = list(smeta_ids)
+    workers = min(_resolve_workers(max_workers), len(smeta_ids) or 1)
+    if workers <= 1:
+        for smeta_id in smeta_ids:
+            yield _render_member(smeta_id)
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=process_pool_context(),
+        initializer=init_pool_process,
+        initargs=("smetalar.services.excel_service.get_template_workbook",),
+    )
+    finished = False
+    try:
+        futures = [pool.submit(_render_member, pk) for pk in smeta_ids]
+        for future in as_completed(futures):
+            yield future.result()
+        finished = True
+    finally:
+        # A client that disconnects closes the generator mid-export;
+        # don't keep rendering workbooks nobody will receive.
+        pool.shutdown(wait=finished, cancel_futures=not finished)
+
+
+def stream_smeta_zip(
+    smeta_ids: Iterable[int],
+    max_workers: int | None = None,
+) -> Iterator[bytes]:
+    """Stream a ZIP archive containing one workbook per smeta.
+
+    Members are stored uncompressed: ``.xlsx`` files are already
+    deflate-compressed, so recompressing only burns CPU.
+
+    Args:
+        smeta_ids: Primary keys of the smetalar to export.
+        max_workers: Pool size, see :func:`iter_rendered_workbooks`.
+
+    Yields:
+        Consecutive chunks of the ZIP archive.
+    """
+    sink = _ChunkSink()
+    count = 0
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, content in iter_rendered_workbooks(smeta_ids, max_workers):
+            zf.writestr(name, content)
+            count += 1
+            yield sink.drain()
+    yield sink.drain()
+    logger.info("ZIP eksport yakunlandi: %d ta smeta", count)
@@ -0,0 +1,160 @@
+"""Delta sync of a user's smeta list.
+
+Clients keep a local copy of the dashboard list and ask only for what
+changed after a cursor: smetalar created or updated since then (with
+their grand totals) and the ids of those deleted since then, read
+from :class:`~smetalar.models.SmetaTombstone`.
+
+Changes are ordered by ``(time, kind, id)`` and the cursor is that key
+of the last change returned (:class:`SyncCursor`), so changes sharing a
+timestamp are never split from each other by a page boundary.
+
+A smeta row is saved before its line items, in one transaction, so a
+change may become visible after a later timestamp was handed out. The
+cursor therefore never passes ``now - SMETA_CHANGES_SETTLE_SECONDS``;
+changes inside that window are sent again on the next request, and
+clients apply them as idempotent upserts.
+"""
+
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from smetalar.models import SmetaTombstone
+from smetalar.selectors.smeta_selector import (
+    get_user_changed_smetalar,
+    get_user_tombstones,
+)
+from smetalar.services.smeta_service import calculate_grand_total
+
+CHANGED, DELETED = 0, 1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class StaleCursorError(Exception):
+    """The cursor is older than the kept tombstones."""
+
+
+class SyncCursor(NamedTuple):
+    """Position in a user's change stream: ``(time, kind, id)``."""
+
+    at: datetime
+    kind: int
+    id: int
+
+    def encode(self) -> str:
+        """Return the opaque form handed to clients."""
+        return f"{(self.at - _EPOCH) // _MICROSECOND}.{self.kind}.{self.id}"
+
+    @classmethod
+    def decode(cls, value: str) -> "SyncCursor":
+        """Parse :meth:`encode` output.
+
+        Raises:
+            ValueError: If ``value`` is not a cursor.
+        """
+        micros, kind, pk = (int(part) for part in value.split("."))
+        if kind not in (CHANGED, DELETED) or pk < 0:
+            raise ValueError(value)
+        try:
+            at = _EPOCH + micros * _MICROSECOND
+        except OverflowError as exc:
+            raise ValueError(value) from exc
+        return cls(at, kind, pk)
+
+
+def get_user_changes(user_id: int, cursor: SyncCursor | None = None) -> dict[str, Any]:
+    """Changes to a user's smetalar after ``cursor``.
+
+    Args:
+        user_id: The owner's primary key.
+        cursor: Cursor from the previous response; None returns the
+            whole list (no deletions).
+
+    Returns:
+        ``changed`` smetalar (oldest change first, ``grand_total``
+        set), ``deleted`` smeta ids, the next ``cursor`` (encoded) and
+        ``has_more`` when the client should ask again right away.
+
+    Raises:
+        StaleCursorError: Deletions before the cursor may already have
+            been purged; the client must reload the full list.
+    """
+    now = timezone.now()
+    retention = timedelta(days=settings.SMETA_TOMBSTONE_RETENTION_DAYS)
+    if cursor is not None and cursor.at < now - retention:
+        raise StaleCursorError(
+            "Sinxronlash kursori eskirgan, ro'yxatni qaytadan yuklang."
+        )
+
+    limit = settings.SMETA_CHANGES_PAGE_SIZE
+    events: list[tuple[SyncCursor, Any]] = []
+    if cursor is None:
+        smetalar = get_user_changed_smetalar(user_id, None, None, limit + 1)
+    else:
+        # Smetalar sort before tombstones of the same instant.
+        smetalar = get_user_changed_smetalar(
+            user_id,
+            cursor.at,
+            cursor.id if cursor.kind == CHANGED else None,
+            limit + 1,
+        )
+        events += [
+            (SyncCursor(tombstone.deleted_at, DELETED, tombstone.pk), tombstone)
+            for tombstone in get_user_tombstones(
+                user_id,
+                cursor.at,
+                cursor.id if cursor.kind == DELETED else 0,
+                limit + 1,
+            )
+        ]
+    events += [
+        (SyncCursor(smeta.updated_at, CHANGED, smeta.pk), smeta) for smeta in smetalar
+    ]
+    events.sort(key=lambda event: event[0])
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    changed = []
+    deleted = []
+    for _key, obj in events:
+        if isinstance(obj, SmetaTombstone):
+            deleted.append(obj.smeta_id)
+        else:
+            obj.grand_total = calculate_grand_total(obj)
+            changed.append(obj)
+
+    settled = SyncCursor(
+        now - timedelta(seconds=settings.SMETA_CHANGES_SETTLE_SECONDS), CHANGED, 0
+    )
+    last = events[-1][0] if events else cursor or settled
+    # A page cut inside the settle window cannot advance the cursor;
+    # the client gets the rest once those changes have settled.
+    has_more = has_more and last <= settled
+    return {
+        "changed": changed,
+        "deleted": deleted,
+        "cursor": min(last, settled).encode(),
+        "has_more": has_more,
+    }
+
+
+def purge_tombstones(days: int | None = None) -> int:
+    """Delete tombstones older than ``days``.
+
+    Args:
+        days: Retention in days; defaults to
+            ``settings.SMETA_TOMBSTONE_RETENTION_DAYS``.
+
+    Returns:
+        Number of deleted tombstones.
+    """
+    days = settings.SMETA_TOMBSTONE_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = SmetaTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
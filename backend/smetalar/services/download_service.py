@@ -0,0 +1,69 @@
+"""Authenticated delivery of generated Excel files.
+
+Django only checks access; the bytes are pushed by nginx (local
+storage, ``X-Accel-Redirect`` to an ``internal`` location) or by the
+object store (presigned URL redirect), never by an app worker.
+"""
+
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+from django.utils.http import content_disposition_header
+
+from smetalar.models import XarajatlarSmetasi
+
+# Kept out of excel_service so views and admin can use them without
+# importing openpyxl.
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+
+def excel_filename(smeta: XarajatlarSmetasi) -> str:
+    """Return a filesystem-safe ``.xlsx`` filename for a smeta.
+
+    Args:
+        smeta: The XarajatlarSmetasi instance.
+
+    Returns:
+        Filename derived from the project name.
+    """
+    safe_name = (
+        smeta.project_name.replace("/", "_").replace("\\", "_").replace(":", "_")[:120]
+        or "Xarajatlar_smetasi"
+    )
+    return f"{safe_name}.xlsx"
+
+
+def excel_download_path(smeta: XarajatlarSmetasi) -> str:
+    """Return the path of the authenticated download endpoint of a smeta."""
+    return reverse("smetalar:smeta-download", args=[smeta.pk])
+
+
+def file_download_response(file: FieldFile, filename: str) -> HttpResponse:
+    """Build a response that hands the file transfer off to the proxy.
+
+    Args:
+        file: Stored file to send; the caller has checked access.
+        filename: Download filename for ``Content-Disposition``.
+
+    Returns:
+        An ``X-Accel-Redirect`` response for local storage behind
+        nginx, a redirect to a presigned URL for remote storage, or a
+        plain file response when ``EXPORT_X_ACCEL_REDIRECT`` is off
+        (development without nginx).
+    """
+    if not isinstance(file.storage, FileSystemStorage):
+        return HttpResponseRedirect(file.url)
+
+    if not settings.EXPORT_X_ACCEL_REDIRECT:
+        return FileResponse(file.open("rb"), as_attachment=True, filename=filename)
+
+    response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    response["X-Accel-Redirect"] = settings.EXPORT_X_ACCEL_PREFIX + quote(file.name)
+    return response
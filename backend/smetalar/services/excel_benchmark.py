@@ -0,0 +1,292 @@
+"""Benchmark harness for the Excel export hot path.
+
+Builds synthetic smetalar of a given size and times each stage of
+``generate_smeta_excel`` separately, so regressions can be compared
+against a stored baseline.
+"""
+
+import gc
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable
+from decimal import Decimal
+from io import BytesIO
+from typing import Any
+
+import openpyxl
+from django.utils import timezone
+
+from smetalar.models import (
+    DavrXarajat,
+    Employee,
+    InventoryItem,
+    OtherExpense,
+    Product,
+    RawMaterial,
+    SotishMahsulot,
+    SotishRejasiYil,
+    XarajatlarSmetasi,
+)
+from smetalar.services import excel_service
+
+SHEET_BUILDERS: list[tuple[str, Callable[[Any, dict], None]]] = [
+    ("jami", excel_service._build_jami_sheet),
+    ("ish_haqi", excel_service._build_ish_haqi_sheet),
+    ("inventar", excel_service._build_inventar_sheet),
+    ("xom_ashyo", excel_service._build_xom_ashyo_sheet),
+    ("boshqa_xarajatlar", excel_service._build_boshqa_xarajatlar_sheet),
+    ("tannarx", excel_service._build_tannarx_sheet),
+    ("davr_xarajatlari", excel_service._build_davr_xarajatlari_sheet),
+    ("sotish_rejasi", excel_service._build_sotish_rejasi_sheet),
+    ("moliyaviy_xisobot", excel_service._build_moliyaviy_xisobot_sheet),
+]
+
+
+def create_synthetic_smeta(
+    user: Any,
+    items: int,
+    years: int,
+) -> XarajatlarSmetasi:
+    """Create a smeta with roughly ``items`` line items in total.
+
+    Items are split evenly over employees, inventory, raw materials,
+    other expenses and period expenses; each sales-plan year gets a
+    share of products as well.
+
+    Args:
+        user: Owner of the synthetic smeta.
+        items: Total number of line items to create.
+        years: Project duration / number of sales-plan years.
+
+    Returns:
+        The created XarajatlarSmetasi.
+    """
+    per_kind = max(items // 5, 1)
+    smeta = XarajatlarSmetasi.objects.create(
+        user=user,
+        project_name=f"Benchmark {items}x{years}",
+        organization_name="Benchmark",
+        project_duration_years=years,
+    )
+
+    def source(i: int) -> str:
+        return "vazirlik" if i % 3 else "tashkilot"
+
+    def kind(i: int) -> str:
+        return "management" if i % 2 else "production"
+
+    Employee.objects.bulk_create(
+        Employee(
+            smeta=smeta,
+            staff_type=kind(i),
+            position=f"Lavozim {i}",
+            count=1 + i % 4,
+            monthly_salary=Decimal(3_000_000 + i * 1_000),
+            duration_months=12,
+            financing_source=source(i),
+        )
+        for i in range(per_kind)
+    )
+    InventoryItem.objects.bulk_create(
+        InventoryItem(
+            smeta=smeta,
+            name=f"Jihoz {i}",
+            description="Sintetik",
+            unit="dona",
+            quantity=1 + i % 5,
+            price=Decimal(1_500_000 + i * 100),
+            financing_source=source(i),
+        )
+        for i in range(per_kind)
+    )
+    RawMaterial.objects.bulk_create(
+        RawMaterial(
+            smeta=smeta,
+            name=f"Xomashyo {i}",
+            unit="kg",
+            quantity=10 + i % 50,
+            price=Decimal(20_000 + i),
+            financing_source=source(i),
+        )
+        for i in range(per_kind)
+    )
+    OtherExpense.objects.bulk_create(
+        OtherExpense(
+            smeta=smeta,
+            expense_type=kind(i),
+            name=f"Xarajat {i}",
+            unit="oy",
+            quantity=1 + i % 12,
+            price=Decimal(500_000 + i * 10),
+            financing_source=source(i),
+        )
+        for i in range(per_kind)
+    )
+    DavrXarajat.objects.bulk_create(
+        DavrXarajat(smeta=smeta, name=f"Davr {i}", amount=Decimal(1_000 + i))
+        for i in range(per_kind)
+    )
+    Product.objects.bulk_create(
+        Product(smeta=smeta, name=f"Mahsulot {i}", quantity=1 + i % 10)
+        for i in range(min(per_kind, 20))
+    )
+
+    per_year = max(per_kind // years, 1)
+    for year in range(1, years + 1):
+        yil = SotishRejasiYil.objects.create(smeta=smeta, year=year)
+        SotishMahsulot.objects.bulk_create(
+            SotishMahsulot(
+                sotish_rejasi_yil=yil,
+                name=f"Mahsulot {i}",
+                unit="dona",
+                quantity=100 + i,
+                price=Decimal(50_000 + i),
+            )
+            for i in range(per_year)
+        )
+    return smeta
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    """Run ``fn`` and return its result and wall time in milliseconds."""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _export_stages(smeta: XarajatlarSmetasi) -> dict[str, float]:
+    """Time one full export, stage by stage (milliseconds)."""
+    smeta = XarajatlarSmetasi.objects.get(pk=smeta.pk)
+    timings: dict[str, float] = {}
+    d, timings["gather_smeta_data"] = _timed(
+        lambda: excel_service._gather_smeta_data(smeta)
+    )
+    wb, timings["clone_template"] = _timed(
+        lambda: excel_service._clone_workbook(
+            excel_service.get_template_workbook()
+        )
+    )
+    for name, builder in SHEET_BUILDERS:
+        _, timings[f"build_{name}_sheet"] = _timed(lambda: builder(wb, d))
+    _, timings["wb_save"] = _timed(lambda: wb.save(BytesIO()))
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+def benchmark_smeta(
+    smeta: XarajatlarSmetasi,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Benchmark the export of one smeta.
+
+    Timings are the best of ``repeat`` runs. Peak memory is measured
+    in a separate run under ``tracemalloc`` so tracing overhead does
+    not skew the timings.
+
+    Args:
+        smeta: The smeta to export.
+        repeat: Number of timed runs.
+
+    Returns:
+        Dict with ``timings_ms`` per stage and ``peak_memory_kb``.
+    """
+    excel_service.get_template_workbook()
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        runs.append(_export_stages(smeta))
+    timings = {key: round(min(r[key] for r in runs), 3) for key in runs[0]}
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _export_stages(smeta)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"timings_ms": timings, "peak_memory_kb": round(peak / 1024, 1)}
+
+
+def run_benchmarks(
+    user: Any,
+    sizes: list[int],
+    years: list[int],
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Benchmark every (items, years) combination.
+
+    Args:
+        user: Owner for the synthetic smetalar.
+        sizes: Line item counts to test.
+        years: Sales-plan year counts to test.
+        repeat: Timed runs per case.
+
+    Returns:
+        JSON-serializable results with environment metadata.
+    """
+    cases = []
+    for items in sizes:
+        for yrs in years:
+            smeta = create_synthetic_smeta(user, items, yrs)
+            cases.append(
+                {
+                    "case": f"{items}x{yrs}",
+                    "items": items,
+                    "years": yrs,
+                    **benchmark_smeta(smeta, repeat=repeat),
+                }
+            )
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "openpyxl": openpyxl.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "cases": cases,
+    }
+
+
+def compare_to_baseline(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = 0.25,
+    floor: float = 1.0,
+) -> list[str]:
+    """List the metrics that regressed by more than ``tolerance``.
+
+    Args:
+        results: Output of :func:`run_benchmarks`.
+        baseline: A previously stored result set.
+        tolerance: Allowed relative slowdown, e.g. 0.25 for +25%.
+        floor: Absolute increase (ms or KB) below which a change is
+            treated as noise.
+
+    Returns:
+        Human-readable regression descriptions; empty if none.
+    """
+    base_cases = {c["case"]: c for c in baseline.get("cases", [])}
+    regressions = []
+    for case in results["cases"]:
+        base = base_cases.get(case["case"])
+        if base is None:
+            continue
+        metrics = {
+            **{f"{k} (ms)": v for k, v in case["timings_ms"].items()},
+            "peak_memory (KB)": case["peak_memory_kb"],
+        }
+        base_metrics = {
+            **{f"{k} (ms)": v for k, v in base["timings_ms"].items()},
+            "peak_memory (KB)": base["peak_memory_kb"],
+        }
+        for name, value in metrics.items():
+            old = base_metrics.get(name)
+            if old and value > old * (1 + tolerance) and value - old > floor:
+                regressions.append(
+                    f"{case['case']} {name}: {old} -> {value} "
+                    f"(+{(value / old - 1) * 100:.0f}%)"
+                )
+    return regressions
@@ -0,0 +1,122 @@
+"""Garbage collection of generated Excel files.
+
+Every regeneration saves a new, uniquely named file and older builds
+are left behind. :func:`collect_excel_garbage` walks the export storage
+in batches and deletes:
+
+* files no longer referenced by any smeta, once older than a grace
+  period (a build may have saved its file but not yet recorded it);
+* referenced files older than the retention window; the smeta's
+  reference is cleared so the next export request rebuilds it.
+"""
+
+import itertools
+import logging
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.files.storage import Storage
+from django.utils import timezone
+
+from smetalar.models import XarajatlarSmetasi
+
+logger = logging.getLogger(__name__)
+
+EXCEL_ROOT = "smetalar/excel"
+
+
+@dataclass
+class ExcelGcReport:
+    """Outcome of one garbage collection run."""
+
+    scanned: int = 0
+    deleted: int = 0
+    expired: int = 0
+    bytes_reclaimed: int = 0
+
+
+def _walk(storage: Storage, path: str) -> Iterator[str]:
+    """Yield the names of all files below ``path``, depth first."""
+    try:
+        dirs, files = storage.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f"{path}/{name}"
+    for name in dirs:
+        yield from _walk(storage, f"{path}/{name}")
+
+
+def collect_excel_garbage(
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Delete unreferenced and expired Excel files from storage.
+
+    Args:
+        retention_days: Age after which even referenced files are
+            removed; 0 keeps them forever. Defaults to
+            ``settings.SMETA_EXCEL_RETENTION_DAYS``.
+        batch_size: Files checked against the database per query;
+            defaults to ``settings.SMETA_EXCEL_GC_BATCH_SIZE``.
+        dry_run: Only report what would be deleted.
+
+    Returns:
+        The :class:`ExcelGcReport` fields as a dict.
+    """
+    if retention_days is None:
+        retention_days = settings.SMETA_EXCEL_RETENTION_DAYS
+    batch_size = batch_size or settings.SMETA_EXCEL_GC_BATCH_SIZE
+    now = timezone.now()
+    orphan_cutoff = now - timedelta(seconds=settings.SMETA_EXCEL_GC_GRACE_SECONDS)
+    expiry_cutoff = now - timedelta(days=retention_days) if retention_days else None
+
+    field = XarajatlarSmetasi._meta.get_field("excel_file")
+    storage: Storage = field.storage
+    report = ExcelGcReport()
+
+    names = _walk(storage, EXCEL_ROOT)
+    while batch := list(itertools.islice(names, batch_size)):
+        report.scanned += len(batch)
+        referenced = set(
+            XarajatlarSmetasi.objects.filter(excel_file__in=batch).values_list(
+                "excel_file",
+                flat=True,
+            )
+        )
+        for name in batch:
+            try:
+                modified = storage.get_modified_time(name)
+            except FileNotFoundError:
+                continue
+            if name in referenced:
+                if expiry_cutoff is None or modified >= expiry_cutoff:
+                    continue
+                if not dry_run:
+                    # Only clear the reference if it still points here.
+                    XarajatlarSmetasi.objects.filter(excel_file=name).update(
+                        excel_file="",
+                        excel_version=0,
+                    )
+                report.expired += 1
+            elif modified >= orphan_cutoff:
+                continue
+
+            size = storage.size(name)
+            if not dry_run:
+                storage.delete(name)
+            report.deleted += 1
+            report.bytes_reclaimed += size
+
+    logger.info(
+        "Excel GC: %d ta fayl ko'rildi, %d ta o'chirildi, %d bayt bo'shatildi%s",
+        report.scanned,
+        report.deleted,
+        report.bytes_reclaimed,
+        " (dry run)" if dry_run else "",
+    )
+    return asdict(report)
@@ -0,0 +1,293 @@
+"""Parse uploaded smeta workbooks back into SmetaCreateSerializer data.
+
+The importer understands the 9-sheet layout written by
+``excel_service``. Workbooks are opened in openpyxl ``read_only``
+mode and walked row by row, so memory stays flat no matter how many
+rows a sheet has; only the extracted payload is kept.
+
+Amounts on most sheets are written in thousands of so'm, so they are
+multiplied back by 1000 here (as ``Decimal``, keeping any fraction a
+user typed into the cell).
+"""
+
+import logging
+import re
+import zipfile
+from collections.abc import Iterator
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_SHEETS = (
+    "Jami",
+    "Ish haqi",
+    "Inventar",
+    "Xom ashyo",
+    "Boshqa xar.",
+    "Tannarx",
+    "Davr xarajatlari",
+    "Sotish rejasi",
+)
+
+_YEAR_RE = re.compile(r"^(\d+)-YIL$")
+
+
+class SmetaImportError(ValueError):
+    """Raised when an uploaded workbook cannot be imported."""
+
+
+def _rows(ws: Any, min_row: int) -> Iterator[tuple]:
+    """Yield value tuples from ``min_row`` downwards."""
+    yield from ws.iter_rows(min_row=min_row, values_only=True)
+
+
+def _col(row: tuple, idx: int) -> Any:
+    """Return the 1-based column ``idx`` of ``row`` or None."""
+    return row[idx - 1] if len(row) >= idx else None
+
+
+def _is_item_row(row: tuple) -> bool:
+    """Item rows carry their running number in column A."""
+    return isinstance(_col(row, 1), int | float) and _col(row, 2) is not None
+
+
+def _thousands(value: Any, ws: Any, row_no: int) -> str:
+    """Convert a 'ming so'm' cell back to so'm.
+
+    Raises:
+        SmetaImportError: If the cell does not hold a number.
+    """
+    try:
+        amount = Decimal(str(value if value not in (None, "") else 0)) * 1000
+        if not amount.is_finite():
+            raise InvalidOperation
+    except (InvalidOperation, ValueError) as exc:
+        raise SmetaImportError(
+            f"'{ws.title}' varag'i, {row_no}-qator: summa son emas ({value!r})."
+        ) from exc
+    return str(amount.quantize(Decimal("0.01")))
+
+
+def _source(vazirlik_cell: Any) -> str:
+    """Financing source is whichever split column holds the amount."""
+    return "vazirlik" if vazirlik_cell not in (None, "") else "tashkilot"
+
+
+def _parse_jami(ws: Any, properties: Any) -> dict[str, str]:
+    """Read project and organisation names.
+
+    Exports record them as the document title and subject; the
+    ``"<project> - <organisation>"`` title cell is only split for
+    workbooks without them, since either name may contain " - ".
+    """
+    if properties.title:
+        return {
+            "project_name": properties.title,
+            "organization_name": properties.subject or "",
+        }
+    title = ""
+    for row in ws.iter_rows(min_row=5, max_row=5, values_only=True):
+        title = str(_col(row, 1) or "")
+    name, sep, org = title.rpartition(" - ")
+    if not sep:
+        name, org = title, ""
+    return {"project_name": name.strip(), "organization_name": org.strip()}
+
+
+def _parse_ish_haqi(ws: Any) -> dict[str, list[dict]]:
+    """Read employees, grouped by staff type."""
+    salary: dict[str, list[dict]] = {
+        "management_staff": [],
+        "production_staff": [],
+    }
+    key = "management_staff"
+    for row_no, row in enumerate(_rows(ws, 5), 5):
+        label = _col(row, 1)
+        if label == "Ma'muriy-boshqaruv xodimlari:":
+            key = "management_staff"
+        elif label == "Ishlab chiqarish xodimlari:":
+            key = "production_staff"
+        elif _is_item_row(row):
+            salary[key].append(
+                {
+                    "staff_type": key.removesuffix("_staff"),
+                    "position": str(_col(row, 2)),
+                    "count": _col(row, 3),
+                    "monthly_salary": _thousands(_col(row, 4), ws, row_no),
+                    "duration_months": _col(row, 6),
+                    "financing_source": _source(_col(row, 8)),
+                }
+            )
+    return salary
+
+
+def _parse_inventar(ws: Any) -> list[dict]:
+    """Read inventory items.
+
+    The name cell may carry the description in parentheses and the
+    link on following lines.
+    """
+    items = []
+    for row_no, row in enumerate(_rows(ws, 5), 5):
+        if not _is_item_row(row):
+            continue
+        name, *extra = str(_col(row, 2)).split("\n")
+        description = link = ""
+        for line in extra:
+            if line.startswith("(") and line.endswith(")") and not description:
+                description = line[1:-1]
+            else:
+                link = line
+        items.append(
+            {
+                "name": name,
+                "description": description,
+                "link": link,
+                "unit": str(_col(row, 3) or "dona"),
+                "quantity": _col(row, 4),
+                "price": _thousands(_col(row, 5), ws, row_no),
+                "financing_source": _source(_col(row, 7)),
+            }
+        )
+    return items
+
+
+def _parse_priced_rows(ws: Any) -> list[dict]:
+    """Read raw materials (same column layout as inventory)."""
+    return [
+        {
+            "name": str(_col(row, 2)),
+            "unit": str(_col(row, 3) or ""),
+            "quantity": _col(row, 4),
+            "price": _thousands(_col(row, 5), ws, row_no),
+            "financing_source": _source(_col(row, 7)),
+        }
+        for row_no, row in enumerate(_rows(ws, 5), 5)
+        if _is_item_row(row)
+    ]
+
+
+def _parse_boshqa_xarajatlar(ws: Any) -> dict[str, list[dict]]:
+    """Read other expenses, grouped by expense type."""
+    expenses: dict[str, list[dict]] = {
+        "management_expenses": [],
+        "production_expenses": [],
+    }
+    key = "management_expenses"
+    for row_no, row in enumerate(_rows(ws, 5), 5):
+        label = _col(row, 1)
+        if label == "Boshqa ma'muriy xarajatlar:":
+            key = "management_expenses"
+        elif label == "Ishlab chiqarish bilan bog'liq boshqa xarajatlar:":
+            key = "production_expenses"
+        elif _is_item_row(row):
+            expenses[key].append(
+                {
+                    "expense_type": key.removesuffix("_expenses"),
+                    "name": str(_col(row, 2)),
+                    "unit": str(_col(row, 3) or ""),
+                    "quantity": _col(row, 4),
+                    "price": _thousands(_col(row, 5), ws, row_no),
+                    "financing_source": _source(_col(row, 7)),
+                }
+            )
+    return expenses
+
+
+def _parse_tannarx(ws: Any) -> list[dict]:
+    """Read products from the per-product blocks under the cost table."""
+    products = []
+    pending: str | None = None
+    for row in _rows(ws, 6):
+        label = _col(row, 2)
+        if _col(row, 1) is None and isinstance(label, str) and label.endswith("*"):
+            pending = label[:-1]
+        elif label == "Mahsulot soni" and pending is not None:
+            products.append({"name": pending, "quantity": _col(row, 3)})
+            pending = None
+    return products
+
+
+def _parse_davr_xarajatlari(ws: Any) -> list[dict]:
+    """Read period expenses (amounts are written as-is)."""
+    return [
+        {"name": str(_col(row, 2)), "amount": str(_col(row, 3) or 0)}
+        for row in _rows(ws, 5)
+        if _is_item_row(row)
+    ]
+
+
+def _parse_sotish_rejasi(ws: Any) -> list[dict]:
+    """Read the sales plan, one block per ``N-YIL`` heading."""
+    years: list[dict] = []
+    for row in _rows(ws, 4):
+        label = _col(row, 1)
+        match = _YEAR_RE.match(label) if isinstance(label, str) else None
+        if match:
+            years.append({"year": int(match.group(1)), "products": []})
+        elif years and _is_item_row(row):
+            years[-1]["products"].append(
+                {
+                    "name": str(_col(row, 2)),
+                    "unit": str(_col(row, 3) or ""),
+                    "quantity": _col(row, 4),
+                    "price": str(_col(row, 5) or 0),
+                }
+            )
+    return years
+
+
+def parse_smeta_workbook(source: str | IO[bytes]) -> dict[str, Any]:
+    """Map a smeta workbook onto the SmetaCreateSerializer shape.
+
+    Args:
+        source: Path or binary file object of an ``.xlsx`` workbook.
+
+    Returns:
+        Unvalidated data for SmetaCreateSerializer.
+
+    Raises:
+        SmetaImportError: If the file is not an ``.xlsx`` workbook or
+            does not follow the smeta layout.
+    """
+    try:
+        wb = load_workbook(source, read_only=True, data_only=True)
+    except (
+        InvalidFileException,
+        zipfile.BadZipFile,
+        KeyError,
+        OSError,
+        ValueError,
+    ) as exc:
+        raise SmetaImportError("Fayl .xlsx formatida emas.") from exc
+
+    try:
+        missing = [name for name in REQUIRED_SHEETS if name not in wb.sheetnames]
+        if missing:
+            raise SmetaImportError(
+                "Fayl smeta shabloniga mos emas. Topilmagan varaqlar: "
+                + ", ".join(missing)
+            )
+
+        sotish_rejasi = _parse_sotish_rejasi(wb["Sotish rejasi"])
+        data: dict[str, Any] = {
+            **_parse_jami(wb["Jami"], wb.properties),
+            "salary": _parse_ish_haqi(wb["Ish haqi"]),
+            "inventory": _parse_inventar(wb["Inventar"]),
+            "raw_materials": _parse_priced_rows(wb["Xom ashyo"]),
+            "other_expenses": _parse_boshqa_xarajatlar(wb["Boshqa xar."]),
+            "products": _parse_tannarx(wb["Tannarx"]),
+            "davr_xarajatlari": _parse_davr_xarajatlari(wb["Davr xarajatlari"]),
+            "sotish_rejasi": sotish_rejasi,
+        }
+        if sotish_rejasi:
+            data["project_duration_years"] = len(sotish_rejasi)
+    finally:
+        wb.close()
+
+    logger.info("Excel fayl o'qildi: %s", data["project_name"])
+    return data
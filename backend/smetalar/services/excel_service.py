@@ -4,22 +4,35 @@ Mirrors the frontend excelGenerator.ts logic, producing
 the same multi-sheet workbook server-side.
 """
 
+import copy
+import functools
 import logging
+import tempfile
+from collections.abc import Callable
 from decimal import Decimal
 from io import BytesIO
 from pathlib import Path
 from typing import Any
 
 from django.conf import settings
-from django.core.files.base import ContentFile
-from openpyxl import Workbook
+from django.core.files import File
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import Cell, MergedCell
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
+from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.merge import MergedCellRange
 
 from smetalar.models import XarajatlarSmetasi
+from smetalar.selectors.smeta_selector import get_portfolio_totals
+from smetalar.services.download_service import excel_filename
 
 logger = logging.getLogger(__name__)
 
+# (message, step, total) — step/total are None for uncounted stages.
+ProgressCallback = Callable[[str, int | None, int | None], None]
+
 SOCIAL_TAX_RATE = Decimal("0.12")
 PROFIT_TAX_RATE = Decimal("0.12")
 
@@ -82,6 +95,16 @@ def _rnd(val: float) -> int:
     return round(val)
 
 
+def _unit_amount_cell(ws: Any, row: int, col: int, value: Decimal) -> None:
+    """Write a salary or unit price in ming so'm.
+
+    The importer reads these cells back, so the value is stored
+    unrounded and only displayed as whole thousands.
+    """
+    _cell(ws, row, col, float(Decimal(value) / 1000))
+    ws.cell(row=row, column=col).number_format = "0"
+
+
 # ------------------------------------------------------------------
 # Data gathering helpers
 # ------------------------------------------------------------------
@@ -242,11 +265,8 @@ def _gather_smeta_data(smeta: XarajatlarSmetasi) -> dict[str, Any]:
 # ------------------------------------------------------------------
 # Sheet builders
 # ------------------------------------------------------------------
-def _build_jami_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Jami' (summary) sheet."""
-    ws = wb.active
-    ws.title = "Jami"
-
+def _layout_jami_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Jami' (summary) sheet."""
     ws.merge_cells("A1:E1")
     c = ws["A1"]
     c.value = (
@@ -264,9 +284,6 @@ def _build_jami_sheet(wb: Workbook, d: dict) -> None:
     ws["A4"].alignment = _CENTER
 
     ws.merge_cells("A5:E5")
-    name = d["smeta"].project_name
-    org = d["smeta"].organization_name
-    ws["A5"].value = f"{name} - {org}"
     ws["A5"].font = Font(bold=True, size=12)
     ws["A5"].alignment = _CENTER
 
@@ -281,6 +298,20 @@ def _build_jami_sheet(wb: Workbook, d: dict) -> None:
         _header_style(ws, 7, i, h)
     ws.row_dimensions[7].height = 45
 
+    ws.column_dimensions["A"].width = 45
+    ws.column_dimensions["B"].width = 20
+    ws.column_dimensions["C"].width = 30
+    ws.column_dimensions["D"].width = 18
+    ws.column_dimensions["E"].width = 18
+
+
+def _build_jami_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Jami' (summary) sheet."""
+    ws = wb["Jami"]
+    name = d["smeta"].project_name
+    org = d["smeta"].organization_name
+    ws["A5"].value = f"{name} - {org}"
+
     vaz_salary = d["mgmt_vaz"] + d["prod_vaz"]
     tash_salary = d["mgmt_tash"] + d["prod_tash"]
     vaz_social = vaz_salary * float(SOCIAL_TAX_RATE)
@@ -328,17 +359,9 @@ def _build_jami_sheet(wb: Workbook, d: dict) -> None:
     _cell(ws, row, 4, _rnd((t_vaz + t_tash) / 1000), bold=True)
     _cell(ws, row, 5, "100.0%", bold=True)
 
-    ws.column_dimensions["A"].width = 45
-    ws.column_dimensions["B"].width = 20
-    ws.column_dimensions["C"].width = 30
-    ws.column_dimensions["D"].width = 18
-    ws.column_dimensions["E"].width = 18
-
-
-def _build_ish_haqi_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Ish haqi' (salary) sheet."""
-    ws = wb.create_sheet("Ish haqi")
 
+def _layout_ish_haqi_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Ish haqi' (salary) sheet."""
     ws.merge_cells("A1:I1")
     ws["A1"].value = "Mehnatga haq to'lash xarajatlari"
     ws["A1"].font = _TITLE_FONT
@@ -362,6 +385,23 @@ def _build_ish_haqi_sheet(wb: Workbook, d: dict) -> None:
     _header_style(ws, 4, 8, "Vazirlik hisobidan\n(ming so'mda)")
     _header_style(ws, 4, 9, "Tashkilot hisobidan\n(ming so'mda)")
 
+    for c_letter, w in [
+        ("A", 5),
+        ("B", 25),
+        ("C", 12),
+        ("D", 15),
+        ("E", 15),
+        ("F", 15),
+        ("G", 15),
+        ("H", 18),
+        ("I", 18),
+    ]:
+        ws.column_dimensions[c_letter].width = w
+
+
+def _build_ish_haqi_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Ish haqi' (salary) sheet."""
+    ws = wb["Ish haqi"]
     row = 5
 
     def _write_staff(staff: list, label: str, start_row: int) -> int:
@@ -380,7 +420,7 @@ def _build_ish_haqi_sheet(wb: Workbook, d: dict) -> None:
             _cell(ws, r, 1, idx)
             _cell(ws, r, 2, emp.position, align="left")
             _cell(ws, r, 3, emp.count)
-            _cell(ws, r, 4, _rnd(float(emp.monthly_salary) / 1000))
+            _unit_amount_cell(ws, r, 4, emp.monthly_salary)
             _cell(ws, r, 5, _rnd(mt / 1000))
             _cell(ws, r, 6, emp.duration_months)
             _cell(ws, r, 7, _rnd(t / 1000))
@@ -446,23 +486,9 @@ def _build_ish_haqi_sheet(wb: Workbook, d: dict) -> None:
     ws.cell(row, 1, "Jami ijtimoiy soliq").font = _BOLD_FONT
     _cell(ws, row, 7, _rnd(d["total_social"] / 1000), bold=True)
 
-    for c_letter, w in [
-        ("A", 5),
-        ("B", 25),
-        ("C", 12),
-        ("D", 15),
-        ("E", 15),
-        ("F", 15),
-        ("G", 15),
-        ("H", 18),
-        ("I", 18),
-    ]:
-        ws.column_dimensions[c_letter].width = w
-
 
-def _build_inventar_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Inventar' sheet."""
-    ws = wb.create_sheet("Inventar")
+def _layout_inventar_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Inventar' sheet."""
     ws.merge_cells("A1:H1")
     ws["A1"].value = "Inventar, texnika va jihozlarni xarid qilish xarajatlari"
     ws["A1"].font = _TITLE_FONT
@@ -485,6 +511,22 @@ def _build_inventar_sheet(wb: Workbook, d: dict) -> None:
     _header_style(ws, 4, 7, "Vazirlik hisobidan\n(ming so'mda)")
     _header_style(ws, 4, 8, "Tashkilot hisobidan\n(ming so'mda)")
 
+    for c_letter, w in [
+        ("A", 5),
+        ("B", 50),
+        ("C", 10),
+        ("D", 10),
+        ("E", 12),
+        ("F", 12),
+        ("G", 18),
+        ("H", 18),
+    ]:
+        ws.column_dimensions[c_letter].width = w
+
+
+def _build_inventar_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Inventar' sheet."""
+    ws = wb["Inventar"]
     row = 5
     for idx, item in enumerate(d["inventory"], 1):
         t = float(item.price) * item.quantity
@@ -498,7 +540,7 @@ def _build_inventar_sheet(wb: Workbook, d: dict) -> None:
         _cell(ws, row, 2, name_val, align="left")
         _cell(ws, row, 3, item.unit)
         _cell(ws, row, 4, item.quantity)
-        _cell(ws, row, 5, _rnd(float(item.price) / 1000))
+        _unit_amount_cell(ws, row, 5, item.price)
         _cell(ws, row, 6, _rnd(t / 1000))
         _cell(ws, row, 7, _rnd(t / 1000) if is_v else "")
         _cell(ws, row, 8, _rnd(t / 1000) if not is_v else "")
@@ -509,22 +551,9 @@ def _build_inventar_sheet(wb: Workbook, d: dict) -> None:
     _cell(ws, row, 7, _rnd(d["inv_vaz"] / 1000), bold=True)
     _cell(ws, row, 8, _rnd(d["inv_tash"] / 1000), bold=True)
 
-    for c_letter, w in [
-        ("A", 5),
-        ("B", 50),
-        ("C", 10),
-        ("D", 10),
-        ("E", 12),
-        ("F", 12),
-        ("G", 18),
-        ("H", 18),
-    ]:
-        ws.column_dimensions[c_letter].width = w
-
 
-def _build_xom_ashyo_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Xom ashyo' (raw materials) sheet."""
-    ws = wb.create_sheet("Xom ashyo")
+def _layout_xom_ashyo_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Xom ashyo' (raw materials) sheet."""
     ws.merge_cells("A1:H1")
     ws["A1"].value = "Xomashyo va materiallarni sotib olish xarajatlari"
     ws["A1"].font = _TITLE_FONT
@@ -547,6 +576,22 @@ def _build_xom_ashyo_sheet(wb: Workbook, d: dict) -> None:
     _header_style(ws, 4, 7, "Vazirlik hisobidan\n(ming so'mda)")
     _header_style(ws, 4, 8, "Tashkilot hisobidan\n(ming so'mda)")
 
+    for c_letter, w in [
+        ("A", 5),
+        ("B", 40),
+        ("C", 10),
+        ("D", 10),
+        ("E", 12),
+        ("F", 12),
+        ("G", 18),
+        ("H", 18),
+    ]:
+        ws.column_dimensions[c_letter].width = w
+
+
+def _build_xom_ashyo_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Xom ashyo' (raw materials) sheet."""
+    ws = wb["Xom ashyo"]
     row = 5
     for idx, item in enumerate(d["raw_materials"], 1):
         t = float(item.price) * item.quantity
@@ -555,7 +600,7 @@ def _build_xom_ashyo_sheet(wb: Workbook, d: dict) -> None:
         _cell(ws, row, 2, item.name, align="left")
         _cell(ws, row, 3, item.unit)
         _cell(ws, row, 4, item.quantity)
-        _cell(ws, row, 5, _rnd(float(item.price) / 1000))
+        _unit_amount_cell(ws, row, 5, item.price)
         _cell(ws, row, 6, _rnd(t / 1000))
         _cell(ws, row, 7, _rnd(t / 1000) if is_v else "")
         _cell(ws, row, 8, _rnd(t / 1000) if not is_v else "")
@@ -566,22 +611,9 @@ def _build_xom_ashyo_sheet(wb: Workbook, d: dict) -> None:
     _cell(ws, row, 7, _rnd(d["rm_vaz"] / 1000), bold=True)
     _cell(ws, row, 8, _rnd(d["rm_tash"] / 1000), bold=True)
 
-    for c_letter, w in [
-        ("A", 5),
-        ("B", 40),
-        ("C", 10),
-        ("D", 10),
-        ("E", 12),
-        ("F", 12),
-        ("G", 18),
-        ("H", 18),
-    ]:
-        ws.column_dimensions[c_letter].width = w
 
-
-def _build_boshqa_xarajatlar_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Boshqa xar.' sheet."""
-    ws = wb.create_sheet("Boshqa xar.")
+def _layout_boshqa_xarajatlar_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Boshqa xar.' sheet."""
     ws.merge_cells("A1:H1")
     ws["A1"].value = "Boshqa xarajatlar"
     ws["A1"].font = _TITLE_FONT
@@ -604,6 +636,22 @@ def _build_boshqa_xarajatlar_sheet(wb: Workbook, d: dict) -> None:
     _header_style(ws, 4, 7, "Vazirlik hisobidan\n(ming so'mda)")
     _header_style(ws, 4, 8, "Tashkilot hisobidan\n(ming so'mda)")
 
+    for c_letter, w in [
+        ("A", 5),
+        ("B", 45),
+        ("C", 12),
+        ("D", 10),
+        ("E", 12),
+        ("F", 12),
+        ("G", 18),
+        ("H", 18),
+    ]:
+        ws.column_dimensions[c_letter].width = w
+
+
+def _build_boshqa_xarajatlar_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Boshqa xar.' sheet."""
+    ws = wb["Boshqa xar."]
     row = 5
     # Management expenses
     ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=6)
@@ -619,7 +667,7 @@ def _build_boshqa_xarajatlar_sheet(wb: Workbook, d: dict) -> None:
         _cell(ws, row, 2, exp.name, align="left")
         _cell(ws, row, 3, exp.unit)
         _cell(ws, row, 4, exp.quantity)
-        _cell(ws, row, 5, _rnd(float(exp.price) / 1000))
+        _unit_amount_cell(ws, row, 5, exp.price)
         _cell(ws, row, 6, _rnd(t / 1000))
         _cell(ws, row, 7, _rnd(t / 1000) if is_v else "")
         _cell(ws, row, 8, _rnd(t / 1000) if not is_v else "")
@@ -641,7 +689,7 @@ def _build_boshqa_xarajatlar_sheet(wb: Workbook, d: dict) -> None:
         _cell(ws, row, 2, exp.name, align="left")
         _cell(ws, row, 3, exp.unit)
         _cell(ws, row, 4, exp.quantity)
-        _cell(ws, row, 5, _rnd(float(exp.price) / 1000))
+        _unit_amount_cell(ws, row, 5, exp.price)
         _cell(ws, row, 6, _rnd(t / 1000))
         _cell(ws, row, 7, _rnd(t / 1000) if is_v else "")
         _cell(ws, row, 8, _rnd(t / 1000) if not is_v else "")
@@ -657,23 +705,9 @@ def _build_boshqa_xarajatlar_sheet(wb: Workbook, d: dict) -> None:
     _cell(ws, row, 7, _rnd(oe_vaz / 1000), bold=True)
     _cell(ws, row, 8, _rnd(oe_tash / 1000), bold=True)
 
-    for c_letter, w in [
-        ("A", 5),
-        ("B", 45),
-        ("C", 12),
-        ("D", 10),
-        ("E", 12),
-        ("F", 12),
-        ("G", 18),
-        ("H", 18),
-    ]:
-        ws.column_dimensions[c_letter].width = w
-
-
-def _build_tannarx_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Tannarx' (cost price) sheet."""
-    ws = wb.create_sheet("Tannarx")
 
+def _layout_tannarx_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Tannarx' (cost price) sheet."""
     ws.merge_cells("A1:C1")
     ws["A1"].value = (
         "Mahsulot (ishlar, xizmatlar)ning ishlab chiqarish tannarxiga "
@@ -691,6 +725,14 @@ def _build_tannarx_sheet(wb: Workbook, d: dict) -> None:
     for i, h in enumerate(["N", "Xarajatlar nomi", "Summasi\n(ming so'mda)"], 1):
         _header_style(ws, 5, i, h)
 
+    ws.column_dimensions["A"].width = 12
+    ws.column_dimensions["B"].width = 55
+    ws.column_dimensions["C"].width = 18
+
+
+def _build_tannarx_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Tannarx' (cost price) sheet."""
+    ws = wb["Tannarx"]
     prod_social = d["prod_total"] * float(SOCIAL_TAX_RATE)
     items = [
         ("Ishlab chiqarish xodimlarining ish haqi", d["prod_total"]),
@@ -735,14 +777,9 @@ def _build_tannarx_sheet(wb: Workbook, d: dict) -> None:
         ws.cell(row, 3, _rnd(unit_cost / 1000)).font = _BOLD_FONT
         row += 1
 
-    ws.column_dimensions["A"].width = 12
-    ws.column_dimensions["B"].width = 55
-    ws.column_dimensions["C"].width = 18
-
 
-def _build_davr_xarajatlari_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Davr xarajatlari' sheet."""
-    ws = wb.create_sheet("Davr xarajatlari")
+def _layout_davr_xarajatlari_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Davr xarajatlari' sheet."""
     ws.merge_cells("A1:C1")
     ws["A1"].value = "DAVR XARAJATLARI"
     ws["A1"].font = _TITLE_FONT
@@ -755,6 +792,14 @@ def _build_davr_xarajatlari_sheet(wb: Workbook, d: dict) -> None:
     for i, h in enumerate(["N", "Xarajatlar nomi", "Summasi"], 1):
         _header_style(ws, 4, i, h)
 
+    ws.column_dimensions["A"].width = 8
+    ws.column_dimensions["B"].width = 50
+    ws.column_dimensions["C"].width = 18
+
+
+def _build_davr_xarajatlari_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Davr xarajatlari' sheet."""
+    ws = wb["Davr xarajatlari"]
     row = 5
     for idx, exp in enumerate(d["davr"], 1):
         _cell(ws, row, 1, idx)
@@ -767,14 +812,9 @@ def _build_davr_xarajatlari_sheet(wb: Workbook, d: dict) -> None:
     ws.cell(row, 1).alignment = _RIGHT
     _cell(ws, row, 3, _rnd(d["davr_total"]), bold=True)
 
-    ws.column_dimensions["A"].width = 8
-    ws.column_dimensions["B"].width = 50
-    ws.column_dimensions["C"].width = 18
-
 
-def _build_sotish_rejasi_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Sotish rejasi' sheet."""
-    ws = wb.create_sheet("Sotish rejasi")
+def _layout_sotish_rejasi_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Sotish rejasi' sheet."""
     ws.merge_cells("A1:F1")
     ws["A1"].value = "SOTISH REJASI"
     ws["A1"].font = _TITLE_FONT
@@ -784,6 +824,20 @@ def _build_sotish_rejasi_sheet(wb: Workbook, d: dict) -> None:
     ws["A2"].value = "(ming so'mda)"
     ws["A2"].alignment = _CENTER
 
+    for c_letter, w in [
+        ("A", 6),
+        ("B", 35),
+        ("C", 12),
+        ("D", 12),
+        ("E", 15),
+        ("F", 18),
+    ]:
+        ws.column_dimensions[c_letter].width = w
+
+
+def _build_sotish_rejasi_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Sotish rejasi' sheet."""
+    ws = wb["Sotish rejasi"]
     row = 4
     grand_rev = 0.0
 
@@ -836,34 +890,36 @@ def _build_sotish_rejasi_sheet(wb: Workbook, d: dict) -> None:
     c.fill = _HEADER_FILL
     c.border = _BORDER
 
-    for c_letter, w in [
-        ("A", 6),
-        ("B", 35),
-        ("C", 12),
-        ("D", 12),
-        ("E", 15),
-        ("F", 18),
-    ]:
-        ws.column_dimensions[c_letter].width = w
 
+def _layout_moliyaviy_xisobot_sheet(ws: Any) -> None:
+    """Lay out the static parts of the 'Moliyaviy xisobot' sheet.
 
-def _build_moliyaviy_xisobot_sheet(wb: Workbook, d: dict) -> None:
-    """Build the 'Moliyaviy xisobot' sheet."""
-    ws = wb.create_sheet("Moliyaviy xisobot")
-    py = d["project_years"]
-    last_col = py + 2
-
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=last_col)
+    The title rows are merged across the year columns at fill time,
+    since their width depends on the project duration.
+    """
     ws["A1"].value = "MOLIYAVIY XISOBOT (FOYDA-ZARAR)"
     ws["A1"].font = _TITLE_FONT
     ws["A1"].alignment = _CENTER
 
-    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=last_col)
     ws["A2"].value = "(ming so'mda)"
     ws["A2"].alignment = _CENTER
 
     _header_style(ws, 4, 1, "N")
     _header_style(ws, 4, 2, "Ko'rsatkichlar")
+
+    ws.column_dimensions["A"].width = 6
+    ws.column_dimensions["B"].width = 35
+
+
+def _build_moliyaviy_xisobot_sheet(wb: Workbook, d: dict) -> None:
+    """Fill the 'Moliyaviy xisobot' sheet."""
+    ws = wb["Moliyaviy xisobot"]
+    py = d["project_years"]
+    last_col = py + 2
+
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=last_col)
+    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=last_col)
+
     for i in range(1, py + 1):
         _header_style(ws, 4, i + 2, f"{i}-yil")
 
@@ -952,47 +1008,370 @@ def _build_moliyaviy_xisobot_sheet(wb: Workbook, d: dict) -> None:
     )
     c.border = _BORDER
 
-    ws.column_dimensions["A"].width = 6
-    ws.column_dimensions["B"].width = 35
     for i in range(1, py + 1):
         ws.column_dimensions[get_column_letter(i + 2)].width = 15
 
 
+# ------------------------------------------------------------------
+# Template workbook
+# ------------------------------------------------------------------
+_SHEET_LAYOUTS = [
+    ("Jami", _layout_jami_sheet),
+    ("Ish haqi", _layout_ish_haqi_sheet),
+    ("Inventar", _layout_inventar_sheet),
+    ("Xom ashyo", _layout_xom_ashyo_sheet),
+    ("Boshqa xar.", _layout_boshqa_xarajatlar_sheet),
+    ("Tannarx", _layout_tannarx_sheet),
+    ("Davr xarajatlari", _layout_davr_xarajatlari_sheet),
+    ("Sotish rejasi", _layout_sotish_rejasi_sheet),
+    ("Moliyaviy xisobot", _layout_moliyaviy_xisobot_sheet),
+]
+
+_STYLE_TABLES = (
+    "_fonts",
+    "_fills",
+    "_borders",
+    "_alignments",
+    "_protections",
+    "_number_formats",
+    "_cell_styles",
+)
+
+
+def build_template_workbook() -> Workbook:
+    """Build the static layout (titles, headers, widths) of all sheets.
+
+    Returns:
+        A workbook with every sheet laid out and no smeta data.
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+    for title, layout in _SHEET_LAYOUTS:
+        layout(wb.create_sheet(title))
+    return wb
+
+
+@functools.cache
+def get_template_workbook() -> Workbook:
+    """Return the per-process template workbook, parsing it on first use.
+
+    Loads ``settings.SMETA_EXCEL_TEMPLATE`` when it exists and has all
+    sheets, otherwise lays the template out from code.
+
+    Returns:
+        The cached template. Callers must clone it, never mutate it.
+    """
+    path = Path(settings.SMETA_EXCEL_TEMPLATE)
+    if path.exists():
+        wb = load_workbook(path)
+        if wb.sheetnames == [title for title, _ in _SHEET_LAYOUTS]:
+            logger.info("Excel shablon yuklandi: %s", path)
+            return wb
+        logger.warning("Excel shablon varaqlari mos emas: %s", path)
+    return build_template_workbook()
+
+
+def _copy_merged_range(ws: Any, src: MergedCellRange) -> MergedCellRange:
+    """Copy a merged range onto ``ws`` whose cells are already in place.
+
+    ``MergedCellRange.__init__`` re-derives the start cell's border,
+    which the copied style array already carries.
+    """
+    merged = MergedCellRange.__new__(MergedCellRange)
+    CellRange.__init__(merged, range_string=src.coord)
+    merged.ws = ws
+    merged.start_cell = ws._cells[(merged.min_row, merged.min_col)]
+    return merged
+
+
+def _clone_workbook(template: Workbook) -> Workbook:
+    """Copy a template workbook cell by cell.
+
+    Cells take the template's already-indexed style arrays, so no
+    style objects are re-hashed; this is much cheaper than laying the
+    sheets out again or deep-copying the workbook. The copy relies on
+    openpyxl internals (pinned to 3.1.x); if they change, the template
+    is round-tripped through ``load_workbook`` instead.
+
+    Args:
+        template: The workbook to copy.
+
+    Returns:
+        An independent workbook with the same cells, styles, merges
+        and row/column dimensions.
+    """
+    try:
+        return _copy_workbook(template)
+    except AttributeError:
+        logger.warning("Excel shablonini tez nusxalab bo'lmadi", exc_info=True)
+    buf = BytesIO()
+    template.save(buf)
+    return load_workbook(buf)
+
+
+def _copy_workbook(template: Workbook) -> Workbook:
+    """Fast path of :func:`_clone_workbook`, built on openpyxl internals."""
+    wb = Workbook()
+    wb.remove(wb.active)
+    for attr in _STYLE_TABLES:
+        setattr(wb, attr, IndexedList(getattr(template, attr)))
+
+    for src in template.worksheets:
+        ws = wb.create_sheet(src.title)
+        for key, cell in src._cells.items():
+            if isinstance(cell, MergedCell):
+                new = MergedCell(ws, row=cell.row, column=cell.column)
+            else:
+                new = Cell(ws, row=cell.row, column=cell.column)
+                new._value = cell._value
+                new.data_type = cell.data_type
+            new._style = copy.copy(cell._style)
+            ws._cells[key] = new
+        # Read by iter_rows() and append().
+        ws._current_row = src._current_row
+        for merged in src.merged_cells.ranges:
+            ws.merged_cells.add(_copy_merged_range(ws, merged))
+        for letter, dim in src.column_dimensions.items():
+            if dim.width:
+                ws.column_dimensions[letter].width = dim.width
+        for idx, dim in src.row_dimensions.items():
+            if dim.ht:
+                ws.row_dimensions[idx].height = dim.ht
+    return wb
+
+
+# ------------------------------------------------------------------
+# Portfolio (many smetalar in one sheet)
+# ------------------------------------------------------------------
+_PORTFOLIO_CATEGORIES = [
+    ("Ish haqi fondi", "salary"),
+    ("Ijtimoiy soliq", "social"),
+    ("Xomashyo va materiallar", "raw_materials"),
+    ("Asbob-uskuna va jihozlar", "inventory"),
+    ("Boshqa xarajatlar", "other_expenses"),
+]
+
+
+def _portfolio_row(totals: dict[str, float]) -> list[tuple[float, float]]:
+    """Return (vazirlik, tashkilot) pairs in Jami sheet category order."""
+    st = float(SOCIAL_TAX_RATE)
+    pairs = []
+    for _, key in _PORTFOLIO_CATEGORIES:
+        if key == "social":
+            pairs.append(
+                (
+                    totals["salary_vazirlik"] * st,
+                    totals["salary_tashkilot"] * st,
+                )
+            )
+        else:
+            pairs.append((totals[f"{key}_vazirlik"], totals[f"{key}_tashkilot"]))
+    return pairs
+
+
+def build_portfolio_workbook(
+    smetalar: list[XarajatlarSmetasi],
+    totals: dict[int, dict[str, float]],
+) -> Workbook:
+    """Build a one-sheet workbook with one summary row per smeta.
+
+    Args:
+        smetalar: Smetalar to list, in display order.
+        totals: Output of ``get_portfolio_totals`` for those smetalar.
+
+    Returns:
+        The populated openpyxl Workbook.
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Portfel"
+    last_col = 4 + 2 * len(_PORTFOLIO_CATEGORIES) + 3
+
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=last_col)
+    ws["A1"].value = "XARAJATLAR SMETALARI PORTFELI"
+    ws["A1"].font = _TITLE_FONT
+    ws["A1"].alignment = _CENTER
+
+    ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=last_col)
+    ws["A2"].value = "(ming so'mda)"
+    ws["A2"].alignment = _CENTER
+
+    for i, h in enumerate(["N", "Loyiha", "Tashkilot", "Holati"], 1):
+        ws.merge_cells(start_row=4, start_column=i, end_row=5, end_column=i)
+        _header_style(ws, 4, i, h)
+    col = 5
+    for label, _ in [*_PORTFOLIO_CATEGORIES, ("Jami", "")]:
+        ws.merge_cells(start_row=4, start_column=col, end_row=4, end_column=col + 1)
+        _header_style(ws, 4, col, label)
+        _header_style(ws, 5, col, "Vazirlik")
+        _header_style(ws, 5, col + 1, "Tashkilot")
+        col += 2
+    ws.merge_cells(start_row=4, start_column=col, end_row=5, end_column=col)
+    _header_style(ws, 4, col, "Summa")
+    ws.row_dimensions[4].height = 30
+
+    grand = [[0.0, 0.0] for _ in _PORTFOLIO_CATEGORIES]
+    row = 6
+    for idx, smeta in enumerate(smetalar, 1):
+        pairs = _portfolio_row(totals[smeta.pk])
+        _cell(ws, row, 1, idx)
+        _cell(ws, row, 2, smeta.project_name, align="left")
+        _cell(ws, row, 3, smeta.organization_name, align="left")
+        _cell(ws, row, 4, smeta.get_status_display())
+        col = 5
+        for i, (vaz, tash) in enumerate(pairs):
+            _cell(ws, row, col, _rnd(vaz / 1000))
+            _cell(ws, row, col + 1, _rnd(tash / 1000))
+            grand[i][0] += vaz
+            grand[i][1] += tash
+            col += 2
+        t_vaz = sum(v for v, _ in pairs)
+        t_tash = sum(t for _, t in pairs)
+        _cell(ws, row, col, _rnd(t_vaz / 1000), bold=True)
+        _cell(ws, row, col + 1, _rnd(t_tash / 1000), bold=True)
+        _cell(ws, row, col + 2, _rnd((t_vaz + t_tash) / 1000), bold=True)
+        row += 1
+
+    ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=4)
+    ws.cell(row, 1, "Portfel bo'yicha jami:").font = _BOLD_FONT
+    ws.cell(row, 1).alignment = _RIGHT
+    col = 5
+    for vaz, tash in grand:
+        _cell(ws, row, col, _rnd(vaz / 1000), bold=True)
+        _cell(ws, row, col + 1, _rnd(tash / 1000), bold=True)
+        col += 2
+    g_vaz = sum(v for v, _ in grand)
+    g_tash = sum(t for _, t in grand)
+    _cell(ws, row, col, _rnd(g_vaz / 1000), bold=True)
+    _cell(ws, row, col + 1, _rnd(g_tash / 1000), bold=True)
+    _cell(ws, row, col + 2, _rnd((g_vaz + g_tash) / 1000), bold=True)
+
+    ws.column_dimensions["A"].width = 5
+    ws.column_dimensions["B"].width = 35
+    ws.column_dimensions["C"].width = 25
+    ws.column_dimensions["D"].width = 14
+    for i in range(5, last_col + 1):
+        ws.column_dimensions[get_column_letter(i)].width = 14
+    return wb
+
+
 # ------------------------------------------------------------------
 # Public API
 # ------------------------------------------------------------------
-def generate_smeta_excel(smeta: XarajatlarSmetasi) -> str:
-    """Generate an Excel workbook for the given smeta and save it.
+_SHEET_BUILDERS = [
+    _build_jami_sheet,
+    _build_ish_haqi_sheet,
+    _build_inventar_sheet,
+    _build_xom_ashyo_sheet,
+    _build_boshqa_xarajatlar_sheet,
+    _build_tannarx_sheet,
+    _build_davr_xarajatlari_sheet,
+    _build_sotish_rejasi_sheet,
+    _build_moliyaviy_xisobot_sheet,
+]
+
+
+def build_smeta_workbook(
+    smeta: XarajatlarSmetasi,
+    progress: ProgressCallback | None = None,
+) -> Workbook:
+    """Build the full multi-sheet workbook for a smeta in memory.
 
     Args:
         smeta: The XarajatlarSmetasi instance.
+        progress: Optional callback told after each finished sheet.
 
     Returns:
-        The relative file path of the saved Excel file.
+        The populated openpyxl Workbook.
     """
     d = _gather_smeta_data(smeta)
 
-    wb = Workbook()
-    _build_jami_sheet(wb, d)
-    _build_ish_haqi_sheet(wb, d)
-    _build_inventar_sheet(wb, d)
-    _build_xom_ashyo_sheet(wb, d)
-    _build_boshqa_xarajatlar_sheet(wb, d)
-    _build_tannarx_sheet(wb, d)
-    _build_davr_xarajatlari_sheet(wb, d)
-    _build_sotish_rejasi_sheet(wb, d)
-    _build_moliyaviy_xisobot_sheet(wb, d)
+    wb = _clone_workbook(get_template_workbook())
+    # Read back by the importer; the title cell joins both with " - ".
+    wb.properties.title = smeta.project_name
+    wb.properties.subject = smeta.organization_name
+    total = len(_SHEET_BUILDERS)
+    for step, build in enumerate(_SHEET_BUILDERS, 1):
+        build(wb, d)
+        if progress:
+            progress(f"{step}/{total} varaq tayyorlandi", step, total)
+    return wb
 
+
+def render_smeta_excel(
+    smeta: XarajatlarSmetasi,
+    progress: ProgressCallback | None = None,
+) -> bytes:
+    """Render the smeta workbook to ``.xlsx`` bytes without saving it.
+
+    Args:
+        smeta: The XarajatlarSmetasi instance.
+        progress: Optional callback, see :func:`build_smeta_workbook`.
+
+    Returns:
+        The serialized workbook.
+    """
     buf = BytesIO()
-    wb.save(buf)
-    buf.seek(0)
+    build_smeta_workbook(smeta, progress).save(buf)
+    return buf.getvalue()
 
-    safe_name = (
-        smeta.project_name.replace("/", "_").replace("\\", "_").replace(":", "_")[:120]
-        or "Xarajatlar_smetasi"
-    )
-    filename = f"{safe_name}.xlsx"
 
-    smeta.excel_file.save(filename, ContentFile(buf.read()), save=True)
-    logger.info("Excel fayl yaratildi: smeta_id=%d", smeta.pk)
+def generate_smeta_excel(
+    smeta: XarajatlarSmetasi,
+    progress: ProgressCallback | None = None,
+) -> str:
+    """Generate an Excel workbook for the given smeta and save it.
+
+    The file is recorded against ``smeta.version`` with a plain
+    ``UPDATE`` so that ``updated_at`` is left alone and an older build
+    never replaces a newer one.
+
+    Args:
+        smeta: The XarajatlarSmetasi instance.
+        progress: Optional callback, see :func:`build_smeta_workbook`.
+
+    Returns:
+        The relative file path of the saved Excel file.
+    """
+    version = smeta.version
+    # Spool to disk so the storage streams it in chunks (multipart
+    # upload on S3) instead of holding the whole workbook in memory.
+    with tempfile.NamedTemporaryFile(suffix=".xlsx") as tmp:
+        build_smeta_workbook(smeta, progress).save(tmp)
+        tmp.seek(0)
+        if progress:
+            progress("Fayl saqlanmoqda", None, None)
+        smeta.excel_file.save(
+            excel_filename(smeta),
+            File(tmp, name=excel_filename(smeta)),
+            save=False,
+        )
+    updated = XarajatlarSmetasi.objects.filter(
+        pk=smeta.pk,
+        excel_version__lt=version,
+    ).update(excel_file=smeta.excel_file.name, excel_version=version)
+    if not updated:
+        smeta.excel_file.delete(save=False)
+        smeta.refresh_from_db(fields=["excel_file", "excel_version"])
+        return smeta.excel_file.url
+    smeta.excel_version = version
+    logger.info("Excel fayl yaratildi: smeta_id=%d v%d", smeta.pk, version)
     return smeta.excel_file.url
+
+
+def render_portfolio_excel(smetalar: list[XarajatlarSmetasi]) -> bytes:
+    """Render the portfolio workbook for the given smetalar.
+
+    Totals come from grouped aggregate queries, not from loading each
+    smeta's line items.
+
+    Args:
+        smetalar: Smetalar to include, in display order.
+
+    Returns:
+        The serialized workbook.
+    """
+    totals = get_portfolio_totals(s.pk for s in smetalar)
+    buf = BytesIO()
+    build_portfolio_workbook(smetalar, totals).save(buf)
+    return buf.getvalue()
@@ -0,0 +1,78 @@
+"""Scheduling of single-smeta Excel exports.
+
+Exports are coalesced per smeta version: the first request for a
+version takes a cache lock and dispatches ``generate_excel_task`` as a
+background job; concurrent requests for the same version get the
+in-flight job id instead of scheduling another build.
+"""
+
+import logging
+import uuid
+from typing import Any
+
+from django.conf import settings
+
+from config.cache import cache_add, cache_delete, cache_get
+from jobs.services.dispatch_service import dispatch
+from smetalar.models import XarajatlarSmetasi
+
+logger = logging.getLogger(__name__)
+
+
+def export_lock_key(smeta_id: int, version: int) -> str:
+    """Return the cache key guarding the export of one smeta version."""
+    return f"smeta-excel:{smeta_id}:{version}"
+
+
+def _is_ready(smeta: XarajatlarSmetasi) -> bool:
+    return bool(smeta.excel_file) and smeta.excel_version >= smeta.version
+
+
+def request_smeta_excel(smeta: XarajatlarSmetasi) -> dict[str, Any]:
+    """Return the current Excel export or schedule one.
+
+    Args:
+        smeta: The XarajatlarSmetasi to export.
+
+    Returns:
+        ``{"status": "ready", "excel_file": FieldFile}`` when the file
+        for the current version exists, otherwise
+        ``{"status": "pending", "job_id": str}``.
+    """
+    if _is_ready(smeta):
+        return {"status": "ready", "excel_file": smeta.excel_file}
+
+    from smetalar.tasks.excel_tasks import generate_excel_task
+
+    key = export_lock_key(smeta.pk, smeta.version)
+    job_id = uuid.uuid4()
+    # Without a working cache the export is scheduled unlocked; at
+    # worst a concurrent request builds the same version twice.
+    if cache_add(key, str(job_id), settings.SMETA_EXPORT_LOCK_TTL) is False:
+        # Another request already scheduled this version; join it.
+        logger.info(
+            "Excel eksport navbatda: smeta_id=%d v%d",
+            smeta.pk,
+            smeta.version,
+        )
+        return {"status": "pending", "job_id": cache_get(key) or str(job_id)}
+
+    try:
+        job = dispatch(
+            generate_excel_task,
+            smeta.pk,
+            smeta.version,
+            user=smeta.user,
+            job_id=job_id,
+        )
+    except Exception:
+        # Otherwise requests would join a job that never existed until
+        # the lock expires.
+        cache_delete(key)
+        raise
+
+    # With the inline backend the build has already finished.
+    smeta.refresh_from_db(fields=["excel_file", "excel_version", "version"])
+    if _is_ready(smeta):
+        return {"status": "ready", "excel_file": smeta.excel_file}
+    return {"status": "pending", "job_id": str(job.pk)}
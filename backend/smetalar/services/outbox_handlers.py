@@ -0,0 +1,34 @@
+"""Post-commit follow-up work for smeta events (see jobs outbox)."""
+
+import logging
+from typing import Any
+
+from jobs.services.outbox_service import outbox_handler
+from smetalar.models import SmetaStatus, XarajatlarSmetasi
+from smetalar.services.export_service import request_smeta_excel
+
+logger = logging.getLogger(__name__)
+
+SMETA_COMPLETED = "smeta.completed"
+
+
+def smeta_completed_key(smeta: XarajatlarSmetasi) -> str:
+    """Return the outbox key of a smeta version's completion."""
+    return f"{SMETA_COMPLETED}:{smeta.pk}:{smeta.version}"
+
+
+@outbox_handler(SMETA_COMPLETED)
+def pregenerate_excel(payload: dict[str, Any]) -> None:
+    """Build the Excel export of a completed smeta ahead of the download.
+
+    Args:
+        payload: ``{"smeta_id": int, "version": int}``.
+    """
+    smeta = XarajatlarSmetasi.objects.filter(pk=payload["smeta_id"]).first()
+    if smeta is None or smeta.status != SmetaStatus.COMPLETED:
+        return
+    if smeta.version != payload["version"]:
+        # Edited since; the newer version has its own event if needed.
+        logger.info("Eskirgan smeta hodisasi o'tkazib yuborildi: %d", smeta.pk)
+        return
+    request_smeta_excel(smeta)
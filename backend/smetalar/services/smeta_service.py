@@ -5,7 +5,9 @@ from decimal import Decimal
 from typing import Any
 
 from django.db import transaction
+from django.db.models import F
 
+from jobs.services.outbox_service import publish_outbox_event
 from smetalar.models import (
     DavrXarajat,
     Employee,
@@ -13,10 +15,12 @@ from smetalar.models import (
     OtherExpense,
     Product,
     RawMaterial,
+    SmetaStatus,
     SotishMahsulot,
     SotishRejasiYil,
     XarajatlarSmetasi,
 )
+from smetalar.services.outbox_handlers import SMETA_COMPLETED, smeta_completed_key
 
 logger = logging.getLogger(__name__)
 
@@ -82,9 +86,20 @@ def create_smeta(
         status=data.get("status", "draft"),
     )
     _create_nested_items(smeta, data)
+    if smeta.status == SmetaStatus.COMPLETED:
+        _publish_completed(smeta)
     return smeta
 
 
+_PROJECT_FIELDS = (
+    "project_name",
+    "organization_name",
+    "project_description",
+    "project_duration_years",
+    "status",
+)
+
+
 @transaction.atomic
 def update_smeta(
     smeta: XarajatlarSmetasi,
@@ -101,17 +116,18 @@ def update_smeta(
     Returns:
         The updated XarajatlarSmetasi instance.
     """
-    if "project_name" in data:
-        smeta.project_name = data["project_name"]
-    if "organization_name" in data:
-        smeta.organization_name = data["organization_name"]
-    if "project_description" in data:
-        smeta.project_description = data["project_description"]
-    if "project_duration_years" in data:
-        smeta.project_duration_years = data["project_duration_years"]
-    if "status" in data:
-        smeta.status = data["status"]
-    smeta.save()
+    was_completed = smeta.status == SmetaStatus.COMPLETED
+    # Only the fields being edited are written: a full save() would
+    # overwrite concurrent changes, such as the export task recording
+    # excel_file/excel_version with a plain UPDATE.
+    fields = [field for field in _PROJECT_FIELDS if field in data]
+    for field in fields:
+        setattr(smeta, field, data[field])
+    # Incremented in the database so concurrent updates get distinct
+    # versions (the Excel cache and outbox payloads are keyed by it).
+    smeta.version = F("version") + 1
+    smeta.save(update_fields=[*fields, "version", "updated_at"])
+    smeta.refresh_from_db(fields=["version"])
 
     # Delete and recreate nested items for sections present in data
     if "salary" in data:
@@ -130,9 +146,20 @@ def update_smeta(
         smeta.sotish_rejasi_yillari.all().delete()
 
     _create_nested_items(smeta, data)
+    if smeta.status == SmetaStatus.COMPLETED and not was_completed:
+        _publish_completed(smeta)
     return smeta
 
 
+def _publish_completed(smeta: XarajatlarSmetasi) -> None:
+    """Queue post-commit work for a smeta that became completed."""
+    publish_outbox_event(
+        SMETA_COMPLETED,
+        key=smeta_completed_key(smeta),
+        payload={"smeta_id": smeta.pk, "version": smeta.version},
+    )
+
+
 def _create_nested_items(
     smeta: XarajatlarSmetasi,
     data: dict[str, Any],
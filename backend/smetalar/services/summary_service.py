@@ -0,0 +1,105 @@
+"""Per-user dashboard summary of smetalar.
+
+The summary is computed from grouped aggregates (see
+``get_user_expense_totals``), never by loading line items, and cached
+per user under a version token. Any change to one of the user's
+smetalar replaces the token (``smetalar.signals``), so the next request
+recomputes instead of serving a stale summary.
+"""
+
+import time
+from typing import Any
+
+from django.conf import settings
+
+from config.cache import REPORT, cache_add, cache_get, cache_set, memoize
+from smetalar.models import FinancingSource, SmetaStatus, XarajatlarSmetasi
+from smetalar.selectors.smeta_selector import (
+    get_user_expense_totals,
+    get_user_status_counts,
+)
+from smetalar.services.smeta_service import SOCIAL_TAX_RATE
+
+RECENT_LIMIT = 5
+
+
+def _version_key(user_id: int) -> str:
+    return REPORT.key("summary-version", user_id)
+
+
+def summary_version(user_id: int) -> int | None:
+    """Return the user's current summary version token.
+
+    None if the cache is unavailable; the summary is then computed
+    without caching, since invalidations may have been lost.
+    """
+    key = _version_key(user_id)
+    version = cache_get(key)
+    if version is None:
+        version = time.time_ns()
+        # add() so concurrent first requests agree on one token.
+        added = cache_add(key, version, None)
+        if added is None:
+            return None
+        if not added:
+            version = cache_get(key)
+    return version
+
+
+def bump_summary_version(user_id: int) -> None:
+    """Invalidate the user's cached summary."""
+    cache_set(_version_key(user_id), time.time_ns(), None)
+
+
+@memoize(REPORT, ttl=lambda: settings.SMETA_SUMMARY_CACHE_TTL)
+def _build_summary(user_id: int, version: int) -> dict[str, Any]:
+    counts = get_user_status_counts(user_id)
+    by_category = {
+        "salary": 0.0,
+        "social_tax": 0.0,
+        "inventory": 0.0,
+        "raw_materials": 0.0,
+        "other_expenses": 0.0,
+    }
+    funding = {source: 0.0 for source in FinancingSource.values}
+    for category, source, total in get_user_expense_totals(user_id):
+        if category == "salary":
+            social_tax = total * float(SOCIAL_TAX_RATE)
+            by_category["social_tax"] += social_tax
+            funding[source] += social_tax
+        by_category[category] += total
+        funding[source] += total
+
+    recent = list(
+        XarajatlarSmetasi.objects.filter(user_id=user_id)
+        .order_by("-updated_at")
+        .values("id", "project_name", "status", "updated_at")[:RECENT_LIMIT]
+    )
+    return {
+        "counts": {
+            "total": sum(counts.values()),
+            **{status: counts.get(status, 0) for status in SmetaStatus.values},
+        },
+        "planned_total": sum(by_category.values()),
+        "by_category": by_category,
+        "funding": funding,
+        "recent": recent,
+    }
+
+
+def get_user_summary(user_id: int) -> dict[str, Any]:
+    """Dashboard summary of all of a user's smetalar.
+
+    Args:
+        user_id: The owner's primary key.
+
+    Returns:
+        ``counts`` per status (and ``total``), ``planned_total`` and its
+        split ``by_category`` and per financing source (``funding``),
+        all in so'm, plus the most recently edited smetalar
+        (``recent``).
+    """
+    version = summary_version(user_id)
+    if version is None:
+        return _build_summary.__wrapped__(user_id, 0)
+    return _build_summary(user_id, version)
@@ -0,0 +1,43 @@
+"""Keep derived per-user smeta data in step with smeta changes."""
+
+from typing import Any
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from smetalar.models import SmetaTombstone, XarajatlarSmetasi
+from smetalar.services.summary_service import bump_summary_version
+
+
+@receiver(post_save, sender=XarajatlarSmetasi)
+@receiver(post_delete, sender=XarajatlarSmetasi)
+def invalidate_summary(sender: Any, instance: XarajatlarSmetasi, **kwargs: Any) -> None:
+    """Bump the owner's summary version now and again once committed.
+
+    Line items are written after the smeta row in the same transaction
+    (``smeta_service``); the second bump drops a summary computed from
+    the half-written state in between.
+    """
+    user_id = instance.user_id
+    bump_summary_version(user_id)
+    transaction.on_commit(lambda: bump_summary_version(user_id))
+
+
+@receiver(post_delete, sender=XarajatlarSmetasi)
+def record_tombstone(
+    sender: Any,
+    instance: XarajatlarSmetasi,
+    origin: Any = None,
+    **kwargs: Any,
+) -> None:
+    """Record the deletion for delta sync clients (``changes``).
+
+    Skipped when the smeta goes with its deleted owner: nobody is left
+    to sync, and the tombstone would reference the deleted user.
+    """
+    if isinstance(origin, XarajatlarSmetasi) or (
+        isinstance(origin, QuerySet) and origin.model is XarajatlarSmetasi
+    ):
+        SmetaTombstone.objects.create(user_id=instance.user_id, smeta_id=instance.pk)
@@ -0,0 +1,6 @@
+"""Celery tasks for smetalar app."""
+
+from smetalar.tasks.excel_tasks import generate_excel_task, import_smeta_task
+from smetalar.tasks.maintenance_tasks import gc_excel_files_task
+
+__all__ = ["gc_excel_files_task", "generate_excel_task", "import_smeta_task"]
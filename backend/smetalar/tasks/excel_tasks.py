@@ -2,43 +2,131 @@
 
 import logging
 
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init
+
 from config.celery import app
 
 logger = logging.getLogger(__name__)
 
 
+@worker_process_init.connect
+def warm_excel_template(**kwargs: object) -> None:
+    """Parse the Excel template once when a worker process starts."""
+    from smetalar.services.excel_service import get_template_workbook
+
+    get_template_workbook()
+
+
 @app.task(
     bind=True,
     max_retries=3,
     default_retry_delay=10,
+    soft_time_limit=100,
     time_limit=120,
 )
-def generate_excel_task(self, smeta_id: int) -> str:  # type: ignore[override]
+def generate_excel_task(  # type: ignore[override]
+    self,
+    smeta_id: int,
+    version: int | None = None,
+) -> str:
     """Generate Excel file for a smeta asynchronously.
 
+    Builds are skipped when the requested ``version`` is already
+    outdated or already has a file, so at most one workbook is built
+    per smeta version.
+
     Args:
         self: Celery task instance.
         smeta_id: Primary key of the XarajatlarSmetasi.
+        version: Smeta version the export was requested for.
 
     Returns:
         URL path of the generated Excel file.
 
     Raises:
+        SoftTimeLimitExceeded: The build ran out of time; not retried.
         Exception: Re-raised for Celery retry mechanism.
     """
+    from config.cache import cache_delete
+    from jobs.services.progress_service import report_progress
     from smetalar.models import XarajatlarSmetasi
     from smetalar.services.excel_service import generate_smeta_excel
+    from smetalar.services.export_service import export_lock_key
 
     try:
         smeta = XarajatlarSmetasi.objects.get(pk=smeta_id)
-        return generate_smeta_excel(smeta)
+        if version is not None and (
+            smeta.version != version or smeta.excel_version >= version
+        ):
+            logger.info(
+                "Excel eksport o'tkazib yuborildi: smeta_id=%d v%d",
+                smeta_id,
+                version,
+            )
+            return smeta.excel_file.url if smeta.excel_file else ""
+        return generate_smeta_excel(smeta, progress=report_progress)
     except XarajatlarSmetasi.DoesNotExist:
         logger.error("Smeta topilmadi: id=%d", smeta_id)
         return ""
+    except SoftTimeLimitExceeded:
+        # A retry would hit the same limit; free the lock instead.
+        logger.error("Excel yaratish vaqti tugadi: smeta_id=%d", smeta_id)
+        if version is not None:
+            cache_delete(export_lock_key(smeta_id, version))
+        raise
     except Exception as exc:
         logger.error(
             "Excel yaratishda xatolik: smeta_id=%d",
             smeta_id,
             exc_info=True,
         )
+        final = self.request.called_directly or (
+            self.request.retries >= self.max_retries
+        )
+        if version is not None and final:
+            # Let the next request schedule a fresh attempt.
+            cache_delete(export_lock_key(smeta_id, version))
         raise self.retry(exc=exc)
+
+
+@app.task(soft_time_limit=540, time_limit=600)
+def import_smeta_task(user_id: int, path: str) -> int | None:
+    """Create a smeta from an uploaded workbook stored in default storage.
+
+    The stored upload is removed afterwards whatever the outcome.
+
+    Args:
+        user_id: Owner of the new smeta.
+        path: Storage path of the uploaded ``.xlsx``.
+
+    Returns:
+        Primary key of the created smeta, or None if the file was
+        rejected.
+    """
+    from django.contrib.auth import get_user_model
+    from django.core.files.storage import default_storage
+    from rest_framework.exceptions import ValidationError
+
+    from jobs.services.progress_service import report_progress
+    from smetalar.api.serializers.input import SmetaCreateSerializer
+    from smetalar.services.excel_import_service import (
+        SmetaImportError,
+        parse_smeta_workbook,
+    )
+    from smetalar.services.smeta_service import create_smeta
+
+    try:
+        user = get_user_model().objects.get(pk=user_id)
+        report_progress("Fayl o'qilmoqda")
+        with default_storage.open(path, "rb") as fh:
+            data = parse_smeta_workbook(fh)
+        serializer = SmetaCreateSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        report_progress("Smeta yaratilmoqda")
+        return create_smeta(user=user, data=serializer.validated_data).pk
+    except (SmetaImportError, ValidationError):
+        logger.warning("Excel import rad etildi: %s", path, exc_info=True)
+        return None
+    finally:
+        default_storage.delete(path)
@@ -0,0 +1,29 @@
+"""Periodic maintenance tasks for smetalar app (Celery beat)."""
+
+from typing import Any
+
+from config.celery import app
+
+
+@app.task
+def gc_excel_files_task() -> dict[str, Any]:
+    """Remove stale generated Excel files from storage.
+
+    Returns:
+        The garbage collection report, including ``bytes_reclaimed``.
+    """
+    from smetalar.services.excel_gc_service import collect_excel_garbage
+
+    return collect_excel_garbage()
+
+
+@app.task
+def purge_smeta_tombstones_task() -> int:
+    """Delete smeta tombstones past their retention period.
+
+    Returns:
+        Number of deleted tombstones.
+    """
+    from smetalar.services.changes_service import purge_tombstones
+
+    return purge_tombstones()
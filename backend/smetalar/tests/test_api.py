@@ -4,7 +4,9 @@ import pytest
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
+from smetalar.api.serializers.output import SmetaSummarySerializer
 from smetalar.models import XarajatlarSmetasi
 
 User = get_user_model()
@@ -340,3 +342,299 @@ class TestSmetaDelete:
         resp = auth_client.delete(f"/api/smetalar/{smeta.pk}/")
         assert resp.status_code == status.HTTP_204_NO_CONTENT
         assert not XarajatlarSmetasi.objects.filter(pk=smeta.pk).exists()
+
+
+class TestAsyncRead:
+    """The /api/async/ read endpoints mirror their sync counterparts."""
+
+    @pytest.fixture()
+    def jwt_client(self, user: User) -> APIClient:  # type: ignore[valid-type]
+        """Return a client sending a real JWT (async views skip DRF)."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    @pytest.fixture()
+    def smeta(self, auth_client: APIClient) -> XarajatlarSmetasi:
+        """Create three smetalar and return the first."""
+        for _ in range(3):
+            auth_client.post("/api/smetalar/", _smeta_payload(), format="json")
+        return XarajatlarSmetasi.objects.order_by("pk").first()
+
+    def test_list_matches_sync(
+        self,
+        auth_client: APIClient,
+        jwt_client: APIClient,
+        smeta: XarajatlarSmetasi,
+    ) -> None:
+        """Same page, totals and links as GET /api/smetalar/."""
+        sync = auth_client.get("/api/smetalar/?page_size=2").json()
+        resp = jwt_client.get("/api/async/smetalar/?page_size=2")
+        assert resp.status_code == status.HTTP_200_OK
+        data = resp.json()
+        assert data["count"] == sync["count"] == 3
+        assert data["results"] == sync["results"]
+        assert data["next"] == sync["next"].replace("/api/", "/api/async/")
+        page_2 = jwt_client.get(data["next"]).json()
+        assert page_2["previous"] == data["next"].replace("page=2&", "")
+        assert len(page_2["results"]) == 1
+
+    @pytest.mark.parametrize("page_size", ["abc", "0", "-1"])
+    def test_invalid_page_size_uses_default(
+        self,
+        auth_client: APIClient,
+        jwt_client: APIClient,
+        smeta: XarajatlarSmetasi,
+        page_size: str,
+    ) -> None:
+        """A bad page_size falls back to the default, as in the sync view."""
+        url = f"/api/smetalar/?page_size={page_size}"
+        sync = auth_client.get(url)
+        resp = jwt_client.get(url.replace("/api/", "/api/async/"))
+        assert resp.status_code == sync.status_code == status.HTTP_200_OK
+        assert resp.json()["results"] == sync.json()["results"]
+
+    def test_detail_matches_sync(
+        self,
+        auth_client: APIClient,
+        jwt_client: APIClient,
+        smeta: XarajatlarSmetasi,
+    ) -> None:
+        """Same body as GET /api/smetalar/{id}/."""
+        sync = auth_client.get(f"/api/smetalar/{smeta.pk}/").json()
+        resp = jwt_client.get(f"/api/async/smetalar/{smeta.pk}/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json() == sync
+
+    def test_requires_token_and_ownership(
+        self,
+        api_client: APIClient,
+        smeta: XarajatlarSmetasi,
+    ) -> None:
+        """Anonymous requests get 401; other users' smetalar 404."""
+        assert api_client.get("/api/async/smetalar/").status_code == 401
+        other = User.objects.create_user(email="o@example.com", password="p")
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(other)}"
+        )
+        assert api_client.get(f"/api/async/smetalar/{smeta.pk}/").status_code == 404
+
+
+class TestSmetaSummary:
+    """Tests for GET /api/smetalar/summary/."""
+
+    URL = "/api/smetalar/summary/"
+
+    def _create(self, client: APIClient, status_val: str = "draft") -> int:
+        resp = client.post("/api/smetalar/", _smeta_payload(status_val), format="json")
+        return resp.data["id"]
+
+    def test_summary_matches_details(self, auth_client: APIClient) -> None:
+        """Totals equal the sum of each smeta's grand total."""
+        ids = [self._create(auth_client), self._create(auth_client, "completed")]
+        expected = sum(
+            auth_client.get(f"/api/smetalar/{pk}/").data["grand_total"] for pk in ids
+        )
+
+        resp = auth_client.get(self.URL)
+        assert resp.status_code == status.HTTP_200_OK
+        assert set(resp.data) == set(SmetaSummarySerializer().fields)
+        assert resp.data["counts"]["total"] == 2
+        assert resp.data["counts"]["draft"] == 1
+        assert resp.data["counts"]["completed"] == 1
+        assert resp.data["planned_total"] == pytest.approx(expected)
+        assert sum(resp.data["by_category"].values()) == pytest.approx(expected)
+        assert sum(resp.data["funding"].values()) == pytest.approx(expected)
+        assert {r["id"] for r in resp.data["recent"]} == set(ids)
+
+    def test_summary_is_per_user(
+        self,
+        auth_client: APIClient,
+        api_client: APIClient,
+    ) -> None:
+        """Another user's smetalar are not counted."""
+        self._create(auth_client)
+        other = User.objects.create_user(email="o@example.com", password="p")
+        api_client.force_authenticate(user=other)
+        resp = api_client.get(self.URL)
+        assert resp.data["counts"]["total"] == 0
+        assert resp.data["planned_total"] == 0
+
+    def test_summary_cached_until_change(
+        self,
+        auth_client: APIClient,
+        django_assert_num_queries,
+    ) -> None:
+        """Repeat requests hit the cache; edits and deletes invalidate it."""
+        pk = self._create(auth_client)
+        first = auth_client.get(self.URL).data
+        with django_assert_num_queries(0):
+            assert auth_client.get(self.URL).data == first
+
+        payload = _smeta_payload()
+        payload["project_name"] = "Yangi nom"
+        auth_client.put(f"/api/smetalar/{pk}/", payload, format="json")
+        resp = auth_client.get(self.URL)
+        assert resp.data["recent"][0]["project_name"] == "Yangi nom"
+
+        auth_client.delete(f"/api/smetalar/{pk}/")
+        resp = auth_client.get(self.URL)
+        assert resp.data["counts"]["total"] == 0
+        assert resp.data["planned_total"] == 0
+
+    def test_summary_without_cache(self, auth_client: APIClient, settings) -> None:
+        """An unreachable cache computes the summary uncached."""
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:1/0",
+            }
+        }
+        self._create(auth_client)
+        resp = auth_client.get(self.URL)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["counts"]["total"] == 1
+
+
+class TestSmetaChanges:
+    """Tests for GET /api/smetalar/changes/."""
+
+    URL = "/api/smetalar/changes/"
+
+    @pytest.fixture(autouse=True)
+    def _no_settle(self, settings) -> None:
+        settings.SMETA_CHANGES_SETTLE_SECONDS = 0
+
+    def _create(self, client: APIClient, name: str = "Test Loyiha") -> int:
+        payload = _smeta_payload()
+        payload["project_name"] = name
+        return client.post("/api/smetalar/", payload, format="json").data["id"]
+
+    def test_initial_sync_returns_all(self, auth_client: APIClient) -> None:
+        """Without a cursor the whole list comes back with totals."""
+        first = self._create(auth_client, "A")
+        second = self._create(auth_client, "B")
+        resp = auth_client.get(self.URL)
+        assert resp.status_code == status.HTTP_200_OK
+        assert [s["id"] for s in resp.data["changed"]] == [first, second]
+        assert resp.data["changed"][0]["grand_total"] == pytest.approx(
+            auth_client.get(f"/api/smetalar/{first}/").data["grand_total"]
+        )
+        assert resp.data["deleted"] == []
+        assert resp.data["has_more"] is False
+
+    def test_delta_after_cursor(self, auth_client: APIClient) -> None:
+        """Only smetalar changed after the cursor and deletions return."""
+        kept = self._create(auth_client, "Kept")
+        edited = self._create(auth_client, "Edited")
+        removed = self._create(auth_client, "Removed")
+        cursor = auth_client.get(self.URL).data["cursor"]
+
+        payload = _smeta_payload()
+        payload["project_name"] = "Edited 2"
+        auth_client.put(f"/api/smetalar/{edited}/", payload, format="json")
+        auth_client.delete(f"/api/smetalar/{removed}/")
+        added = self._create(auth_client, "New")
+
+        resp = auth_client.get(self.URL, {"since": cursor})
+        assert [s["id"] for s in resp.data["changed"]] == [edited, added]
+        assert kept not in resp.data["deleted"]
+        assert resp.data["deleted"] == [removed]
+
+        idle = auth_client.get(self.URL, {"since": resp.data["cursor"]})
+        assert idle.data["changed"] == []
+        assert idle.data["deleted"] == []
+        assert idle.data["cursor"] == resp.data["cursor"]
+
+    def test_pages_follow_cursor(self, auth_client: APIClient, settings) -> None:
+        """A short page reports has_more and the next page continues."""
+        settings.SMETA_CHANGES_PAGE_SIZE = 1
+        ids = [self._create(auth_client, name) for name in ("A", "B")]
+        page = auth_client.get(self.URL).data
+        assert page["has_more"] is True
+        rest = auth_client.get(self.URL, {"since": page["cursor"]}).data
+        assert rest["has_more"] is False
+        assert [s["id"] for s in page["changed"] + rest["changed"]] == ids
+
+    def test_equal_timestamps_across_page_cut(
+        self,
+        auth_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+        settings,
+    ) -> None:
+        """Changes sharing a timestamp are all delivered across pages."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from smetalar.models import SmetaTombstone
+        from smetalar.services.changes_service import CHANGED, SyncCursor
+
+        settings.SMETA_CHANGES_PAGE_SIZE = 2
+        ids = [self._create(auth_client, name) for name in ("A", "B", "C")]
+        removed = self._create(auth_client, "D")
+        auth_client.delete(f"/api/smetalar/{removed}/")
+        same = timezone.now() - timedelta(minutes=1)
+        XarajatlarSmetasi.objects.filter(pk__in=ids).update(updated_at=same)
+        SmetaTombstone.objects.update(deleted_at=same)
+        cursor = SyncCursor(same - timedelta(seconds=1), CHANGED, 0).encode()
+
+        changed, deleted = [], []
+        for _ in range(5):
+            page = auth_client.get(self.URL, {"since": cursor}).data
+            changed += [s["id"] for s in page["changed"]]
+            deleted += page["deleted"]
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+        assert changed == ids
+        assert deleted == [removed]
+
+    def test_page_cut_inside_settle_window_waits(
+        self,
+        auth_client: APIClient,
+        settings,
+    ) -> None:
+        """A page cut among unsettled changes does not ask for more."""
+        settings.SMETA_CHANGES_PAGE_SIZE = 1
+        settings.SMETA_CHANGES_SETTLE_SECONDS = 60
+        first = self._create(auth_client, "A")
+        self._create(auth_client, "B")
+        page = auth_client.get(self.URL).data
+        assert [s["id"] for s in page["changed"]] == [first]
+        assert page["has_more"] is False
+        again = auth_client.get(self.URL, {"since": page["cursor"]}).data
+        assert [s["id"] for s in again["changed"]] == [first]
+
+    def test_stale_cursor_gone(self, auth_client: APIClient) -> None:
+        """Cursors older than the tombstone retention get 410."""
+        resp = auth_client.get(self.URL, {"since": "0.0.0"})
+        assert resp.status_code == status.HTTP_410_GONE
+
+    def test_invalid_cursor(self, auth_client: APIClient) -> None:
+        """A malformed or out-of-range cursor is a 400."""
+        for since in (
+            "2000-01-01",
+            "99999999999999999999.0.1",
+            "-99999999999999999.0.1",
+        ):
+            resp = auth_client.get(self.URL, {"since": since})
+            assert resp.status_code == status.HTTP_400_BAD_REQUEST, since
+
+    def test_tombstones_skip_owner_delete_and_purge(
+        self,
+        auth_client: APIClient,
+        user: User,  # type: ignore[valid-type]
+    ) -> None:
+        """Deleting the owner leaves no tombstones; old ones are purged."""
+        from smetalar.models import SmetaTombstone
+        from smetalar.services.changes_service import purge_tombstones
+
+        auth_client.delete(f"/api/smetalar/{self._create(auth_client)}/")
+        assert purge_tombstones(days=1) == 0
+        SmetaTombstone.objects.update(deleted_at="2000-01-01T00:00:00Z")
+        assert purge_tombstones(days=1) == 1
+
+        self._create(auth_client)
+        user.delete()
+        assert not SmetaTombstone.objects.exists()
@@ -0,0 +1,591 @@
+"""Tests for Excel export endpoints and services."""
+
+import copy
+import io
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import Future
+from unittest import mock
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import InMemoryStorage
+from django.core.management import call_command
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.throttling import ScopedRateThrottle
+
+from smetalar.models import XarajatlarSmetasi
+from smetalar.services.bulk_export_service import iter_rendered_workbooks
+from smetalar.services.excel_benchmark import compare_to_baseline
+from smetalar.services.excel_gc_service import collect_excel_garbage
+from smetalar.services.excel_service import (
+    _clone_workbook,
+    build_smeta_workbook,
+    build_template_workbook,
+    generate_smeta_excel,
+    get_template_workbook,
+)
+from smetalar.services.export_service import export_lock_key
+from smetalar.services.smeta_service import update_smeta
+from smetalar.tasks.excel_tasks import generate_excel_task
+from smetalar.tests.test_api import _smeta_payload
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _inline_export(settings) -> None:  # type: ignore[no-untyped-def]
+    """Render workbooks inline; the test DB is not visible to a pool."""
+    settings.SMETA_EXPORT_WORKERS = 1
+
+
+@pytest.fixture()
+def user() -> User:  # type: ignore[valid-type]
+    """Create a test user."""
+    return User.objects.create_user(
+        email="export@example.com",
+        password="testpass123",
+    )
+
+
+@pytest.fixture()
+def auth_client(user: User) -> APIClient:  # type: ignore[valid-type]
+    """Return an authenticated test client."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture()
+def api_client_other() -> APIClient:
+    """Return a client authenticated as a different user."""
+    other = User.objects.create_user(
+        email="other-export@example.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=other)
+    return client
+
+
+@pytest.fixture()
+def smeta_ids(auth_client: APIClient) -> list[int]:
+    """Create two full smetalar and return their ids."""
+    for _ in range(2):
+        auth_client.post("/api/smetalar/", _smeta_payload(), format="json")
+    return list(XarajatlarSmetasi.objects.values_list("pk", flat=True))
+
+
+class TestBulkExport:
+    """Tests for POST /api/smetalar/bulk-export/."""
+
+    URL = "/api/smetalar/bulk-export/"
+
+    def test_bulk_export_zip(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """Each requested smeta becomes one workbook in the archive."""
+        resp = auth_client.post(self.URL, {"ids": smeta_ids}, format="json")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["Content-Type"] == "application/zip"
+
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
+        names = archive.namelist()
+        assert len(names) == 2
+        assert all(n.endswith(".xlsx") for n in names)
+        assert archive.testzip() is None
+
+    def test_bulk_export_foreign_ids(
+        self,
+        api_client_other: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """Another user's smetalar are not exported."""
+        resp = api_client_other.post(
+            self.URL,
+            {"ids": smeta_ids},
+            format="json",
+        )
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_bulk_export_requires_ids(self, auth_client: APIClient) -> None:
+        """Empty id list returns 400."""
+        resp = auth_client.post(self.URL, {"ids": []}, format="json")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_management_command(
+        self,
+        smeta_ids: list[int],
+        tmp_path,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """The export command writes the same archive to disk."""
+        output = tmp_path / "out.zip"
+        call_command(
+            "export_smetalar_zip",
+            *map(str, smeta_ids),
+            output=str(output),
+            stdout=io.StringIO(),
+        )
+        assert len(zipfile.ZipFile(output).namelist()) == 2
+
+    def test_closing_early_cancels_pending_renders(self) -> None:
+        """A client disconnect shuts the pool down without waiting."""
+        pool = mock.MagicMock()
+
+        def submit(fn, pk):  # type: ignore[no-untyped-def]
+            future: Future = Future()
+            future.set_result((f"{pk}.xlsx", b""))
+            return future
+
+        pool.submit.side_effect = submit
+        with mock.patch(
+            "smetalar.services.bulk_export_service.ProcessPoolExecutor",
+            return_value=pool,
+        ):
+            members = iter_rendered_workbooks([1, 2, 3], max_workers=2)
+            next(members)
+            members.close()
+            pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+            pool.reset_mock()
+            assert len(list(iter_rendered_workbooks([1, 2], max_workers=2))) == 2
+            pool.shutdown.assert_called_once_with(wait=True, cancel_futures=False)
+
+
+class TestSmetaExport:
+    """Tests for POST /api/smetalar/{id}/export/."""
+
+    @pytest.fixture(autouse=True)
+    def _media(self, settings, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def test_builds_once_per_version(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """Repeated requests reuse the file; an update triggers a rebuild."""
+        url = f"/api/smetalar/{smeta_ids[0]}/export/"
+        with mock.patch(
+            "smetalar.services.excel_service.build_smeta_workbook",
+            wraps=build_smeta_workbook,
+        ) as render:
+            first = auth_client.post(url)
+            second = auth_client.post(url)
+            assert first.status_code == status.HTTP_200_OK
+            assert first.data["excel_file_url"] == second.data["excel_file_url"]
+            assert render.call_count == 1
+
+            updated_at = XarajatlarSmetasi.objects.get(pk=smeta_ids[0]).updated_at
+            auth_client.patch(
+                f"/api/smetalar/{smeta_ids[0]}/",
+                {"project_name": "Yangi nom"},
+                format="json",
+            )
+            third = auth_client.post(url)
+            assert third.data["version"] == first.data["version"] + 1
+            assert render.call_count == 2
+
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        assert smeta.excel_version == smeta.version
+        assert smeta.updated_at > updated_at
+
+    def test_concurrent_updates_get_distinct_versions(
+        self,
+        smeta_ids: list[int],
+    ) -> None:
+        """Stale instances get distinct versions and keep the export."""
+        first = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        second = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        start = first.version
+        XarajatlarSmetasi.objects.filter(pk=first.pk).update(
+            excel_file="smetalar/excel/built.xlsx",
+            excel_version=start,
+        )
+
+        update_smeta(first, {"project_name": "Birinchi"})
+        update_smeta(second, {"organization_name": "Ikkinchi"})
+
+        assert (first.version, second.version) == (start + 1, start + 2)
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        assert smeta.version == start + 2
+        assert (smeta.project_name, smeta.organization_name) == (
+            "Birinchi",
+            "Ikkinchi",
+        )
+        assert smeta.excel_file.name == "smetalar/excel/built.xlsx"
+        assert smeta.excel_version == start
+
+    def test_concurrent_request_joins_in_flight_build(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """A request for a version that is already being built is coalesced."""
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        cache.add(export_lock_key(smeta.pk, smeta.version), "in-flight")
+        with mock.patch("smetalar.services.export_service.dispatch") as dispatch:
+            resp = auth_client.post(f"/api/smetalar/{smeta.pk}/export/")
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert resp.data["job_id"] == "in-flight"
+        dispatch.assert_not_called()
+
+    def test_time_limit_is_not_retried(self, smeta_ids: list[int]) -> None:
+        """A build that ran out of time fails at once and frees the lock."""
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        key = export_lock_key(smeta.pk, smeta.version)
+        cache.add(key, "job")
+        with mock.patch(
+            "smetalar.services.excel_service.generate_smeta_excel",
+            side_effect=SoftTimeLimitExceeded,
+        ) as build:
+            result = generate_excel_task.apply(args=(smeta.pk, smeta.version))
+        assert isinstance(result.result, SoftTimeLimitExceeded)
+        assert build.call_count == 1
+        assert cache.get(key) is None
+
+    def test_failed_dispatch_releases_lock(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """A broker error does not leave later requests joining a phantom job."""
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        url = f"/api/smetalar/{smeta.pk}/export/"
+        with mock.patch(
+            "smetalar.services.export_service.dispatch",
+            side_effect=ConnectionError("broker"),
+        ), pytest.raises(ConnectionError):
+            auth_client.post(url)
+        assert cache.get(export_lock_key(smeta.pk, smeta.version)) is None
+        assert auth_client.post(url).status_code == status.HTTP_200_OK
+
+    def test_export_foreign_smeta(
+        self,
+        api_client_other: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """Another user's smeta returns 404."""
+        resp = api_client_other.post(f"/api/smetalar/{smeta_ids[0]}/export/")
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_file_goes_to_export_storage(self, smeta_ids: list[int]) -> None:
+        """Generated workbooks are written through the exports storage."""
+        storage = InMemoryStorage(base_url="https://files.example.com/")
+        field = XarajatlarSmetasi._meta.get_field("excel_file")
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        with mock.patch.object(field, "storage", storage):
+            url = generate_smeta_excel(smeta)
+            name = XarajatlarSmetasi.objects.get(pk=smeta.pk).excel_file.name
+            with storage.open(name) as fh:
+                wb = load_workbook(fh, read_only=True)
+        assert url.startswith("https://files.example.com/smetalar/excel/")
+        assert wb.sheetnames[0] == "Jami"
+
+
+class TestSmetaDownload:
+    """Tests for GET /api/smetalar/{id}/download/."""
+
+    @pytest.fixture(autouse=True)
+    def _media(self, settings, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    @pytest.fixture()
+    def smeta(self, smeta_ids: list[int]) -> XarajatlarSmetasi:
+        """Return a smeta with a generated Excel file."""
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        generate_smeta_excel(smeta)
+        return smeta
+
+    def test_x_accel_redirect(
+        self,
+        auth_client: APIClient,
+        smeta: XarajatlarSmetasi,
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """Behind nginx the transfer is handed off, with no body."""
+        settings.EXPORT_X_ACCEL_REDIRECT = True
+        resp = auth_client.get(f"/api/smetalar/{smeta.pk}/download/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["X-Accel-Redirect"] == (
+            f"/protected/media/{smeta.excel_file.name}"
+        )
+        assert resp["Content-Disposition"].startswith("attachment;")
+        assert resp.content == b""
+
+    def test_direct_file_without_proxy(
+        self,
+        auth_client: APIClient,
+        smeta: XarajatlarSmetasi,
+    ) -> None:
+        """Without X-Accel the file is streamed by Django."""
+        resp = auth_client.get(f"/api/smetalar/{smeta.pk}/download/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert "X-Accel-Redirect" not in resp
+        wb = load_workbook(io.BytesIO(b"".join(resp.streaming_content)))
+        assert wb.sheetnames[0] == "Jami"
+
+    def test_detail_links_download_endpoint(
+        self,
+        auth_client: APIClient,
+        smeta: XarajatlarSmetasi,
+    ) -> None:
+        """The detail response no longer exposes the public media URL."""
+        resp = auth_client.get(f"/api/smetalar/{smeta.pk}/")
+        assert resp.data["excel_file_url"].endswith(
+            f"/api/smetalar/{smeta.pk}/download/"
+        )
+
+    def test_foreign_or_missing_file_returns_404(
+        self,
+        api_client_other: APIClient,
+        auth_client: APIClient,
+        smeta: XarajatlarSmetasi,
+        smeta_ids: list[int],
+    ) -> None:
+        """Other users and smetalar without a file get 404."""
+        url = f"/api/smetalar/{smeta.pk}/download/"
+        assert api_client_other.get(url).status_code == 404
+        missing = f"/api/smetalar/{smeta_ids[1]}/download/"
+        assert auth_client.get(missing).status_code == 404
+
+
+class TestExcelGc:
+    """Tests for collect_excel_garbage()."""
+
+    @pytest.fixture(autouse=True)
+    def _media(self, settings, tmp_path) -> None:  # type: ignore[no-untyped-def]
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.SMETA_EXCEL_GC_GRACE_SECONDS = 0
+
+    @pytest.fixture()
+    def smeta(self, smeta_ids: list[int]) -> XarajatlarSmetasi:
+        """Return a smeta whose Excel was built for two versions."""
+        smeta = XarajatlarSmetasi.objects.get(pk=smeta_ids[0])
+        generate_smeta_excel(smeta)
+        smeta.version += 1
+        smeta.save(update_fields=["version"])
+        generate_smeta_excel(smeta)
+        smeta.refresh_from_db()
+        return smeta
+
+    def test_removes_unreferenced_files(
+        self,
+        smeta: XarajatlarSmetasi,
+        tmp_path,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """Superseded builds are deleted; the current file is kept."""
+        files = list((tmp_path / "smetalar" / "excel").rglob("*.xlsx"))
+        assert len(files) == 2
+
+        dry = collect_excel_garbage(retention_days=0, dry_run=True)
+        assert dry["deleted"] == 1
+        assert len(list((tmp_path / "smetalar").rglob("*.xlsx"))) == 2
+
+        report = collect_excel_garbage(retention_days=0, batch_size=1)
+        assert report["scanned"] == 2
+        assert report["deleted"] == 1
+        assert report["bytes_reclaimed"] > 0
+        assert smeta.excel_file.storage.exists(smeta.excel_file.name)
+
+    def test_expired_files_are_unlinked(self, smeta: XarajatlarSmetasi) -> None:
+        """Files past retention are removed and the smeta is rebuilt later."""
+        old = time.time() - 3 * 86400
+        os.utime(smeta.excel_file.path, (old, old))
+
+        report = collect_excel_garbage(retention_days=1)
+        assert report["expired"] == 1
+        smeta.refresh_from_db()
+        assert not smeta.excel_file
+        assert smeta.excel_version == 0
+
+
+class TestExportQueue:
+    """Export work is isolated and rate limited."""
+
+    def test_excel_tasks_routed_to_exports_queue(self) -> None:
+        """Workbook tasks go to the dedicated exports queue."""
+        route = generate_excel_task.app.amqp.router.route(
+            {},
+            generate_excel_task.name,
+        )
+        assert route["queue"].name == "exports"
+
+    def test_per_user_throttle(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Export endpoints share one per-user rate limit."""
+        monkeypatch.setattr(
+            ScopedRateThrottle,
+            "THROTTLE_RATES",
+            {"exports": "2/min"},
+        )
+        assert auth_client.get("/api/smetalar/portfolio/").status_code == 200
+        resp = auth_client.post(f"/api/smetalar/{smeta_ids[0]}/export/")
+        assert resp.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+        resp = auth_client.get("/api/smetalar/portfolio/")
+        assert resp.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+class TestPortfolio:
+    """Tests for GET /api/smetalar/portfolio/."""
+
+    URL = "/api/smetalar/portfolio/"
+
+    def test_portfolio_totals(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """One row per smeta plus a totals row matching the Jami sheet."""
+        resp = auth_client.get(self.URL)
+        assert resp.status_code == status.HTTP_200_OK
+
+        ws = load_workbook(io.BytesIO(resp.content)).active
+        rows = list(ws.iter_rows(min_row=6, values_only=True))
+        assert len(rows) == 3
+        # Salary: 1*5M*10 + 3*8M*10 = 290M so'm, all from vazirlik.
+        assert rows[0][4] == 290_000
+        assert rows[2][4] == 580_000
+        # Raw materials are financed by the organisation: 24 * 500k.
+        assert rows[0][9] == 12_000
+
+    def test_portfolio_filter_ids(
+        self,
+        auth_client: APIClient,
+        smeta_ids: list[int],
+    ) -> None:
+        """The ids query param narrows the portfolio."""
+        resp = auth_client.get(self.URL, {"ids": str(smeta_ids[0])})
+        ws = load_workbook(io.BytesIO(resp.content)).active
+        assert len(list(ws.iter_rows(min_row=6))) == 2
+
+
+def _snapshot(wb) -> dict:  # type: ignore[no-untyped-def]
+    """Values, fonts, fills, borders, merges and widths of every sheet."""
+    return {
+        ws.title: (
+            [
+                (c.coordinate, c.value, *map(copy.copy, (c.font, c.fill, c.border)))
+                for c in sorted(ws._cells.values(), key=lambda c: (c.row, c.column))
+                if c.value is not None or c.has_style
+            ],
+            sorted(map(str, ws.merged_cells.ranges)),
+            {k: d.width for k, d in ws.column_dimensions.items() if d.width},
+        )
+        for ws in wb.worksheets
+    }
+
+
+class TestExcelTemplate:
+    """Tests for the cached workbook template."""
+
+    def test_template_file_matches_layout(
+        self,
+        settings,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """The shipped template is in sync with the sheet layouts."""
+        shipped = load_workbook(settings.SMETA_EXCEL_TEMPLATE)
+        built = build_template_workbook()
+        assert shipped.sheetnames == built.sheetnames
+        for name in built.sheetnames:
+            expected = [
+                [c.value for c in row] for row in built[name].iter_rows()
+            ]
+            actual = [
+                [c.value for c in row] for row in shipped[name].iter_rows()
+            ]
+            assert actual == expected, name
+            assert set(map(str, shipped[name].merged_cells.ranges)) == set(
+                map(str, built[name].merged_cells.ranges)
+            ), name
+
+    def test_clone_is_independent(self) -> None:
+        """Filling a clone never leaks into the cached template."""
+        template = get_template_workbook()
+        clone = _clone_workbook(template)
+        clone["Jami"]["A5"].value = "Loyiha - Org"
+        clone["Inventar"].cell(5, 2, "Laptop")
+        assert template["Jami"]["A5"].value is None
+        assert template["Inventar"].max_row == 4
+
+    def test_clone_matches_template(self) -> None:
+        """The fast copy keeps up with the pinned openpyxl internals."""
+        template = get_template_workbook()
+        clone = _clone_workbook(template)
+        assert _snapshot(clone) == _snapshot(template)
+        for ws in clone.worksheets:
+            assert len(list(ws.iter_rows())) == ws.max_row, ws.title
+        clone.save(io.BytesIO())
+
+    def test_clone_falls_back_to_reload(self) -> None:
+        """If openpyxl internals change, the template is reloaded instead."""
+        template = get_template_workbook()
+        with mock.patch(
+            "smetalar.services.excel_service._copy_workbook",
+            side_effect=AttributeError("_cells"),
+        ):
+            clone = _clone_workbook(template)
+        assert _snapshot(clone) == _snapshot(template)
+
+
+class TestExcelBenchmark:
+    """Tests for the benchmark_excel command."""
+
+    def test_benchmark_writes_results(
+        self,
+        tmp_path,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """A tiny run writes per-stage timings and leaves no data behind."""
+        output = tmp_path / "bench.json"
+        call_command(
+            "benchmark_excel",
+            sizes=[10],
+            years=[2],
+            repeat=1,
+            output=str(output),
+            baseline=str(tmp_path / "missing.json"),
+        )
+        case = json.loads(output.read_text())["cases"][0]
+        assert case["case"] == "10x2"
+        assert {"gather_smeta_data", "wb_save", "total"} <= set(
+            case["timings_ms"]
+        )
+        assert case["peak_memory_kb"] > 0
+        assert not XarajatlarSmetasi.objects.exists()
+
+    def test_compare_to_baseline(self) -> None:
+        """Only slowdowns past both tolerance and noise floor are reported."""
+        baseline = {
+            "cases": [
+                {
+                    "case": "10x2",
+                    "timings_ms": {"wb_save": 100.0, "total": 0.5},
+                    "peak_memory_kb": 1000.0,
+                }
+            ]
+        }
+        results = {
+            "cases": [
+                {
+                    "case": "10x2",
+                    "timings_ms": {"wb_save": 150.0, "total": 1.0},
+                    "peak_memory_kb": 1100.0,
+                }
+            ]
+        }
+        regressions = compare_to_baseline(results, baseline)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("10x2 wb_save (ms)")
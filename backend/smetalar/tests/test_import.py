@@ -0,0 +1,188 @@
+"""Tests for importing smetalar from Excel workbooks."""
+
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from openpyxl import load_workbook
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from smetalar.models import XarajatlarSmetasi
+from smetalar.services.excel_service import render_smeta_excel
+from smetalar.tests.test_api import _smeta_payload
+
+User = get_user_model()
+pytestmark = pytest.mark.django_db
+
+URL = "/api/smetalar/import/"
+
+
+@pytest.fixture()
+def auth_client() -> APIClient:
+    """Return a client authenticated as a fresh user."""
+    user = User.objects.create_user(
+        email="import@example.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _edit_cell(
+    upload: SimpleUploadedFile,
+    sheet: str,
+    label: str,
+    col: int,
+    value: object,
+) -> tuple[SimpleUploadedFile, int]:
+    """Copy ``upload`` with one cell of the row starting with ``label`` set."""
+    wb = load_workbook(BytesIO(upload.read()))
+    ws = wb[sheet]
+    row = next(r for r in ws.iter_rows() if str(r[1].value).startswith(label))
+    ws.cell(row=row[0].row, column=col, value=value)
+    buf = BytesIO()
+    wb.save(buf)
+    return SimpleUploadedFile("smeta.xlsx", buf.getvalue()), row[0].row
+
+
+@pytest.fixture()
+def workbook(auth_client: APIClient) -> SimpleUploadedFile:
+    """Export a full smeta and return it as an upload."""
+    resp = auth_client.post("/api/smetalar/", _smeta_payload(), format="json")
+    smeta = XarajatlarSmetasi.objects.get(pk=resp.data["id"])
+    return SimpleUploadedFile("smeta.xlsx", render_smeta_excel(smeta))
+
+
+class TestSmetaImport:
+    """Tests for POST /api/smetalar/import/."""
+
+    def test_round_trip(
+        self,
+        auth_client: APIClient,
+        workbook: SimpleUploadedFile,
+    ) -> None:
+        """An exported workbook imports back into an equivalent smeta."""
+        resp = auth_client.post(URL, {"file": workbook}, format="multipart")
+        assert resp.status_code == status.HTTP_201_CREATED
+
+        data = resp.data
+        assert data["project_name"] == "Test Loyiha"
+        assert data["organization_name"] == "Test Org"
+        assert data["project_duration_years"] == 2
+
+        boss = data["salary"]["management_staff"][0]
+        assert boss["position"] == "Loyiha rahbari"
+        assert boss["monthly_salary"] == "5000000.00"
+        assert boss["financing_source"] == "vazirlik"
+        assert data["salary"]["production_staff"][0]["count"] == 3
+
+        laptop = data["inventory"][0]
+        assert (laptop["name"], laptop["description"], laptop["link"]) == (
+            "MacBook Pro",
+            "M3 chip",
+            "https://apple.com",
+        )
+        assert data["raw_materials"][0]["financing_source"] == "tashkilot"
+        assert len(data["other_expenses"]["management_expenses"]) == 1
+        assert [p["name"] for p in data["products"]] == ["Mobile App", "Web App"]
+        assert [d["amount"] for d in data["davr_xarajatlari"]] == [
+            "5000.00",
+            "2000.00",
+        ]
+        assert [y["products"][0]["quantity"] for y in data["sotish_rejasi"]] == [
+            50,
+            100,
+        ]
+
+    def test_large_file_is_imported_by_task(
+        self,
+        auth_client: APIClient,
+        workbook: SimpleUploadedFile,
+        settings,  # type: ignore[no-untyped-def]
+        tmp_path,  # type: ignore[no-untyped-def]
+    ) -> None:
+        """Uploads over the async threshold are handed to Celery."""
+        settings.SMETA_IMPORT_ASYNC_BYTES = 1
+        settings.MEDIA_ROOT = str(tmp_path)
+
+        resp = auth_client.post(URL, {"file": workbook}, format="multipart")
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert resp.data["job_id"]
+        assert XarajatlarSmetasi.objects.count() == 2
+        assert not list((tmp_path / "imports").iterdir())
+
+    def test_rejects_non_workbook(self, auth_client: APIClient) -> None:
+        """A file that is not an .xlsx archive returns 400."""
+        upload = SimpleUploadedFile("smeta.xlsx", b"not a workbook")
+        resp = auth_client.post(URL, {"file": upload}, format="multipart")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert "detail" in resp.data
+
+    def test_rejects_wrong_extension(self, auth_client: APIClient) -> None:
+        """Only .xlsx uploads are accepted."""
+        upload = SimpleUploadedFile("smeta.csv", b"a,b")
+        resp = auth_client.post(URL, {"file": upload}, format="multipart")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rejects_non_numeric_amount(
+        self,
+        auth_client: APIClient,
+        workbook: SimpleUploadedFile,
+    ) -> None:
+        """A text amount is a 400 naming the sheet and row."""
+        upload, row = _edit_cell(workbook, "Ish haqi", "Loyiha rahbari", 4, "besh")
+        resp = auth_client.post(URL, {"file": upload}, format="multipart")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert "'Ish haqi'" in resp.data["detail"]
+        assert f"{row}-qator" in resp.data["detail"]
+
+    def test_keeps_fractional_thousands(
+        self,
+        auth_client: APIClient,
+        workbook: SimpleUploadedFile,
+    ) -> None:
+        """Amounts are not truncated to whole thousands."""
+        upload, _row = _edit_cell(workbook, "Inventar", "MacBook Pro", 5, 1234.567)
+        resp = auth_client.post(URL, {"file": upload}, format="multipart")
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert resp.data["inventory"][0]["price"] == "1234567.00"
+
+    def test_names_with_separator(self, auth_client: APIClient) -> None:
+        """Project names containing " - " survive the round trip."""
+        payload = _smeta_payload()
+        payload["project_name"] = "Alfa - Beta"
+        payload["organization_name"] = "Gamma - Delta"
+        resp = auth_client.post("/api/smetalar/", payload, format="json")
+        smeta = XarajatlarSmetasi.objects.get(pk=resp.data["id"])
+        upload = SimpleUploadedFile("smeta.xlsx", render_smeta_excel(smeta))
+
+        resp = auth_client.post(URL, {"file": upload}, format="multipart")
+        assert resp.data["project_name"] == "Alfa - Beta"
+        assert resp.data["organization_name"] == "Gamma - Delta"
+
+    def test_amounts_below_a_thousand_survive(
+        self,
+        auth_client: APIClient,
+    ) -> None:
+        """Salaries and prices that are not whole thousands round-trip exactly."""
+        payload = _smeta_payload()
+        payload["salary"]["management_staff"][0]["monthly_salary"] = "5400500.00"
+        payload["inventory"][0]["price"] = "300.00"
+        payload["raw_materials"][0]["price"] = "1234.56"
+        payload["other_expenses"]["management_expenses"][0]["price"] = "999999.99"
+        resp = auth_client.post("/api/smetalar/", payload, format="json")
+        smeta = XarajatlarSmetasi.objects.get(pk=resp.data["id"])
+        upload = SimpleUploadedFile("smeta.xlsx", render_smeta_excel(smeta))
+
+        data = auth_client.post(URL, {"file": upload}, format="multipart").data
+        assert data["salary"]["management_staff"][0]["monthly_salary"] == (
+            "5400500.00"
+        )
+        assert data["inventory"][0]["price"] == "300.00"
+        assert data["raw_materials"][0]["price"] == "1234.56"
+        assert data["other_expenses"]["management_expenses"][0]["price"] == (
+            "999999.99"
+        )
@@ -154,13 +154,19 @@ setup_systemd() {
     info "Installing systemd services…"
 
     sudo cp "${DEPLOY_DIR}/gunicorn.service"  /etc/systemd/system/bolajakolim-backend.service
+    sudo cp "${DEPLOY_DIR}/gunicorn-asgi.service" /etc/systemd/system/bolajakolim-asgi.service
     sudo cp "${DEPLOY_DIR}/celery.service"    /etc/systemd/system/bolajakolim-celery.service
+    sudo cp "${DEPLOY_DIR}/celery-exports.service" /etc/systemd/system/bolajakolim-celery-exports.service
+    sudo cp "${DEPLOY_DIR}/celery-beat.service" /etc/systemd/system/bolajakolim-celery-beat.service
     sudo cp "${DEPLOY_DIR}/nextjs.service"    /etc/systemd/system/bolajakolim-frontend.service
 
     sudo systemctl daemon-reload
 
     sudo systemctl enable --now bolajakolim-backend
+    sudo systemctl enable --now bolajakolim-asgi
     sudo systemctl enable --now bolajakolim-celery
+    sudo systemctl enable --now bolajakolim-celery-exports
+    sudo systemctl enable --now bolajakolim-celery-beat
     sudo systemctl enable --now bolajakolim-frontend
 
     info "Services started."
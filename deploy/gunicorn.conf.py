@@ -1,20 +1,57 @@
-"""Gunicorn configuration for bolajakolim backend."""
+"""Gunicorn configuration for bolajakolim backend.
+
+The worker model is chosen with ``GUNICORN_PROFILE``:
+
+* ``gthread`` (default) – a few processes with a thread pool each.
+  Requests waiting on the database or a slow client block one thread,
+  not a whole process, and the imported code is shared by the threads.
+* ``sync`` – one request per process, ``2 × CPU + 1`` processes.
+* ``asgi`` – Gunicorn's asyncio worker serving ``config.asgi``; for
+  the async endpoints (``/api/async/``, job event streams).
+
+See ``deploy/loadtest/`` for the comparison behind these defaults.
+"""
 
 import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+
+profile = os.getenv("GUNICORN_PROFILE", "gthread")
 
 # Bind to localhost; Nginx will reverse-proxy to this address.
-bind = "127.0.0.1:8010"
+bind = os.getenv("GUNICORN_BIND", "127.0.0.1:8010")
+
+if profile == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "asgi"
+    workers = _cpus
+    # Concurrent connections per asyncio worker.
+    worker_connections = 1000
+elif profile == "gthread":
+    wsgi_app = "config.wsgi:application"
+    worker_class = "gthread"
+    workers = _cpus + 1
+    # Keep DB_POOL_MAX_SIZE >= threads when the connection pool is on.
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "sync"
+    # Workers = 2 × CPU cores + 1 (safe default)
+    workers = _cpus * 2 + 1
 
-# Workers = 2 × CPU cores + 1 (safe default)
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
-worker_connections = 1000
+workers = int(os.getenv("GUNICORN_WORKERS", workers))
 timeout = 120
 keepalive = 5
 
+# Import the app once in the master and fork workers from it, so code
+# and read-only data are shared copy-on-write (see config/fork.py).
+preload_app = os.getenv("GUNICORN_PRELOAD", "True").lower() in ("true", "1", "yes")
+
 # Logging
-accesslog = "/var/log/gunicorn/access.log"
-errorlog = "/var/log/gunicorn/error.log"
+# An empty GUNICORN_ACCESS_LOG disables the access log (load tests).
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "/var/log/gunicorn/access.log") or None
+errorlog = os.getenv("GUNICORN_ERROR_LOG", "/var/log/gunicorn/error.log")
 loglevel = "info"
 
 # Process naming
@@ -29,3 +66,27 @@ limit_request_field_size = 8190
 graceful_timeout = 30
 max_requests = 1000
 max_requests_jitter = 50
+
+
+def when_ready(server):  # type: ignore[no-untyped-def]
+    """Warm shared read-only state in the master before forking."""
+    if preload_app:
+        from config.fork import warm_shared_state
+
+        warm_shared_state()
+
+
+def pre_fork(server, worker):  # type: ignore[no-untyped-def]
+    """Make sure the master holds no connections a worker could inherit."""
+    if preload_app:
+        from config.fork import close_before_fork
+
+        close_before_fork()
+
+
+def post_fork(server, worker):  # type: ignore[no-untyped-def]
+    """Give each worker its own clients."""
+    if preload_app:
+        from config.fork import reset_after_fork
+
+        reset_after_fork()
@@ -0,0 +1,97 @@
+"""Minimal closed-loop HTTP load generator (standard library only).
+
+Each of ``--concurrency`` threads sends requests back to back for
+``--duration`` seconds, one connection per request like nginx without
+upstream keep-alive (sync workers close every connection anyway).
+
+Usage:
+    python loadtest.py http://127.0.0.1:8010/api/smetalar/ \
+        --token <JWT> --concurrency 32 --duration 20
+"""
+
+import argparse
+import collections
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def _worker(
+    url: str,
+    headers: dict[str, str],
+    deadline: float,
+    latencies: list[float],
+    errors: list[str],
+) -> None:
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException) as exc:
+            errors.append(type(exc).__name__)
+            continue
+        finally:
+            conn.close()
+        if resp.status != 200:
+            errors.append(str(resp.status))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def run(url: str, token: str, concurrency: int, duration: float) -> dict:
+    """Load ``url`` and return throughput and latency percentiles."""
+    # As set by nginx in front of Gunicorn (avoids the HTTPS redirect).
+    headers = {"X-Forwarded-Proto": "https", "Connection": "close"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    deadline = time.monotonic() + duration
+    latencies: list[float] = []
+    errors: list[str] = []
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(url, headers, deadline, latencies, errors),
+        )
+        for _ in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ms = sorted(x * 1000 for x in latencies)
+    q = statistics.quantiles(ms, n=100) if len(ms) > 1 else [0.0] * 99
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "requests": len(ms),
+        "errors": len(errors),
+        "error_kinds": dict(collections.Counter(errors)),
+        "rps": round(len(ms) / duration, 1),
+        "p50_ms": round(q[49], 1),
+        "p95_ms": round(q[94], 1),
+        "p99_ms": round(q[98], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url")
+    parser.add_argument("--token", default="")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.url, args.token, args.concurrency, args.duration)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env bash
+# Compare Gunicorn worker profiles (see deploy/gunicorn.conf.py) on this host.
+#
+#   deploy/loadtest/run.sh [results.jsonl]
+#
+# Seeds a load-test user with smetalar in the database configured by
+# backend/.env (use PostgreSQL for production-like numbers), then for
+# each profile starts Gunicorn on 127.0.0.1:8099, records the memory
+# (PSS) of master + workers after the run, and loads the smeta list endpoint
+# (/api/async/smetalar/ for the asgi profile).
+#
+# Env: PYTHON (default python), CONCURRENCY (32), DURATION (20),
+#      PROFILES ("sync gthread asgi"), PRELOAD (True).
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "$0")/../.." && pwd)"
+OUT="${1:-${ROOT}/deploy/loadtest/results.jsonl}"
+PYTHON="${PYTHON:-python}"
+CONCURRENCY="${CONCURRENCY:-32}"
+DURATION="${DURATION:-20}"
+PROFILES="${PROFILES:-sync gthread asgi}"
+BIND="127.0.0.1:8099"
+
+cd "${ROOT}/backend"
+"${PYTHON}" manage.py migrate --noinput >/dev/null
+
+TOKEN="$("${PYTHON}" manage.py shell -c '
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+from smetalar.models import Employee, XarajatlarSmetasi
+user, created = get_user_model().objects.get_or_create(email="loadtest@example.com")
+if created:
+    for i in range(20):
+        smeta = XarajatlarSmetasi.objects.create(user=user, project_name=f"Loadtest {i}")
+        Employee.objects.bulk_create(
+            Employee(smeta=smeta, staff_type="production", position="Dasturchi",
+                     count=2, monthly_salary=8_000_000, duration_months=12)
+            for _ in range(10)
+        )
+print(AccessToken.for_user(user))
+' | tail -n 1)"
+
+for profile in ${PROFILES}; do
+    path="/api/smetalar/"
+    [[ "${profile}" == "asgi" ]] && path="/api/async/smetalar/"
+
+    GUNICORN_PROFILE="${profile}" GUNICORN_BIND="${BIND}" \
+    GUNICORN_PRELOAD="${PRELOAD:-True}" GUNICORN_ACCESS_LOG="" GUNICORN_ERROR_LOG="-" \
+        "${PYTHON}" -m gunicorn -c "${ROOT}/deploy/gunicorn.conf.py" \
+        --pid /tmp/loadtest-gunicorn.pid 2>/tmp/loadtest-gunicorn.log &
+    master=$!
+    for _ in $(seq 50); do
+        curl -fs -o /dev/null -H "Authorization: Bearer ${TOKEN}" "http://${BIND}${path}" && break
+        sleep 0.2
+    done
+
+    result="$("${PYTHON}" "${ROOT}/deploy/loadtest/loadtest.py" "http://${BIND}${path}" \
+        --token "${TOKEN}" --concurrency "${CONCURRENCY}" --duration "${DURATION}")"
+    # Proportional set size: shared copy-on-write pages are split between
+    # the processes sharing them instead of being counted once per process.
+    pids="${master} $(ps -o pid= --ppid "${master}" | tr '\n' ' ')"
+    pss_kb=0
+    for pid in ${pids}; do
+        kb="$(awk '/^Pss:/ {print $2}' "/proc/${pid}/smaps_rollup" 2>/dev/null || echo 0)"
+        pss_kb=$((pss_kb + ${kb:-0}))
+    done
+    workers="$(ps -o pid= --ppid "${master}" | wc -l)"
+
+    kill -TERM "${master}"
+    wait "${master}" || true
+
+    echo "${result}" | "${PYTHON}" -c "
+import json, sys
+r = json.load(sys.stdin)
+r.update(profile='${profile}', workers=${workers}, pss_mb=round(${pss_kb} / 1024, 1),
+         preload='${PRELOAD:-True}')
+print(json.dumps(r))" | tee -a "${OUT}"
+done
@@ -30,7 +30,10 @@ pnpm build
 
 info "Restarting services…"
 sudo systemctl restart bolajakolim-backend
+sudo systemctl restart bolajakolim-asgi
 sudo systemctl restart bolajakolim-celery
+sudo systemctl restart bolajakolim-celery-exports
+sudo systemctl restart bolajakolim-celery-beat
 sudo systemctl restart bolajakolim-frontend
 
 info "Reloading Nginx…"
@@ -41,5 +44,8 @@ info "✅ Re-deploy complete!"
 # Show status
 echo
 sudo systemctl status bolajakolim-backend --no-pager -l
+sudo systemctl status bolajakolim-asgi --no-pager -l
 sudo systemctl status bolajakolim-celery --no-pager -l
+sudo systemctl status bolajakolim-celery-exports --no-pager -l
+sudo systemctl status bolajakolim-celery-beat --no-pager -l
 sudo systemctl status bolajakolim-frontend --no-pager -l